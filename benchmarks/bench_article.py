@@ -0,0 +1,72 @@
+"""
+文章记录内存基准测试
+对比同样内容的文章用字典和 Article（__slots__）表示时每篇文章占用的内存（字节/篇），
+字段取值相同，差值即为容器本身的开销
+
+用法:
+    python -m benchmarks.bench_article --count 200000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from core.article import Article
+
+
+def field_values(count: int):
+    """预先生成字段取值，两种表示共享同一批字符串，只比较容器开销"""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            'title': f"Story {i}: new release of the compiler toolchain",
+            'url': f"https://example{i % 50}.com/articles/{i}",
+            'description': f"Summary of story {i} about cloud infrastructure and developer tooling",
+            'content': None,
+            'source': f"example{i % 50}.com",
+            'author': 'Anonymous',
+            'today_stars': None,
+            'published_at': start + timedelta(seconds=i),
+            'canonical_url': f"https://example{i % 50}.com/articles/{i}",
+            # 入库前近似重复处理会补充的字段
+            'content_hash': f"{i:016x}",
+            'cluster_id': None,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(build, values) -> int:
+    """返回 build(values) 产生的对象占用的字节数"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build(values)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文章记录内存基准测试')
+    parser.add_argument('--count', type=int, default=200000, help='文章数')
+    args = parser.parse_args()
+
+    values = field_values(args.count)
+    payload = sum(len(v['title']) + len(v['url']) * 2 + len(v['description']) + len(v['source'])
+                  for v in values) / len(values)
+    results = (
+        ('dict', measure(lambda vs: [dict(v) for v in vs], values)),
+        ('Article', measure(lambda vs: [Article(**v) for v in vs], values)),
+    )
+    print(f"文章数：{args.count}，字段文本约 {payload:.0f} 字符/篇（两种表示共享）")
+    print(f"{'表示':<10}{'字节/篇':>10}")
+    for name, size in results:
+        print(f"{name:<10}{size / args.count:>10.0f}")
+    print(f"节省：{1 - results[1][1] / results[0][1]:.0%}")
+
+
+if __name__ == '__main__':
+    main()
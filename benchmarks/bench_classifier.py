@@ -0,0 +1,94 @@
+"""
+技术内容分类模型基准测试
+在同一份标注数据的验证集上对比分类模型与关键词规则的准确率和吞吐量（条/秒），并统计模型加载耗时
+
+用法:
+    # 使用标注数据（JSONL，每行 title/description 或 text，以及 label 0/1）
+    python -m benchmarks.bench_classifier --data data/labels/labeled.jsonl
+    # 没有标注数据时，用关键词词典生成合成数据（仅用于测量吞吐量，准确率参考意义有限）
+    python -m benchmarks.bench_classifier --synthetic 20000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.processors.analyzer import TechAnalyzer, detect_lang
+from core.processors.classifier import TechClassifier, read_labeled, split_holdout
+from core.processors.keywords import get_dictionaries
+
+FILLER_EN = ('the company said on monday that its quarterly results beat expectations as shoppers returned '
+             'to stores while the weather stayed mild and the football season opened with a record crowd').split()
+FILLER_ZH = ['今天', '公司', '表示', '市场', '消费者', '天气', '比赛', '球队', '城市', '旅游', '价格', '上涨', '假期']
+
+
+def synthetic_samples(count: int, seed: int = 42):
+    """用词典术语和普通词汇生成带标签的合成样本"""
+    rng = random.Random(seed)
+    terms = {lang: sorted(d.terms) for lang, d in get_dictionaries().items()}
+    samples = []
+    for i in range(count):
+        zh = i % 4 == 0
+        filler = FILLER_ZH if zh else FILLER_EN
+        words = rng.choices(filler, k=rng.randint(8, 20))
+        label = i % 2
+        if label:
+            for _ in range(rng.randint(1, 3)):
+                words.insert(rng.randrange(len(words)), rng.choice(terms['zh' if zh else 'en']))
+        samples.append(((''.join(words) if zh else ' '.join(words)), label))
+    return samples
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='技术内容分类模型基准测试')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data', type=Path, help='标注数据JSONL文件')
+    source.add_argument('--synthetic', type=int, help='生成的合成样本数')
+    parser.add_argument('--holdout', type=float, default=0.2, help='验证集比例')
+    args = parser.parse_args()
+
+    samples = read_labeled(args.data) if args.data else synthetic_samples(args.synthetic)
+    train_set, test_set = split_holdout(samples, args.holdout)
+    analyzer = TechAnalyzer()
+    analyzer.segmenter.warm()
+
+    train_docs = analyzer.preprocess_mixed([text for text, _ in train_set])
+    classifier, train_time = timed(TechClassifier().fit, train_docs, [label for _, label in train_set])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = Path(tmp) / 'model.joblib'
+        classifier.save(model_path)
+        size_kb = model_path.stat().st_size / 1024
+        classifier, load_time = timed(TechClassifier.load, model_path)
+
+    texts = [text for text, _ in test_set]
+    labels = np.asarray([label for _, label in test_set])
+    langs = [detect_lang(text) for text in texts]
+    # 两种方式的预处理相同，先预热分词缓存，只比较判定本身
+    analyzer.preprocess_mixed(texts)
+
+    analyzer.classifier = None
+    rule_pred, rule_time = timed(analyzer.is_tech_related_batch, texts, langs)
+    analyzer.classifier = classifier
+    model_pred, model_time = timed(analyzer.is_tech_related_batch, texts, langs)
+
+    print(f"样本数：训练{len(train_set)}条，验证{len(test_set)}条；训练耗时{train_time:.2f}秒")
+    print(f"模型文件：{size_kb:.0f}KB，加载耗时：{load_time * 1000:.1f}毫秒")
+    print(f"{'方法':<8}{'准确率':>10}{'条/秒':>14}")
+    for name, pred, elapsed in (('关键词规则', rule_pred, rule_time), ('分类模型', model_pred, model_time)):
+        accuracy = float(np.mean(pred == labels))
+        print(f"{name:<8}{accuracy:>10.3f}{len(texts) / elapsed:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+日期解析基准测试
+对比统一日期解析模块与原有解析方式（fromisoformat 失败后回退 dateutil）的吞吐量，并校验两者结果一致
+
+用法:
+    python -m benchmarks.bench_dates --count 100000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from dateutil.parser import parse
+
+from utils import dates
+from utils.dates import parse_datetime, to_utc
+
+# 各来源的日期格式（RSS 以 RFC 822 为主）
+SOURCE_FORMATS = {
+    'rss-a': lambda dt: dt.strftime('%a, %d %b %Y %H:%M:%S +0000'),
+    'rss-b': lambda dt: dt.strftime('%a, %d %b %Y %H:%M:%S GMT'),
+    'rss-c': lambda dt: dt.astimezone(timezone(timedelta(hours=8))).strftime('%a, %d %b %Y %H:%M:%S %z'),
+    'newsapi': lambda dt: dt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+    'atom': lambda dt: dt.isoformat(),
+    'plain': lambda dt: dt.strftime('%Y-%m-%d %H:%M:%S'),
+}
+
+
+def legacy_parse(dt_str):
+    """原 DataCleaner.parse_datetime 的实现"""
+    if not dt_str:
+        return None
+    try:
+        return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            return parse(dt_str)
+        except (ValueError, AttributeError):
+            return None
+
+
+def samples(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    sources = list(SOURCE_FORMATS)
+    weights = [30, 20, 10, 20, 10, 10]
+    result = []
+    for _ in range(count):
+        source = rng.choices(sources, weights)[0]
+        dt = start + timedelta(seconds=rng.randrange(365 * 86400))
+        result.append((SOURCE_FORMATS[source](dt), source))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='日期解析基准测试')
+    parser.add_argument('--count', type=int, default=100000, help='样本数')
+    args = parser.parse_args()
+
+    items = samples(args.count)
+    start = time.perf_counter()
+    legacy = [legacy_parse(text) for text, _ in items]
+    legacy_time = time.perf_counter() - start
+
+    # 冷启动（包含各来源格式识别）
+    dates._shape_parsers.clear()
+    dates._source_parsers.clear()
+    start = time.perf_counter()
+    unified = [parse_datetime(text, source) for text, source in items]
+    unified_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    without_source = [parse_datetime(text) for text, _ in items]
+    shape_time = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for old, new, other in zip(legacy, unified, without_source)
+        if old is None or to_utc(old) != new or new != other
+    )
+    print(f"样本数：{len(items)}，结果不一致：{mismatches}")
+    print(f"{'方法':<16}{'耗时(秒)':>10}{'条/秒':>14}")
+    for name, elapsed in (('原实现', legacy_time), ('统一解析(按来源)', unified_time), ('统一解析(按形状)', shape_time)):
+        print(f"{name:<16}{elapsed:>10.3f}{len(items) / elapsed:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
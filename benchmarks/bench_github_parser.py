@@ -0,0 +1,95 @@
+"""
+GitHub趋势页面解析引擎基准测试
+对比 bs4 与 lxml 两种解析引擎的解析耗时和峰值内存
+
+用法:
+    # 先保存若干趋势页面
+    curl -s https://github.com/trending -o benchmarks/data/trending_all.html
+    curl -s https://github.com/trending/python?since=weekly -o benchmarks/data/trending_python.html
+    # 运行基准测试
+    python -m benchmarks.bench_github_parser benchmarks/data/*.html --repeat 20
+"""
+
+import argparse
+import glob
+import multiprocessing
+import resource
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from core.crawlers.github_trending import PARSE_ENGINES
+
+DEFAULT_PAGES = 'benchmarks/data/*.html'
+
+
+def _run_engine(engine: str, pages: list, repeat: int, queue):
+    """在独立进程中运行单个引擎，避免两个引擎的内存统计互相干扰"""
+    parse = PARSE_ENGINES[engine]
+    contents = [Path(p).read_bytes() for p in pages]
+    parse(contents[0])  # 预热（加载模块、编译XPath）
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        for content in contents:
+            start = time.perf_counter()
+            parse(content)
+            timings.append(time.perf_counter() - start)
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+
+    # tracemalloc 会拖慢解析，单独统计一轮Python对象峰值内存
+    tracemalloc.start()
+    for content in contents:
+        parse(content)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queue.put({
+        'engine': engine,
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p95_ms': sorted(timings)[int(len(timings) * 0.95) - 1] * 1000,
+        'py_peak_kb': py_peak / 1024,
+        'rss_growth_kb': rss_growth  # Linux下 ru_maxrss 单位为KB
+    })
+
+
+def check_consistency(pages: list):
+    """校验两个引擎对每个页面的输出完全一致"""
+    for page in pages:
+        content = Path(page).read_bytes()
+        results = {name: parse(content) for name, parse in PARSE_ENGINES.items()}
+        baseline = results['bs4']
+        for name, result in results.items():
+            if result != baseline:
+                raise AssertionError(f"{name} 引擎输出与 bs4 不一致: {page}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GitHub趋势页面解析引擎基准测试')
+    parser.add_argument('pages', nargs='*', help=f'已保存的趋势页面（默认 {DEFAULT_PAGES}）')
+    parser.add_argument('--repeat', type=int, default=10, help='每个页面重复解析次数')
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(glob.glob(DEFAULT_PAGES))
+    if not pages:
+        parser.error(f"未找到趋势页面，请先保存页面到 {DEFAULT_PAGES}")
+
+    check_consistency(pages)
+    print(f"页面数：{len(pages)}，重复次数：{args.repeat}，两种引擎输出一致")
+
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'引擎':<6}{'平均(ms)':>12}{'P95(ms)':>12}{'Python峰值(KB)':>18}{'RSS增长(KB)':>16}")
+    for engine in PARSE_ENGINES:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_engine, args=(engine, pages, args.repeat, queue))
+        proc.start()
+        r = queue.get()
+        proc.join()
+        print(f"{r['engine']:<6}{r['mean_ms']:>12.2f}{r['p95_ms']:>12.2f}"
+              f"{r['py_peak_kb']:>18.0f}{r['rss_growth_kb']:>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+批量入库基准测试
+对比原入库方式（默认回滚日志模式，每批一条多行 INSERT ... VALUES）与批量入库（WAL、分块 executemany、
+同一事务）的持续写入速度；bulk 模式关闭近似重复、热门词索引和布隆过滤器，只反映写入本身，
+full 模式与默认配置下的 save_batch 一致，是实际入库流程的速度
+
+用法:
+    python -m benchmarks.bench_ingest --count 200000 --batch-size 5000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import sessionmaker
+
+from config.settings import settings
+from core.article import Article
+from core.database.models import Base, NewsArticle
+from core.processors.cleaner import NormalizedBatch
+from utils.stream import chunked
+
+# 原方式每批一条语句，行数受 SQLite 变量数上限限制
+LEGACY_MAX_ROWS = 2000
+# 摘要的词汇量（接近真实文本，指纹之间相关性低）
+VOCABULARY = 500
+WORDS = ('rust', 'python', 'kernel', 'compiler', 'release', 'cloud', 'database', 'model', 'security', 'browser',
+         'linux', 'startup', 'chip', 'network', 'api', 'framework', 'open', 'source', 'agent', 'storage',
+         'quantum', 'mobile', 'privacy', 'robot', 'vector', 'search', 'gpu', 'wasm', 'edge', 'cache')
+
+
+def synthetic_articles(count: int, seed: int = 42):
+    """清洗后的合成文章（每条URL不同，标题和摘要由随机词组成，近似重复很少）"""
+    rng = random.Random(seed)
+    start = datetime(2025, 3, 22, tzinfo=timezone.utc)
+    for i in range(count):
+        url = f"https://example{i % 50}.com/articles/{i}"
+        yield Article(
+            title=' '.join(rng.choices(WORDS, k=8)) + f" {i}",
+            url=url,
+            canonical_url=url,
+            description=' '.join(f"{rng.choice(WORDS)}{rng.randrange(VOCABULARY)}" for _ in range(30)),
+            source=f"example{i % 50}.com",
+            author='Anonymous',
+            published_at=start + timedelta(seconds=i),
+        )
+
+
+def run_legacy(db_path: Path, batches) -> int:
+    """原 save_batch 的写入方式：默认连接参数，每批新建会话并执行一条多行 INSERT"""
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    inserted = 0
+    for batch in batches:
+        for rows in chunked(batch, LEGACY_MAX_ROWS):
+            session = Session()
+            try:
+                session.execute(insert(NewsArticle).values([article.to_row() for article in rows])
+                                .on_conflict_do_nothing())
+                session.commit()
+            finally:
+                session.close()
+            inserted += len(rows)
+    engine.dispose()
+    return inserted
+
+
+def run_save_batch(db_path: Path, batches, full: bool) -> int:
+    """通过 NewsDatabase.save_batch 入库，full=False 时关闭近似重复、热门词和布隆过滤器"""
+    from core.database.crud import NewsDatabase
+
+    toggles = (settings.DEDUP_CONFIG, settings.TRENDING_CONFIG, settings.SEEN_FILTER_CONFIG)
+    saved = [config['enabled'] for config in toggles]
+    for config in toggles:
+        config['enabled'] = full
+    try:
+        db = NewsDatabase()
+        inserted = 0
+        for batch in batches:
+            inserted += db.save_batch(batch).inserted
+        db.flush()
+        db.engine.dispose()
+    finally:
+        for config, enabled in zip(toggles, saved):
+            config['enabled'] = enabled
+    return inserted
+
+
+def measure(mode: str, count: int, batch_size: int):
+    """在独立的临时数据库中运行一次（数据预先生成，不计入耗时），返回 (插入条数, 耗时秒)"""
+    batches = [NormalizedBatch(batch) for batch in chunked(synthetic_articles(count), batch_size)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'news.db'
+        settings.DATABASE_CONFIG['db_path'] = db_path
+        settings.SEEN_FILTER_CONFIG['snapshot_path'] = Path(tmp) / 'seen_filter.pkl'
+        start = time.perf_counter()
+        if mode == 'legacy':
+            inserted = run_legacy(db_path, batches)
+        else:
+            inserted = run_save_batch(db_path, batches, full=mode == 'full')
+        return inserted, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量入库基准测试')
+    parser.add_argument('--count', type=int, default=200000, help='文章数')
+    parser.add_argument('--batch-size', type=int, default=5000, help='每次调用入库的条数')
+    parser.add_argument('--modes', nargs='+', default=['legacy', 'bulk', 'full'],
+                        choices=['legacy', 'bulk', 'full'], help='测试的入库方式')
+    args = parser.parse_args()
+
+    print(f"{'方式':<8}{'插入条数':>10}{'耗时(秒)':>12}{'条/秒':>12}")
+    rates = {}
+    for mode in args.modes:
+        inserted, elapsed = measure(mode, args.count, args.batch_size)
+        rates[mode] = inserted / elapsed
+        print(f"{mode:<8}{inserted:>10}{elapsed:>12.2f}{rates[mode]:>12,.0f}")
+    if 'bulk' in rates and 'full' in rates:
+        print(f"实际入库流程（full）为纯写入（bulk）的 {rates['full'] / rates['bulk']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+近似重复索引扩展性基准测试
+按批次持续入库（只开启近似重复处理），输出每批的耗时、候选比较次数和表中已有文章数；
+候选查找与已存储文章数无关时，每批耗时应保持平稳
+
+用法:
+    python -m benchmarks.bench_near_dup --count 100000 --batch-size 5000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from config.settings import settings
+from core.processors.cleaner import NormalizedBatch
+from utils.stream import chunked
+from .bench_ingest import synthetic_articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description='近似重复索引扩展性基准测试')
+    parser.add_argument('--count', type=int, default=100000, help='文章数')
+    parser.add_argument('--batch-size', type=int, default=5000, help='每次调用入库的条数')
+    args = parser.parse_args()
+
+    batches = [NormalizedBatch(batch) for batch in chunked(synthetic_articles(args.count), args.batch_size)]
+    toggles = (settings.TRENDING_CONFIG, settings.SEEN_FILTER_CONFIG)
+    saved = [config['enabled'] for config in toggles]
+    for config in toggles:
+        config['enabled'] = False
+    settings.DEDUP_CONFIG['enabled'] = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            settings.DATABASE_CONFIG['db_path'] = Path(tmp) / 'news.db'
+            from core.database.crud import NewsDatabase
+
+            db = NewsDatabase()
+            stored = 0
+            total = 0.0
+            print(f"{'批次':<6}{'已有文章':>10}{'插入条数':>10}{'候选比较':>10}{'耗时(秒)':>10}")
+            for index, batch in enumerate(batches, 1):
+                db.near_dup.comparisons = 0
+                start = time.perf_counter()
+                result = db.save_batch(batch)
+                elapsed = time.perf_counter() - start
+                total += elapsed
+                print(f"{index:<6}{stored:>10}{result.inserted:>10}{db.near_dup.comparisons:>10}{elapsed:>10.2f}")
+                stored += result.inserted
+            db.engine.dispose()
+    finally:
+        for config, enabled in zip(toggles, saved):
+            config['enabled'] = enabled
+    print(f"合计 {stored} 条，{total:.2f} 秒，{stored / total:,.0f} 条/秒")
+
+
+if __name__ == '__main__':
+    main()
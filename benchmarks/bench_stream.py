@@ -0,0 +1,88 @@
+"""
+流式处理内存基准测试
+对比整批处理（采集结果全部放入列表后清洗、入库）与流式处理（分块经过 预过滤 -> 清洗 -> 入库）的
+Python 对象峰值内存和耗时；流式处理的峰值内存应与数据总量无关
+
+用法:
+    python -m benchmarks.bench_stream --counts 10000 40000 --chunk-size 500
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from config.settings import settings
+from core.processors.cleaner import DataCleaner
+from utils.stream import StageCounters, chunked, run_stage
+
+# SQLite 单条语句的变量数有上限，整批模式按该大小分多次写入
+BATCH_INSERT_ROWS = 2000
+
+
+def synthetic_source(count: int):
+    """逐条产出的合成采集数据（摘要约1KB）"""
+    for i in range(count):
+        yield {
+            'title': f"Story {i}: new release of the compiler toolchain",
+            'url': f"https://example{i % 50}.com/articles/{i}?utm_source=rss",
+            'description': f"<p>Summary {i} " + 'lorem ipsum dolor sit amet ' * 36 + '</p>',
+            'source': f"example{i % 50}.com",
+            'published_at': 'Sat, 22 Mar 2025 10:00:00 +0000',
+        }
+
+
+def run_batch(db, count: int, chunk_size: int):
+    items = list(synthetic_source(count))
+    items = db.filter_unseen(items)
+    cleaned = DataCleaner.normalize_data(items)
+    for chunk in chunked(cleaned, BATCH_INSERT_ROWS):
+        db.save_batch(chunk)
+    return len(cleaned)
+
+
+def run_stream(db, count: int, chunk_size: int):
+    counters = StageCounters()
+    chunks = chunked(synthetic_source(count), chunk_size)
+    chunks = run_stage(chunks, 'unseen', db.filter_unseen, counters)
+    chunks = run_stage(chunks, 'cleaned', DataCleaner.normalize_data, counters)
+    for chunk in chunks:
+        db.save_batch(chunk)
+    return counters.counts.get('cleaned', 0)
+
+
+def measure(mode: str, count: int, chunk_size: int):
+    """在独立的临时数据库中运行一次，返回 (条数, 峰值内存MB, 耗时秒)"""
+    from core.database.crud import NewsDatabase
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.DATABASE_CONFIG['db_path'] = Path(tmp) / 'news.db'
+        settings.SEEN_FILTER_CONFIG['snapshot_path'] = Path(tmp) / 'seen_filter.pkl'
+        db = NewsDatabase()
+        runner = run_batch if mode == 'batch' else run_stream
+        tracemalloc.start()
+        start = time.perf_counter()
+        processed = runner(db, count, chunk_size)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        db.engine.dispose()
+    return processed, peak / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式处理内存基准测试')
+    parser.add_argument('--counts', type=int, nargs='+', default=[10000, 40000], help='数据总量')
+    parser.add_argument('--chunk-size', type=int, default=settings.PIPELINE_CONFIG['chunk_size'], help='分块大小')
+    args = parser.parse_args()
+
+    print(f"{'模式':<8}{'条数':>10}{'峰值内存(MB)':>16}{'耗时(秒)':>12}")
+    for count in args.counts:
+        for mode in ('batch', 'stream'):
+            processed, peak_mb, elapsed = measure(mode, count, args.chunk_size)
+            print(f"{mode:<8}{processed:>10}{peak_mb:>16.1f}{elapsed:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -17,10 +17,200 @@ class Settings:
         "GitHubTrending": "https://github.com/trending"
     }
 
+    # 采集配置
+    COLLECT_CONFIG = {
+        'mode': os.getenv("COLLECT_MODE", "concurrent"),  # concurrent（并发）/ sequential（串行）
+        'max_workers': int(os.getenv("COLLECT_MAX_WORKERS", 4)),
+        'default_deadline': float(os.getenv("COLLECT_DEADLINE", 60)),  # 单个数据源的截止时间（秒）
+        'deadlines': {
+            'GitHubTrendingCrawler': float(os.getenv("GITHUB_DEADLINE", 60)),
+            'NewsAPICrawler': float(os.getenv("NEWSAPI_DEADLINE", 45)),
+            'RSSFeedCrawler': float(os.getenv("RSS_DEADLINE", 120))
+        }
+    }
+
+    # 流水线配置
+    PIPELINE_CONFIG = {
+        'mode': os.getenv("PIPELINE_MODE", "batch"),  # batch（整批处理）/ stream（分块流式处理，峰值内存固定）
+        'chunk_size': int(os.getenv("STREAM_CHUNK_SIZE", 500)),  # 流式处理的分块大小
+        'queue_size': int(os.getenv("STREAM_QUEUE_SIZE", 8)),  # 各数据源汇合队列可容纳的分块数
+        'digest_limit': int(os.getenv("STREAM_DIGEST_LIMIT", 200))  # 流式模式下邮件摘要最多保留的条数
+    }
+
+    # HTTP条件请求缓存配置
+    HTTP_CACHE_CONFIG = {
+        'enabled': os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true",
+        'cache_dir': BASE_DIR / "data/http_cache"
+    }
+
+    # NewsAPI增量采集配置
+    NEWSAPI_CONFIG = {
+        # 分号分隔的查询，category:xxx 走 top-headlines，q:xxx 走 everything
+        'queries': os.getenv("NEWSAPI_QUERIES", "category:technology"),
+        'page_size': int(os.getenv("NEWSAPI_PAGE_SIZE", 100)),  # 接口允许的最大值为100
+        'max_pages': int(os.getenv("NEWSAPI_MAX_PAGES", 5)),  # 单个查询最多翻页数
+        'max_workers': int(os.getenv("NEWSAPI_MAX_WORKERS", 4)),  # 并发查询数
+        'state_file': BASE_DIR / "data/state/newsapi_watermarks.json"  # 水位线持久化文件
+    }
+
+    # GitHub趋势采集配置
+    GITHUB_CONFIG = {
+        'parser': os.getenv("GITHUB_PARSER", "lxml"),  # 解析引擎：lxml（增量快速解析）/ bs4
+        # 逗号分隔的语言列表，空项表示全部语言，如 ",python,rust,go"
+        'languages': list(dict.fromkeys(lang.strip().lower() for lang in os.getenv("GITHUB_LANGUAGES", "").split(','))),
+        'ranges': [r.strip() for r in os.getenv("GITHUB_RANGES", "daily").split(',') if r.strip()],  # daily/weekly/monthly
+        'top_k': int(os.getenv("GITHUB_TOP_K", 10)),  # 合并后保留的仓库数
+        'max_workers': int(os.getenv("GITHUB_MAX_WORKERS", 8))
+    }
+
+    # RSS多订阅源采集配置
+    RSS_CONFIG = {
+        'feeds_file': Path(os.getenv("RSS_FEEDS_FILE", BASE_DIR / "config/feeds.json")),
+        'fetch_workers': int(os.getenv("RSS_FETCH_WORKERS", 16)),  # 并发下载线程数
+        'parse_workers': int(os.getenv("RSS_PARSE_WORKERS", os.cpu_count() or 1)),  # 解析进程数，1表示在下载线程中解析
+        'timeout': float(os.getenv("RSS_TIMEOUT", 15))  # 单个订阅源默认超时（秒）
+    }
+
+    # 共享HTTP客户端配置
+    HTTP_CLIENT_CONFIG = {
+        'user_agent': 'TechNewsMonitor/1.0 (+https://github.com/DpengYu/NewsDetector)',
+        'timeout': float(os.getenv("HTTP_TIMEOUT", 15)),  # 默认超时（秒）
+        'retries': int(os.getenv("HTTP_RETRIES", 3)),
+        'backoff_factor': 0.5,  # 指数退避基数（秒）
+        'backoff_jitter': 0.5,  # 退避随机抖动上限（秒）
+        'pool_connections': int(os.getenv("HTTP_POOL_HOSTS", 64)),  # 缓存连接池的主机数
+        'pool_maxsize': int(os.getenv("HTTP_POOL_MAXSIZE", 16)),  # 每个主机默认最大连接数
+        'host_pool_sizes': {  # 高并发主机单独配置连接数
+            'newsapi.org': 8,
+            'github.com': 8
+        }
+    }
+
+    # 按主机限流配置（单位：次/秒）
+    RATE_LIMIT_CONFIG = {
+        'default_rate': float(os.getenv("RATE_LIMIT_DEFAULT", 2)),
+        'burst': float(os.getenv("RATE_LIMIT_BURST", 5)),  # 令牌桶容量
+        'min_rate': 0.05,
+        'max_rate': float(os.getenv("RATE_LIMIT_MAX", 10)),
+        'increase_step': 0.1,  # 每次成功响应的速率回升步长
+        # 单独指定主机的初始速率，格式 host:rate,host:rate
+        'host_rates': {
+            host.strip(): float(rate)
+            for host, _, rate in (
+                item.partition(':') for item in
+                os.getenv("RATE_LIMIT_HOSTS", "github.com:1,newsapi.org:1").split(',') if item.strip()
+            )
+        }
+    }
+
+    # 原始响应归档与回放配置
+    ARCHIVE_CONFIG = {
+        'mode': os.getenv("ARCHIVE_MODE", "off").lower(),  # off / record（归档）/ replay（离线回放）
+        'root': Path(os.getenv("ARCHIVE_DIR", BASE_DIR / "data/archive")),
+        'replay_at': os.getenv("ARCHIVE_REPLAY_AT"),  # 回放时间点（ISO格式），默认使用最新归档
+        'volatile_params': {'apiKey', 'from'}  # 不参与匹配的请求参数
+    }
+
+    # 数据源熔断配置
+    CIRCUIT_BREAKER_CONFIG = {
+        'failure_threshold': int(os.getenv("BREAKER_FAILURE_THRESHOLD", 3)),  # 连续失败次数
+        'recovery_timeout': float(os.getenv("BREAKER_RECOVERY_TIMEOUT", 3600)),  # 熔断冷却时间（秒）
+        'state_file': BASE_DIR / "data/state/circuit_breakers.json"
+    }
+
+    # 文章正文抓取配置
+    CONTENT_CONFIG = {
+        'enabled': os.getenv("CONTENT_FETCH_ENABLED", "false").lower() == "true",
+        'max_workers': int(os.getenv("CONTENT_MAX_WORKERS", 16)),
+        'per_domain': int(os.getenv("CONTENT_PER_DOMAIN", 2)),  # 每个域名的最大并发连接数
+        'deadline': float(os.getenv("CONTENT_DEADLINE", 90)),  # 整个阶段的截止时间（秒）
+        'timeout': float(os.getenv("CONTENT_TIMEOUT", 10)),  # 单篇请求超时（秒）
+        'max_bytes': int(os.getenv("CONTENT_MAX_BYTES", 2 * 1024 * 1024)),  # 单篇最大下载字节数
+        'max_chars': 20000,  # 正文最大保存字符数
+        'skip_sources': {'GitHub'},  # 不抓取正文的来源
+        'cache_dir': BASE_DIR / "data/article_cache"
+    }
+
+    # 技术关键词词典配置
+    KEYWORD_CONFIG = {
+        # 每种语言一个词典文件 <lang>.txt，每行格式：术语|同义词...<TAB>分类
+        'dict_dir': Path(os.getenv("KEYWORD_DICT_DIR", BASE_DIR / "config/keywords"))
+    }
+
+    # 中文分词配置
+    SEGMENT_CONFIG = {
+        'cache_size': int(os.getenv("SEGMENT_CACHE_SIZE", 50000)),  # 分词结果LRU缓存条数
+        'workers': int(os.getenv("SEGMENT_WORKERS", 0)),  # 分词进程数，0表示在当前进程分词
+        'parallel_threshold': int(os.getenv("SEGMENT_PARALLEL_THRESHOLD", 500)),  # 未命中条数达到该值才使用进程池
+        'chunk_size': 200  # 每个进程任务的文本条数
+    }
+
+    # 技术内容分类模型配置（未启用或模型文件不存在时使用关键词规则）
+    CLASSIFIER_CONFIG = {
+        'enabled': os.getenv("CLASSIFIER_ENABLED", "false").lower() == "true",
+        'model_path': Path(os.getenv("CLASSIFIER_MODEL_PATH", BASE_DIR / "data/models/tech_classifier.joblib")),
+        'threshold': float(os.getenv("CLASSIFIER_THRESHOLD", 0.5)),  # 判定为技术内容的概率阈值
+        'n_features': 2 ** 20  # 特征哈希维度，修改后需重新训练
+    }
+
+    # 近似重复检测配置
+    DEDUP_CONFIG = {
+        'enabled': os.getenv("NEAR_DEDUP_ENABLED", "true").lower() == "true",
+        'mode': os.getenv("NEAR_DEDUP_MODE", "cluster"),  # cluster=入库并标记聚类（默认，不丢弃数据），drop=丢弃，merge=合并到已有文章
+        'max_distance': int(os.getenv("NEAR_DEDUP_MAX_DISTANCE", 3)),  # 判定为近似重复的最大汉明距离（64位指纹）
+        'lookback_days': int(os.getenv("NEAR_DEDUP_LOOKBACK_DAYS", 7)),  # 与最近N天入库的文章比较
+        'chunk_size': 5000  # 回填指纹和查询候选的分块大小
+    }
+
+    # 热门词索引配置（入库时按小时累计标题分词，查询近N小时相对基线期突增的词）
+    TRENDING_CONFIG = {
+        'enabled': os.getenv("TRENDING_ENABLED", "true").lower() == "true",
+        'window_hours': int(os.getenv("TRENDING_WINDOW_HOURS", 6)),  # 默认观察窗口（近N小时）
+        'baseline_hours': int(os.getenv("TRENDING_BASELINE_HOURS", 72)),  # 观察窗口之前用于估计常规频率的小时数
+        'min_count': int(os.getenv("TRENDING_MIN_COUNT", 3)),  # 窗口内至少出现的文章数
+        'top_k': int(os.getenv("TRENDING_TOP_K", 20)),
+        'chunk_size': 5000  # 首次回填的分块大小
+    }
+
+    # 相关度评分配置（评分 = 来源权重 ×（关键词、star增速、时效三项得分的加权和），各项得分在0~1之间）
+    RANKING_CONFIG = {
+        'weights': {
+            'keywords': float(os.getenv("RANK_WEIGHT_KEYWORDS", 0.4)),
+            'stars': float(os.getenv("RANK_WEIGHT_STARS", 0.3)),
+            'recency': float(os.getenv("RANK_WEIGHT_RECENCY", 0.3))
+        },
+        'keyword_cap': 5,  # 命中不同技术术语达到该数量时关键词得分为1
+        'stars_reference': float(os.getenv("RANK_STARS_REFERENCE", 500)),  # 日均star增长达到该值时star得分为1（对数刻度）
+        'half_life_hours': float(os.getenv("RANK_HALF_LIFE_HOURS", 24)),  # 时效得分每隔N小时减半
+        # 来源权重，格式 source:weight,source:weight（未列出的来源为1）
+        'source_weights': {
+            source.strip(): float(weight)
+            for source, _, weight in (
+                item.partition(':') for item in os.getenv("RANK_SOURCE_WEIGHTS", "").split(',') if item.strip()
+            )
+        }
+    }
+
+    # 已入库数据预过滤（布隆过滤器）配置
+    SEEN_FILTER_CONFIG = {
+        'enabled': os.getenv("SEEN_FILTER_ENABLED", "true").lower() == "true",
+        'error_rate': float(os.getenv("SEEN_FILTER_ERROR_RATE", 0.001)),  # 新数据被误判为已入库的概率上限
+        'initial_capacity': 100000,
+        'snapshot_path': Path(os.getenv("SEEN_FILTER_SNAPSHOT", BASE_DIR / "data/state/seen_filter.pkl")),
+        'snapshot_interval': float(os.getenv("SEEN_FILTER_SNAPSHOT_INTERVAL", 60)),  # 入库后保存快照的最短间隔（秒）
+        'chunk_size': 50000  # 从数据库重建时的分块大小
+    }
+
     # 数据库配置
     DATABASE_CONFIG = {
-        'db_path': BASE_DIR / "data/news.db",
-        'table_name': 'tech_news'
+        'db_path': Path(os.getenv("DB_PATH", BASE_DIR / "data/news.db")),
+        'table_name': 'tech_news',
+        'journal_mode': os.getenv("DB_JOURNAL_MODE", "wal"),  # WAL：写入不阻塞读取，提交只追加日志
+        'synchronous': os.getenv("DB_SYNCHRONOUS", "normal"),  # WAL 模式下 normal 在断电时可能丢失最近的提交，但不会损坏数据库
+        'cache_size_mb': int(os.getenv("DB_CACHE_SIZE_MB", 64)),  # 每个连接的页缓存
+        'busy_timeout_ms': 5000,  # 其他进程写入时的等待时间
+        'pool_size': 5,  # 连接池大小
+        'insert_chunk_size': int(os.getenv("DB_INSERT_CHUNK_SIZE", 2000))  # 批量插入每次 executemany 的行数
     }
 
     # 邮件配置
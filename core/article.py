@@ -0,0 +1,91 @@
+"""
+文章记录类型
+采集、清洗、过滤、存储和邮件发送各阶段统一使用的紧凑记录（__slots__，无逐条的 __dict__），
+同时支持 article['url']、article.get('url') 等字典式访问，便于与已有代码和模板兼容：
+值为 None 的字段视为不存在（get 返回默认值，in 判断为 False，不出现在 keys() 中）
+"""
+
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+
+@dataclass(slots=True)
+class Article:
+    """一篇文章"""
+    title: str = ''
+    url: str = ''
+    description: str = ''
+    content: Optional[str] = None  # 正文（正文抓取阶段提取）
+    source: Optional[str] = None
+    author: Optional[str] = None
+    today_stars: Optional[int] = None  # GitHub 今日新增star数
+    published_at: Union[str, datetime, None] = None  # 采集时为原始字符串，清洗后为UTC时间
+    canonical_url: Optional[str] = None
+    content_hash: Optional[str] = None  # SimHash 指纹
+    cluster_id: Optional[int] = None  # 近似重复聚类ID
+    relevance: Optional[float] = None  # 相关度评分（评分阶段计算）
+    stars_per_day: Optional[float] = None  # GitHub 平均每日star增长
+    trending_tags: Optional[List[str]] = None  # GitHub 趋势榜来源标签
+    translated_title: Optional[str] = None  # AI 翻译
+    translated_description: Optional[str] = None
+    id: Optional[int] = None  # 入库后的ID（从数据库读取时才有值）
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in FIELD_SET and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key) if key in FIELD_SET else None
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        return [name for name in FIELDS if getattr(self, name) is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转为字典（省略值为 None 的字段）"""
+        return {name: value for name in FIELDS if (value := getattr(self, name)) is not None}
+
+    def to_row(self) -> Dict[str, Any]:
+        """转为数据表的一行（包含所有列，用于批量插入）"""
+        return {name: getattr(self, name) for name in ROW_FIELDS}
+
+    def with_translation(self, translation: Mapping[str, str]) -> 'Article':
+        """
+        返回带翻译的副本（不修改原记录）
+        参数:
+            translation: 包含 translated_title、translated_description 的映射
+        """
+        return replace(self, translated_title=translation.get('translated_title'),
+                       translated_description=translation.get('translated_description'))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'Article':
+        """从字典创建（忽略未定义的键）"""
+        return cls(**{key: value for key, value in data.items() if key in FIELD_SET})
+
+    @classmethod
+    def from_orm(cls, row) -> 'Article':
+        """从 ORM 对象（NewsArticle）创建"""
+        return cls(id=row.id, **{name: getattr(row, name) for name in ROW_FIELDS})
+
+    @classmethod
+    def coerce(cls, item: Union['Article', Mapping[str, Any]]) -> 'Article':
+        """已是 Article 时直接返回，否则从字典创建"""
+        return item if isinstance(item, cls) else cls.from_dict(item)
+
+
+FIELDS = tuple(field.name for field in fields(Article))
+FIELD_SET = frozenset(FIELDS)
+# tech_news 表中与记录字段同名的列（不含自增ID，新增列时同步修改）
+ROW_FIELDS = ('title', 'url', 'canonical_url', 'description', 'content', 'source', 'author', 'today_stars',
+              'published_at', 'content_hash', 'cluster_id', 'relevance')
@@ -6,5 +6,7 @@
 from .news_api import NewsAPICrawler  # noqa: F401
 from .rss_parser import RSSParser  # noqa: F401
 from .github_trending import GitHubTrendingCrawler  # noqa: F401
+from .rss_engine import FeedRegistry, RSSFeedCrawler  # noqa: F401
+from .article_fetcher import ArticleContentFetcher  # noqa: F401
 
-__all__ = ['NewsAPICrawler', 'RSSParser', 'GitHubTrendingCrawler']
\ No newline at end of file
+__all__ = ['NewsAPICrawler', 'RSSParser', 'GitHubTrendingCrawler', 'FeedRegistry', 'RSSFeedCrawler', 'ArticleContentFetcher']
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+文章正文抓取模块
+并发下载新闻原文并提取正文，按域名限制并发连接数，受总截止时间和单篇字节上限约束，
+提取结果按URL缓存到磁盘，同一篇文章不会重复下载
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from lxml import etree, html as lxml_html
+
+from config.settings import settings
+from core.article import Article
+from utils import http_client
+from utils.logger import get_logger
+from utils.metrics import CONTENT_FETCH_COUNTER
+
+logger = get_logger(__name__)
+
+# 提取正文前移除的非正文标签
+_NOISE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'svg']
+_XPATH_PARAGRAPH_PARENTS = etree.XPath('//p/..')
+
+
+def extract_main_text(content: bytes, max_chars: int = 20000) -> str:
+    """
+    从HTML中提取正文
+    优先使用 <article> 标签，否则选择直接包含段落文字最多的节点
+    参数:
+        content: HTML原始字节
+        max_chars: 正文最大字符数
+    返回:
+        str: 按段落换行的正文，提取失败时为空字符串
+    """
+    try:
+        doc = lxml_html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        return ''
+    etree.strip_elements(doc, *_NOISE_TAGS, with_tail=False)
+
+    articles = doc.xpath('//article')
+    if articles:
+        best = max(articles, key=lambda node: len(node.text_content()))
+        paragraphs = list(best.iterfind('.//p')) or [best]
+    else:
+        # 没有 <article> 时，选择直接子段落文字总量最多的节点（正文区域）
+        best = max(
+            _XPATH_PARAGRAPH_PARENTS(doc),
+            key=lambda node: sum(len(p.text_content().strip()) for p in node.iterfind('p')),
+            default=None
+        )
+        if best is None:
+            return ''
+        paragraphs = best.iterfind('p')
+
+    texts = (' '.join(p.text_content().split()) for p in paragraphs)
+    return '\n'.join(t for t in texts if t)[:max_chars]
+
+
+class ArticleContentFetcher:
+    """文章正文并发抓取器"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config or settings.CONTENT_CONFIG
+        self.max_workers = config['max_workers']
+        self.per_domain = config['per_domain']
+        self.deadline = config['deadline']
+        self.max_bytes = config['max_bytes']
+        self.max_chars = config['max_chars']
+        self.timeout = config['timeout']
+        self.skip_sources = config['skip_sources']
+        self.cache_dir = Path(config['cache_dir'])
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.session = http_client.get_session('Article')
+        self._domain_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def enrich(self, articles: List[Article]) -> List[Article]:
+        """
+        为文章补充 content 字段（原地修改并返回原列表）
+        超过总截止时间仍未完成的文章保持无正文
+        参数:
+            articles: 清洗后的文章
+        """
+        pending = [a for a in articles if a.source not in self.skip_sources and not a.content]
+        if not pending:
+            return articles
+
+        start_time = time.monotonic()
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='article')
+        futures = {executor.submit(self._fetch_one, article.url, stop): article for article in pending}
+        done, not_done = wait(futures, timeout=self.deadline)
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        fetched = 0
+        for future in done:
+            try:
+                content = future.result()
+            except Exception as e:
+                logger.debug(f"正文抓取失败({futures[future].url}): {str(e)}")
+                CONTENT_FETCH_COUNTER.labels(result='error').inc()
+                continue
+            if content:
+                futures[future].content = content
+                fetched += 1
+        if not_done:
+            CONTENT_FETCH_COUNTER.labels(result='timeout').inc(len(not_done))
+
+        logger.info(f"正文抓取完成，耗时：{time.monotonic() - start_time:.2f}秒，"
+                    f"成功：{fetched}/{len(pending)}条，超时未完成：{len(not_done)}条")
+        return articles
+
+    def _fetch_one(self, url: str, stop: threading.Event) -> Optional[str]:
+        """抓取并提取单篇正文，优先读取缓存"""
+        cache_path = self._cache_path(url)
+        if cache_path.exists():
+            CONTENT_FETCH_COUNTER.labels(result='cached').inc()
+            return gzip.decompress(cache_path.read_bytes()).decode('utf-8')
+
+        with self._domain_limit(urlparse(url).hostname or ''):
+            if stop.is_set():
+                return None
+            raw = self._download(url)
+
+        content = extract_main_text(raw, self.max_chars) if raw else ''
+        if content:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(gzip.compress(content.encode('utf-8')))
+        CONTENT_FETCH_COUNTER.labels(result='fetched' if content else 'empty').inc()
+        return content
+
+    def _download(self, url: str) -> bytes:
+        """流式下载，超过字节上限即截断"""
+        with self.session.get(url, stream=True, timeout=self.timeout) as resp:
+            resp.raise_for_status()
+            if 'html' not in resp.headers.get('Content-Type', 'text/html'):
+                return b''
+            chunks, size = [], 0
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    break
+            return b''.join(chunks)[:self.max_bytes]
+
+    def _domain_limit(self, domain: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if domain not in self._domain_limits:
+                self._domain_limits[domain] = threading.BoundedSemaphore(self.per_domain)
+            return self._domain_limits[domain]
+
+    def _cache_path(self, url: str) -> Path:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.txt.gz"
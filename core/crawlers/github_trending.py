@@ -1,8 +1,18 @@
+import heapq
 import re
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+from urllib.parse import quote
 from bs4 import BeautifulSoup
+from lxml import etree
 from config import settings
+from core.article import Article
+from utils import http_client
+from utils.http_cache import HTTPCache
 from utils.logger import get_logger
+from utils.stream import iter_completed
 
 logger = get_logger(__name__)
 
@@ -13,76 +23,229 @@ def extract_star_number(text: str) -> int:
         return int(match.group().replace(',', ''))
     return 0
 
+def _node_text(node) -> str:
+    """与 BeautifulSoup.get_text(strip=True) 等价的lxml文本提取"""
+    return ''.join(t.strip() for t in node.itertext() if t.strip())
+
+def _has_classes(*classes: str) -> str:
+    """生成匹配全部CSS类名的XPath条件"""
+    return ' and '.join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in classes
+    )
+
+_XPATH_H2 = etree.XPath('(.//h2)[1]')
+_XPATH_HREF = etree.XPath('(.//a)[1]/@href')
+_XPATH_DESC = etree.XPath('(.//p)[1]')
+_XPATH_STAR_SPANS = etree.XPath(f".//div[{_has_classes('f6', 'color-fg-muted', 'mt-2')}]/span")
+
+# 各时间范围对应的天数（用于换算star增长速度）
+RANGE_DAYS = {'daily': 1, 'weekly': 7, 'monthly': 30}
+
+def _extract_period_stars(span_texts) -> int:
+    """从统计栏文本中提取本周期新增star数（stars today / this week / this month，缺失时为0）"""
+    period_stars = 0
+    for text in span_texts:
+        text = text.lower()
+        if 'star' in text and ('today' in text or 'this week' in text or 'this month' in text):
+            period_stars = extract_star_number(text)
+    return period_stars
+
+def parse_trending_bs4(content: bytes) -> list:
+    """
+    基于BeautifulSoup的解析引擎
+    参数:
+        content: 趋势页面原始字节
+    返回:
+        list: 仓库列表（页面原始顺序）
+    """
+    soup = BeautifulSoup(content, 'lxml')
+    repos = []
+
+    for article in soup.select('article.Box-row'):
+        # 基础信息解析
+        repo = {
+            'title': article.h2.get_text(strip=True),
+            'url': "https://github.com" + article.h2.a['href'],
+            'description': (article.p.get_text(strip=True)
+                           if article.p else ""),
+            'source': 'GitHub'
+        }
+
+        # Star数量解析
+        star_stats = article.select('div.f6.color-fg-muted.mt-2 > span')
+        repo['period_stars'] = _extract_period_stars(
+            span.get_text(strip=True) for span in star_stats
+        )
+        repos.append(repo)
+
+    return repos
+
+def parse_trending_lxml(content: bytes, chunk_size: int = 64 * 1024) -> list:
+    """
+    基于lxml增量解析的快速引擎，输出与 parse_trending_bs4 一致
+    按块喂入原始字节，每解析完一个 article 立即提取并释放，不构建完整文档树
+    参数:
+        content: 趋势页面原始字节
+        chunk_size: 每次喂入解析器的字节数
+    返回:
+        list: 仓库列表（页面原始顺序）
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag='article')
+    repos = []
+
+    def drain():
+        for _, article in parser.read_events():
+            if ' Box-row ' in f" {article.get('class', '')} ":
+                h2 = _XPATH_H2(article)[0]
+                desc = _XPATH_DESC(article)
+                repos.append({
+                    'title': _node_text(h2),
+                    'url': "https://github.com" + _XPATH_HREF(h2)[0],
+                    'description': _node_text(desc[0]) if desc else "",
+                    'source': 'GitHub',
+                    'period_stars': _extract_period_stars(
+                        _node_text(span) for span in _XPATH_STAR_SPANS(article)
+                    )
+                })
+            # 释放已处理的节点，保持内存占用平稳
+            article.clear()
+            while article.getprevious() is not None:
+                del article.getparent()[0]
+
+    for offset in range(0, len(content), chunk_size):
+        parser.feed(content[offset:offset + chunk_size])
+        drain()
+    parser.close()
+    drain()
+    return repos
+
+# 可选解析引擎
+PARSE_ENGINES = {
+    'bs4': parse_trending_bs4,
+    'lxml': parse_trending_lxml
+}
+
 class GitHubTrendingCrawler:
-    """GitHub趋势仓库采集器（支持打印未解析的完整文本）"""
+    """GitHub趋势仓库采集器（语言 × 时间范围矩阵并发采集）"""
     
     def __init__(self):
+        config = settings.GITHUB_CONFIG
         self.headers = {
-            'User-Agent': 'TechNewsMonitor/1.0 (+https://github.com/your_repo)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
         }
-        self.session = requests.Session()
-        self.session.mount('https://', requests.adapters.HTTPAdapter(max_retries=3))
+        self.base_url = settings.TECH_SOURCES["GitHubTrending"]
+        self.probe_url = self.base_url  # 熔断探测地址
+        self.session = http_client.get_session('GitHub', headers=self.headers)
+        self.cache = HTTPCache()
+        engine = config['parser']
+        if engine not in PARSE_ENGINES:
+            raise ValueError(f"不支持的解析引擎: {engine}")
+        self.parse_engine = PARSE_ENGINES[engine]
+
+        invalid = [since for since in config['ranges'] if since not in RANGE_DAYS]
+        if invalid:
+            raise ValueError(f"不支持的时间范围: {invalid}")
+        # 空字符串表示全部语言
+        self.matrix = [(lang, since) for lang in config['languages'] for since in config['ranges']]
+        self.top_k = config['top_k']
+        self.max_workers = config['max_workers']
 
     def fetch(self) -> list:
         """
-        获取当前趋势仓库列表
+        并发采集所有 语言 × 时间范围 的趋势页面，合并去重后保留Top-K
         返回:
-            list: 按今日star数降序排列的仓库列表
+            list: 按star增长速度降序排列的仓库列表
+        """
+        return list(self.iter_fetch())
+
+    def iter_fetch(self, cancel_event: Optional[threading.Event] = None) -> Iterator[Article]:
+        """
+        逐条产出 fetch 的结果（Top-K 需要所有页面合并后才能确定，结果数量受 top_k 限制）
+        参数:
+            cancel_event: 取消信号，置位后取消未开始的页面、不再等待进行中的页面并停止产出；
+                为 CancelToken 时每个页面请求的超时不超过截止时间
         """
+        pages = []
+        errors = []
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.matrix)),
+                                      thread_name_prefix='github')
         try:
-            resp = self.session.get(
-                settings.TECH_SOURCES["GitHubTrending"],
-                headers=self.headers,
-                timeout=15
-            )
-            resp.raise_for_status()
-
-            # 打印未解析的完整HTML文本
-            # logger.info(f"未解析的完整HTML文本： {resp.text}")
-
-            soup = BeautifulSoup(resp.text, 'lxml')
-            return self._parse(soup)
-        except Exception as e:
-            logger.error(f"GitHub trending爬取失败: {str(e)}")
-            return []
-
-    def _parse(self, soup: BeautifulSoup) -> list:
-        """解析页面并提取仓库信息"""
-        repos = []
-        
-        for article in soup.select('article.Box-row'):
-            # 基础信息解析
-            repo = {
-                'title': article.h2.get_text(strip=True),
-                'url': "https://github.com" + article.h2.a['href'],
-                'description': (article.p.get_text(strip=True) 
-                               if article.p else ""),
-                'source': 'GitHub'
-            }
-
-            # Star数量解析
-            star_stats = article.select('div.f6.color-fg-muted.mt-2 > span')
-            
-            for span in star_stats:
-                text = span.get_text(strip=True).lower()
-                if 'star' in text:
-                    if 'today' in text:
-                        today_stars = extract_star_number(text)
-
-            repo.update({
-                'today_stars': today_stars
-            })
-            repos.append(repo)
-
-        # 按今日star数降序排序
-        sorted_repos = sorted(
-            repos,
-            key=lambda x: x['today_stars'],
-            reverse=True
+            futures = {executor.submit(self._fetch_page, lang, since, cancel_event): (lang, since)
+                       for lang, since in self.matrix}
+            for future in iter_completed(futures, cancel_event):
+                lang, since = futures[future]
+                try:
+                    pages.append((lang, since, future.result()))
+                except Exception as e:
+                    logger.error(f"GitHub trending爬取失败({lang or 'all'}/{since}): {str(e)}")
+                    errors.append(e)
+        finally:
+            # 提前结束时不再启动剩余的页面，也不等待进行中的请求（正常结束时已全部完成）
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        # 所有页面都失败时视为数据源不可用
+        if errors and len(errors) == len(self.matrix):
+            raise errors[0]
+        yield from self._merge(pages)
+
+    def _fetch_page(self, lang: str, since: str, cancel_event: Optional[threading.Event] = None) -> list:
+        """采集单个趋势页面（内容未变化时直接复用缓存的解析结果），取消后不再发起请求"""
+        url = f"{self.base_url}/{quote(lang)}" if lang else self.base_url
+        return self.cache.get(
+            self.session,
+            url,
+            parser=self._parse_response,
+            params={'since': since},
+            headers=self.headers,
+            source='GitHub',
+            timeout=http_client.request_timeout(15, cancel_event)
         )
-        
-        return sorted_repos[:10]  # 返回Top10
+
+    def _parse_response(self, resp: requests.Response) -> list:
+        """解析HTTP响应（内容变化时才会调用）"""
+        # 打印未解析的完整HTML文本
+        # logger.info(f"未解析的完整HTML文本： {resp.text}")
+
+        return self.parse_engine(resp.content)
+
+    def _merge(self, pages: list) -> list:
+        """
+        跨页面合并去重，并用堆选出star增长速度最高的Top-K
+        参数:
+            pages: [(语言, 时间范围, 仓库列表), ...]
+        返回:
+            list: Top-K仓库，每项带有来源标签 trending_tags（如 "python/weekly"）
+        """
+        merged = {}
+        for lang, since, repos in pages:
+            days = RANGE_DAYS[since]
+            for repo in repos:
+                velocity = repo['period_stars'] / days
+                item = merged.get(repo['url'])
+                if item is None:
+                    item = merged[repo['url']] = Article(
+                        title=repo['title'],
+                        url=repo['url'],
+                        description=repo['description'],
+                        source=repo['source'],
+                        today_stars=0,
+                        stars_per_day=0.0,
+                        trending_tags=[]
+                    )
+                item.trending_tags.append(f"{lang or 'all'}/{since}")
+                item.stars_per_day = max(item.stars_per_day, velocity)
+                if since == 'daily':
+                    item.today_stars = max(item.today_stars, repo['period_stars'])
+
+        for item in merged.values():
+            item.trending_tags.sort()
+            # 只出现在周/月榜的仓库，用平均每日增长估算今日star数
+            if not item.today_stars:
+                item.today_stars = int(round(item.stars_per_day))
+
+        return heapq.nlargest(self.top_k, merged.values(), key=lambda x: x.stars_per_day)
 
 # 使用示例
 if __name__ == "__main__":
@@ -1,7 +1,16 @@
+import threading
 import requests
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
 from config.settings import settings
+from core.article import Article
+from utils import archive, http_client
+from utils.dates import parse_datetime
+from utils.http_cache import HTTPCache
 from utils.logger import get_logger
+from utils.state import JSONStateStore
+from utils.stream import iter_completed
 
 def validate_url(url: str) -> bool:
     """
@@ -16,55 +25,192 @@ def validate_url(url: str) -> bool:
 
 logger = get_logger(__name__)
 
+def parse_queries(spec: str) -> List[Dict]:
+    """
+    解析查询配置
+    参数:
+        spec: 分号分隔的查询，如 "category:technology;q:artificial intelligence"
+    返回:
+        List[Dict]: 每项包含 key（水位线键）、field（category/q）、value
+    """
+    queries = []
+    for part in spec.split(';'):
+        field, _, value = part.strip().partition(':')
+        field, value = field.strip(), value.strip()
+        if field not in ('category', 'q') or not value:
+            if part.strip():
+                logger.warning(f"忽略无效的NewsAPI查询配置: {part}")
+            continue
+        queries.append({'key': f"{field}:{value}", 'field': field, 'value': value})
+    return queries
+
+def parse_published_at(value: Optional[str]) -> Optional[datetime]:
+    """解析NewsAPI的 publishedAt（ISO 8601，UTC）"""
+    return parse_datetime(value, 'newsapi')
+
 class NewsAPICrawler:
-    """NewsAPI数据采集器"""
+    """NewsAPI数据采集器（按查询维护增量水位线并分页采集）"""
     
     BASE_URL = "https://newsapi.org/v2/top-headlines"
+    EVERYTHING_URL = "https://newsapi.org/v2/everything"
     
     def __init__(self):
+        config = settings.NEWSAPI_CONFIG
         self.api_key = settings.NEWS_API_KEY  # 使用 settings.NEWS_API_KEY
-        self.session = requests.Session()
-        # 配置请求重试策略
-        self.session.mount('https://', requests.adapters.HTTPAdapter(max_retries=3))
+        self.probe_url = "https://newsapi.org"  # 熔断探测地址
+        self.queries = parse_queries(config['queries'])
+        self.page_size = config['page_size']
+        self.max_pages = config['max_pages']
+        self.max_workers = config['max_workers']
+        self.watermarks = JSONStateStore(config['state_file'])
+        # 本次采集的候选水位线（查询键 -> ISO时间），数据入库后由调用方通过 commit_watermarks 保存
+        self.pending_watermarks: Dict[str, str] = {}
+        self.session = http_client.get_session('NewsAPI')
+        self.cache = HTTPCache()
+
+    def fetch(self) -> List[Article]:
+        """
+        并发执行所有查询，只获取水位线之后的新文章
+        返回:
+            List[Article]: 标准化格式的新闻列表（跨查询按URL去重）
+        """
+        return list(self.iter_fetch())
+
+    def iter_fetch(self, cancel_event: Optional[threading.Event] = None) -> Iterator[Article]:
+        """
+        并发执行所有查询，每个查询完成后立即逐条产出（跨查询按URL去重）
+        参数:
+            cancel_event: 取消信号，置位后取消未开始的查询并停止产出；
+                为 CancelToken 时每个分页请求的超时不超过截止时间
+        """
+        self.pending_watermarks = {}
+        if not self.queries:
+            return
+
+        seen = set()
+        errors = []
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.queries)),
+                                      thread_name_prefix='newsapi')
+        try:
+            futures = {executor.submit(self._fetch_query, query, cancel_event): query for query in self.queries}
+            for future in iter_completed(futures, cancel_event):
+                query = futures[future]
+                try:
+                    items, newest = future.result()
+                except Exception as e:
+                    logger.error(f"NewsAPI请求失败({query['key']}): {str(e)}")
+                    errors.append(e)
+                    continue
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                if newest is not None:
+                    self.pending_watermarks[query['key']] = newest.isoformat()
+                for item in items:
+                    if item['url'] not in seen:
+                        seen.add(item['url'])
+                        yield item
+        finally:
+            # 提前结束（取消或消费方停止）时不再启动剩余的请求，也不等待进行中的请求（正常结束时已全部完成）
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # 所有查询都失败时视为数据源不可用（取消导致的失败除外）
+        if len(errors) == len(self.queries) and not (cancel_event is not None and cancel_event.is_set()):
+            raise errors[0]
+
+    def take_watermarks(self) -> Dict[str, str]:
+        """
+        取出最近一次采集的候选水位线（取出后清空）
+        返回:
+            Dict[str, str]: 查询键 -> 水位线（ISO时间），数据入库后传给 commit_watermarks
+        """
+        watermarks, self.pending_watermarks = self.pending_watermarks, {}
+        return watermarks
+
+    def commit_watermarks(self, watermarks: Dict[str, str]):
+        """保存水位线（只在对应数据已入库后调用，否则超时、入库失败时这些文章会被永久跳过）"""
+        for key, value in watermarks.items():
+            self.watermarks.set(key, value)
 
-    def fetch(self) -> List[Dict]:
+    def _fetch_query(self, query: Dict, cancel_event: Optional[threading.Event] = None
+                     ) -> Tuple[List[Article], Optional[datetime]]:
         """
-        获取科技类头条新闻
+        分页采集单个查询，越过水位线后停止
+        参数:
+            query: parse_queries 生成的查询
+            cancel_event: 取消信号，取消后不再请求下一页
         返回:
-            List[Dict]: 标准化格式的新闻列表
+            Tuple[List[Article], Optional[datetime]]: (该查询的新文章, 候选水位线)，水位线未推进或回放模式下为 None
         """
+        # 回放模式下不使用也不推进水位线，保证每次回放结果一致
+        replay = archive.is_replay()
+        watermark = None if replay else parse_published_at(self.watermarks.get(query['key']))
+        newest = watermark
+        articles = []
+
+        for page in range(1, self.max_pages + 1):
+            try:
+                data = self.cache.get(
+                    self.session,
+                    self.BASE_URL if query['field'] == 'category' else self.EVERYTHING_URL,
+                    parser=lambda resp: resp.json(),
+                    params=self._build_params(query, page, watermark),
+                    source='NewsAPI',
+                    timeout=http_client.request_timeout(10, cancel_event),
+                    verify=True  # 强制SSL验证
+                )
+            except requests.HTTPError as e:
+                # 免费套餐有可翻页数量上限，超出后保留已获取的结果
+                if page > 1 and e.response is not None and e.response.status_code in (400, 426):
+                    logger.warning(f"NewsAPI分页已达上限({query['key']}，第{page}页)，停止翻页")
+                    break
+                raise
+
+            batch = data.get('articles', [])
+            crossed = False
+            for item in batch:
+                published = parse_published_at(item.get('publishedAt'))
+                if watermark and published and published <= watermark:
+                    crossed = True  # 已越过水位线，属于之前采集过的文章
+                    continue
+                articles.append(item)
+                if published and (newest is None or published > newest):
+                    newest = published
+
+            if crossed or len(batch) < self.page_size or page * self.page_size >= data.get('totalResults', 0):
+                break
+
+        logger.info(f"NewsAPI查询 {query['key']} 获取新文章 {len(articles)} 条，候选水位线：{newest}")
+        candidate = newest if newest and newest != watermark and not replay else None
+        return self._format_data(articles), candidate
+
+    def _build_params(self, query: Dict, page: int, watermark: Optional[datetime]) -> Dict:
+        """构建单页请求参数"""
         params = {
             'apiKey': self.api_key,
-            'category': 'technology',
-            'pageSize': 50  # 最大允许值
+            query['field']: query['value'],
+            'pageSize': self.page_size,
+            'page': page
         }
-        
-        try:
-            resp = self.session.get(
-                self.BASE_URL,
-                params=params,
-                timeout=10,
-                verify=True  # 强制SSL验证
-            )
-            resp.raise_for_status()
-            return self._format_data(resp.json()['articles'])
-        except Exception as e:
-            logger.error(f"NewsAPI请求失败: {str(e)}")
-            return []
-
-    def _format_data(self, raw_data: List[Dict]) -> List[Dict]:
+        if query['field'] == 'q':
+            # everything 接口支持服务端按时间过滤
+            params['sortBy'] = 'publishedAt'
+            if watermark:
+                params['from'] = watermark.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        return params
+
+    def _format_data(self, raw_data: List[Dict]) -> List[Article]:
         """标准化数据格式"""
         formatted = []
         for item in raw_data:
             if not validate_url(item.get('url', '')):
                 continue  # 跳过无效URL
             
-            formatted.append({
-                'title': item['title'],
-                'url': item['url'],
-                'description': item.get('description', ''),
-                'published_at': item['publishedAt'],
-                'source': 'NewsAPI',
-                'author': item.get('author')
-            })
+            formatted.append(Article(
+                title=item['title'],
+                url=item['url'],
+                description=item.get('description') or '',
+                published_at=item['publishedAt'],
+                source='NewsAPI',
+                author=item.get('author')
+            ))
         return formatted
\ No newline at end of file
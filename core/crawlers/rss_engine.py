@@ -0,0 +1,176 @@
+"""
+多订阅源RSS采集引擎
+从配置文件加载订阅源列表，通过共享连接池并发下载，并在进程池中解析
+"""
+
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from config.settings import settings
+from core.article import Article
+from core.crawlers.rss_parser import RSSParser, parse_feed_content
+from utils import http_client
+from utils.circuit_breaker import CircuitBreaker, http_probe
+from utils.logger import get_logger
+from utils.metrics import REQUEST_COUNTER
+from utils.state import JSONStateStore
+from utils.stream import iter_completed
+
+logger = get_logger(__name__)
+
+
+class FeedRegistry:
+    """订阅源注册表"""
+
+    def __init__(self, feeds: List[Dict]):
+        """
+        参数:
+            feeds: 订阅源列表，每项包含 name、url，可选 timeout、enabled
+        """
+        self.feeds = feeds
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> 'FeedRegistry':
+        """
+        从JSON配置文件加载订阅源
+        文件格式: [{"name": "TechCrunch", "url": "https://...", "timeout": 10}, ...]
+        """
+        path = Path(path or settings.RSS_CONFIG['feeds_file'])
+        feeds = []
+        if path.exists():
+            with open(path, encoding='utf-8') as f:
+                feeds = json.load(f)
+        else:
+            logger.warning(f"订阅源配置文件不存在：{path}")
+
+        # 兼容 .env 中单独配置的 TechCrunch 订阅源
+        techcrunch = settings.TECH_SOURCES.get("TechCrunch")
+        if techcrunch and all(feed.get('url') != techcrunch for feed in feeds):
+            feeds.append({'name': 'TechCrunch', 'url': techcrunch})
+
+        seen = set()
+        registry = []
+        for feed in feeds:
+            url = feed.get('url')
+            if not url or url in seen or not feed.get('enabled', True):
+                continue
+            seen.add(url)
+            registry.append({
+                'name': feed.get('name') or url,
+                'url': url,
+                'timeout': float(feed.get('timeout', settings.RSS_CONFIG['timeout']))
+            })
+        return cls(registry)
+
+    def __len__(self):
+        return len(self.feeds)
+
+    def __iter__(self):
+        return iter(self.feeds)
+
+
+class RSSFeedCrawler:
+    """多订阅源RSS采集器"""
+
+    def __init__(self, registry: Optional[FeedRegistry] = None):
+        config = settings.RSS_CONFIG
+        self.registry = registry or FeedRegistry.load()
+        self.fetch_workers = config['fetch_workers']
+        self.parse_workers = config['parse_workers']
+
+        # 所有订阅源共享一个会话，底层连接池由共享HTTP客户端管理
+        self.session = http_client.get_session('RSS')
+
+        self.parsers = [
+            RSSParser(feed['name'], feed_url=feed['url'], session=self.session, timeout=feed['timeout'])
+            for feed in self.registry
+        ]
+        # 每个订阅源独立熔断，失效的订阅源不再占用采集时间
+        breaker_store = JSONStateStore(settings.CIRCUIT_BREAKER_CONFIG['state_file'].with_name('rss_breakers.json'))
+        self.breakers = {
+            parser.source_name: CircuitBreaker(f"RSS:{parser.source_name}", breaker_store,
+                                               probe=http_probe(parser.feed_url))
+            for parser in self.parsers
+        }
+        self.probe_url = None  # 整体不做探测，由各订阅源的熔断器负责
+        self._parse_pool = None
+        self._pool_lock = threading.Lock()
+        logger.info(f"已加载 {len(self.parsers)} 个RSS订阅源")
+
+    def fetch(self) -> List[Article]:
+        """
+        并发下载并解析所有订阅源
+        返回:
+            List[Article]: 所有订阅源的标准化条目
+        """
+        return list(self.iter_fetch())
+
+    def iter_fetch(self, cancel_event: Optional[threading.Event] = None) -> Iterator[Article]:
+        """
+        并发下载并解析所有订阅源，每个订阅源完成后立即逐条产出
+        参数:
+            cancel_event: 取消信号，置位后取消未开始的订阅源并停止产出；
+                为 CancelToken 时每个订阅源请求的超时不超过截止时间
+        """
+        if not self.parsers:
+            return
+
+        content_parser = self._parse_in_pool if self.parse_workers > 1 else None
+        failures = 0
+        executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='rss')
+        try:
+            futures = {
+                executor.submit(self._fetch_feed, parser, content_parser, cancel_event): parser
+                for parser in self.parsers
+            }
+            for future in iter_completed(futures, cancel_event):
+                parser = futures[future]
+                breaker = self.breakers[parser.source_name]
+                try:
+                    entries = future.result()
+                    if entries is None:
+                        REQUEST_COUNTER.labels(source=parser.source_name, status='skipped').inc()
+                        continue
+                    breaker.record_success()
+                    REQUEST_COUNTER.labels(source=parser.source_name, status='success').inc()
+                except Exception as e:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return  # 截止时间导致的失败不计入该订阅源的熔断
+                    failures += 1
+                    breaker.record_failure(str(e))
+                    logger.error(f"RSS订阅源采集失败({parser.source_name}): {str(e)}")
+                    REQUEST_COUNTER.labels(source=parser.source_name, status='error').inc()
+                    continue
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield from entries
+        finally:
+            # 提前结束（取消或消费方停止）时不再启动剩余的请求，也不等待进行中的请求（正常结束时已全部完成）
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if failures and failures == len(self.parsers):
+            raise RuntimeError(f"全部 {failures} 个RSS订阅源采集失败")
+
+    def _fetch_feed(self, parser: RSSParser, content_parser,
+                    cancel_event: Optional[threading.Event] = None) -> Optional[List[Article]]:
+        """采集单个订阅源，熔断中返回None"""
+        if not self.breakers[parser.source_name].allow():
+            return None
+        return parser.fetch_and_parse(content_parser, cancel_event)
+
+    def _parse_in_pool(self, content: bytes, feed_url: str) -> List[Article]:
+        """将解析任务提交到进程池，下载线程阻塞等待结果"""
+        with self._pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._parse_pool.submit(parse_feed_content, content, feed_url).result()
+
+    def close(self):
+        """释放解析进程池（连接池由共享HTTP客户端统一管理）"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+        self.session = None
@@ -3,42 +3,89 @@
 支持多种RSS源的标准化解析
 """
 
+import threading
 import feedparser
-from typing import List, Dict
-from dateutil.parser import parse
-from utils.helpers import safe_parse_date
+import requests
+from typing import Callable, List, Optional
+from core.article import Article
+from utils.dates import parse_datetime
 from config.settings import settings
+from utils import http_client
+from utils.http_cache import HTTPCache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+def parse_feed_content(content: bytes, feed_url: str) -> List[Article]:
+    """
+    从已下载的原始内容解析RSS条目（可在进程池中执行）
+    参数:
+        content: RSS/Atom 原始字节
+        feed_url: 订阅源地址（用于提取来源域名）
+    返回:
+        List[Article]: 标准化格式的条目列表
+    """
+    feed = feedparser.parse(content)
+    source = feed_url.split('//')[1].split('/')[0]  # 提取域名
+    return [
+        _format_entry(entry, source)
+        for entry in feed.entries
+        if entry.get('title') and entry.get('link')  # 跳过不完整条目
+    ]
+
+def _format_entry(entry, source: str) -> Article:
+    """统一数据格式"""
+    return Article(
+        title=entry.title,
+        url=entry.link,
+        published_at=parse_datetime(entry.get('published'), source),
+        source=source,
+        description=entry.get('summary', '')
+    )
+
 class RSSParser:
     """RSS解析器"""
-    def __init__(self, source_name: str):
+    def __init__(self, source_name: str, feed_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None, timeout: float = 15):
         """
         初始化指定数据源的解析器
         参数:
             source_name: 配置中定义的数据源名称
+            feed_url: 订阅源地址，未提供时从配置中查找
+            session: 共享的请求会话，未提供时自行创建
+            timeout: 请求超时时间（秒）
         """
-        self.feed_url = settings.TECH_SOURCES.get(source_name)
+        self.source_name = source_name
+        self.feed_url = feed_url or settings.TECH_SOURCES.get(source_name)
         if not self.feed_url:
             raise ValueError(f"未配置的RSS源: {source_name}")
+        self.timeout = timeout
+        if session is None:
+            session = http_client.get_session('RSS')
+        self.session = session
+        self.cache = HTTPCache()
 
-    def parse(self) -> List[Dict]:
+    def parse(self) -> List[Article]:
         """解析并返回标准化数据"""
         try:
-            feed = feedparser.parse(self.feed_url)
-            return [self._format_entry(entry) for entry in feed.entries]
+            return self.fetch_and_parse()
         except Exception as e:
             logger.error(f"RSS解析失败({self.feed_url}): {str(e)}")
             return []
 
-    def _format_entry(self, entry) -> Dict:
-        """统一数据格式"""
-        return {
-            'title': entry.title,
-            'url': entry.link,
-            'published_at': safe_parse_date(entry.get('published')),
-            'source': self.feed_url.split('//')[1].split('/')[0],  # 提取域名
-            'description': entry.get('summary', '')
-        }
\ No newline at end of file
+    def fetch_and_parse(self, content_parser: Optional[Callable[[bytes, str], List[Article]]] = None,
+                        cancel_event: Optional[threading.Event] = None) -> List[Article]:
+        """
+        下载并解析订阅源，异常直接抛出
+        参数:
+            content_parser: 自定义内容解析函数（如提交到进程池），默认在当前线程解析
+            cancel_event: 取消信号，为 CancelToken 时请求超时不超过截止时间
+        """
+        content_parser = content_parser or parse_feed_content
+        return self.cache.get(
+            self.session,
+            self.feed_url,
+            parser=lambda resp: content_parser(resp.content, self.feed_url),
+            source='RSS',
+            timeout=http_client.request_timeout(self.timeout, cancel_event)
+        )
\ No newline at end of file
@@ -1,41 +1,410 @@
-from sqlalchemy import create_engine, text
+import time
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Union
+from sqlalchemy import create_engine, event, func, inspect, select, text, update
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from .models import Base, NewsArticle
+from core.article import ROW_FIELDS, Article
+from .near_dup import NearDuplicateIndex
+from .trending import TrendingTerm, TrendingTermsIndex
 from config.settings import settings
+from core.processors.analyzer import TechAnalyzer
 from core.processors.cleaner import DataCleaner
-from sqlalchemy.dialects.sqlite import insert
+from core.processors.dedup import article_fingerprint, to_hex
+from utils.bloom import ScalableBloomFilter
+from utils.logger import get_logger
+from utils.metrics import INGEST_COUNTER, SEEN_FILTER_BYTES, SEEN_FILTER_COUNTER, SEEN_FILTER_FPR, SEEN_FILTER_ITEMS
+from utils.stream import chunked
+from utils.url_canon import canonicalize, canonicalize_batch
+
+logger = get_logger(__name__)
+
+class IngestResult(NamedTuple):
+    """一次入库的结果"""
+    inserted: int  # 实际插入的条数
+    ignored: int  # URL或规范化URL已存在而忽略的条数
+    deduplicated: int  # 近似重复处理丢弃或合并到已有文章的条数
+    articles: List[Article]  # 实际插入的文章（不含已存在、近似重复丢弃或合并的项）
+
+
+def create_sqlite_engine(db_path: str) -> Engine:
+    """
+    创建SQLite引擎：每个新连接设置 WAL 日志、同步级别、页缓存等参数，连接由连接池复用
+    参数:
+        db_path: 数据库文件路径
+    """
+    config = settings.DATABASE_CONFIG
+    engine = create_engine(
+        f'sqlite:///{db_path}',  # 使用绝对路径
+        echo=False,
+        pool_size=config['pool_size']
+    )
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={config['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous={config['synchronous']}")
+        cursor.execute(f"PRAGMA cache_size=-{config['cache_size_mb'] * 1024}")
+        cursor.execute(f"PRAGMA busy_timeout={config['busy_timeout_ms']}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return engine
+
 
 class NewsDatabase:
     """数据库操作类"""
     
-    def __init__(self):
-        """初始化数据库连接"""
+    def __init__(self, analyzer: Optional[TechAnalyzer] = None):
+        """
+        初始化数据库连接
+        参数:
+            analyzer: 热门词索引使用的分析器（复用调用方已加载的词典和分词服务），默认在首次分词时创建
+        """
         # 确保路径正确
         db_path = str(settings.DATABASE_CONFIG["db_path"])
-        self.engine = create_engine(
-            f'sqlite:///{db_path}',  # 使用绝对路径
-            echo=False
-        )
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.engine = create_sqlite_engine(db_path)
         self.Session = sessionmaker(bind=self.engine)
+        self._prepare_insert()
         
         # 自动创建数据表（如果不存在）
         Base.metadata.create_all(self.engine)
+        self._migrate()
+        self._backfill_canonical_urls()
 
-    def save_batch(self, articles):
-        try:
-            # 确保数据已清洗
-            cleaned_articles = DataCleaner().normalize_data(articles)
-            # 使用 INSERT OR IGNORE 插入数据
+        # 近似重复索引：按当前分段方案准备索引并补充历史文章的指纹
+        self.near_dup = NearDuplicateIndex() if settings.DEDUP_CONFIG['enabled'] else None
+        if self.near_dup is not None:
+            session = self.Session()
+            try:
+                self.near_dup.load(session)
+            finally:
+                session.close()
+
+        # 热门词索引：读取保留期内的小时桶
+        self.trending = TrendingTermsIndex(analyzer) if settings.TRENDING_CONFIG['enabled'] else None
+        if self.trending is not None:
             session = self.Session()
-            stmt = insert(NewsArticle).values(cleaned_articles).on_conflict_do_nothing(index_elements=['url'])
-            session.execute(stmt)
+            try:
+                self.trending.load(session)
+            finally:
+                session.close()
+
+        # 已入库URL和内容指纹的布隆过滤器，采集后立即丢弃已入库的数据
+        self.seen = self._load_seen_filter() if settings.SEEN_FILTER_CONFIG['enabled'] else None
+        self._seen_dirty = False
+        self._seen_saved_at = time.monotonic()
+
+    def _migrate(self):
+        """为已存在的数据表补充模型中新增的列和索引（create_all 不会修改已有表）"""
+        table = NewsArticle.__table__
+        existing = {column['name'] for column in inspect(self.engine).get_columns(table.name)}
+        with self.engine.begin() as conn:
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+    def _backfill_canonical_urls(self, chunk_size: int = 5000) -> int:
+        """
+        为没有规范化URL的历史文章补充该列（按ID顺序，同一规范化URL只有最早的文章保留原值，
+        之后的重复文章写入带 #dup-<ID> 后缀的值以满足唯一索引；规范化URL不含片段，不会与其冲突）
+        返回:
+            int: 补充的文章数
+        """
+        session = self.Session()
+        total = 0
+        try:
+            while True:
+                rows = session.execute(
+                    select(NewsArticle.id, NewsArticle.url).where(NewsArticle.canonical_url.is_(None))
+                    .order_by(NewsArticle.id).limit(chunk_size)
+                ).all()
+                if not rows:
+                    break
+                canonical_urls = canonicalize_batch([url for _, url in rows])
+                taken = set(session.scalars(
+                    select(NewsArticle.canonical_url).where(NewsArticle.canonical_url.in_(set(canonical_urls)))
+                ))
+                updates = []
+                for (article_id, _), canonical_url in zip(rows, canonical_urls):
+                    if canonical_url in taken:
+                        canonical_url = f"{canonical_url}#dup-{article_id}"
+                    else:
+                        taken.add(canonical_url)
+                    updates.append({'id': article_id, 'canonical_url': canonical_url})
+                session.execute(update(NewsArticle), updates)
+                session.commit()
+                total += len(rows)
+        finally:
+            session.close()
+        if total:
+            logger.info(f"已为{total}条历史文章补充规范化URL")
+        return total
+
+    def _seen_keys(self, article: Union[Article, Dict], canonical_url: Optional[str] = None) -> List[str]:
+        """
+        布隆过滤器中一篇文章对应的键：规范化URL，以及近似重复为丢弃模式时的内容指纹（标题和摘要）
+        （合并、聚类模式需要让重复文章进入后续流程，不能按指纹预先丢弃）
+        参数:
+            article: 文章（Article 或爬虫产出的字典）
+            canonical_url: 已批量计算的规范化URL
+        """
+        canonical_url = canonical_url or article.get('canonical_url') or canonicalize(article['url'])
+        keys = [f"url:{canonical_url}"]
+        if self.near_dup is not None and self.near_dup.mode == 'drop':
+            content_hash = article.get('content_hash') or to_hex(article_fingerprint({
+                'title': DataCleaner.clean_html(article.get('title') or ''),
+                'description': DataCleaner.clean_html(article.get('description') or ''),
+                'source': article.get('source'),
+            }))
+            if int(content_hash, 16):
+                keys.append(f"hash:{content_hash}")
+        return keys
+
+    def _load_seen_filter(self) -> ScalableBloomFilter:
+        """
+        读取快照并补充快照之后入库的文章；快照不存在、参数变化或与数据库不一致时从数据库完整重建
+        """
+        config = settings.SEEN_FILTER_CONFIG
+        session = self.Session()
+        try:
+            total, max_id = session.execute(select(func.count(NewsArticle.id), func.max(NewsArticle.id))).one()
+            max_id = max_id or 0
+            bloom = ScalableBloomFilter.load(config['snapshot_path'])
+            signature = {'db_path': str(settings.DATABASE_CONFIG['db_path']), 'error_rate': config['error_rate'],
+                         'hash_keys': 'title+description' if self.near_dup is not None and self.near_dup.mode == 'drop'
+                         else False,
+                         'url_keys': 'canonical'}
+            if bloom is None or bloom.meta.get('signature') != signature or bloom.meta.get('max_id', 0) > max_id:
+                bloom = ScalableBloomFilter(max(config['initial_capacity'], total * 2), config['error_rate'])
+                bloom.meta = {'signature': signature, 'max_id': 0}
+
+            start_time = time.time()
+            added = 0
+            last_id = bloom.meta['max_id']
+            while True:
+                rows = session.execute(
+                    select(NewsArticle.id, NewsArticle.url, NewsArticle.canonical_url, NewsArticle.title,
+                           NewsArticle.description, NewsArticle.source, NewsArticle.content_hash)
+                    .where(NewsArticle.id > last_id).order_by(NewsArticle.id).limit(config['chunk_size'])
+                ).all()
+                if not rows:
+                    break
+                bloom.update(key for _, url, canonical_url, title, description, source, content_hash in rows
+                             for key in self._seen_keys(Article(title=title, url=url, canonical_url=canonical_url,
+                                                                description=description, source=source,
+                                                                content_hash=content_hash)))
+                last_id = rows[-1][0]
+                added += len(rows)
+            bloom.meta['max_id'] = last_id
+            if added:
+                logger.info(f"布隆过滤器已加入{added}条入库文章，耗时：{time.time() - start_time:.2f}秒")
+                bloom.save(config['snapshot_path'])
+        finally:
+            session.close()
+        self._report_seen_filter(bloom)
+        return bloom
+
+    @staticmethod
+    def _report_seen_filter(bloom: ScalableBloomFilter):
+        SEEN_FILTER_ITEMS.set(len(bloom))
+        SEEN_FILTER_BYTES.set(bloom.size_bytes)
+        SEEN_FILTER_FPR.set(bloom.false_positive_rate())
+
+    def filter_unseen(self, articles: List[Article]) -> List[Article]:
+        """
+        丢弃已入库的数据（URL或标题指纹已在布隆过滤器中），在分析之前调用
+        参数:
+            articles: 爬虫采集的原始数据
+        返回:
+            List[Dict]: 未入库的数据
+        """
+        if self.seen is None or not articles:
+            return articles
+        canonical_urls = canonicalize_batch([article.get('url') or '' for article in articles])
+        keys = [self._seen_keys(article, canonical_url) for article, canonical_url in zip(articles, canonical_urls)]
+        flat = [key for article_keys in keys for key in article_keys]
+        hits = iter(self.seen.contains_many(flat))
+        unseen = [article for article, article_keys in zip(articles, keys)
+                  if not any([next(hits) for _ in article_keys])]
+        SEEN_FILTER_COUNTER.labels(result='seen').inc(len(articles) - len(unseen))
+        SEEN_FILTER_COUNTER.labels(result='new').inc(len(unseen))
+        return unseen
+
+    def _mark_seen(self, articles: List[Article], max_id: int):
+        """入库后更新布隆过滤器，距上次保存快照超过间隔时保存快照（未保存的部分在下次启动时从数据库补充）"""
+        if self.seen is None or not articles:
+            return
+        self.seen.update(key for article in articles for key in self._seen_keys(article))
+        self.seen.meta['max_id'] = max_id
+        self._seen_dirty = True
+        if time.monotonic() - self._seen_saved_at >= settings.SEEN_FILTER_CONFIG['snapshot_interval']:
+            self.flush()
+        self._report_seen_filter(self.seen)
+
+    def flush(self):
+        """保存布隆过滤器快照（有未保存的更新时）"""
+        if self.seen is None or not self._seen_dirty:
+            return
+        self.seen.save(settings.SEEN_FILTER_CONFIG['snapshot_path'])
+        self._seen_dirty = False
+        self._seen_saved_at = time.monotonic()
+
+    def _prepare_insert(self):
+        """
+        预先生成批量插入语句和各列的类型转换（与 ORM 写入的存储格式一致，如时间列的字符串格式），
+        插入时直接交给驱动 executemany，不再逐批编译语句、逐行经过 ORM
+        """
+        table = NewsArticle.__table__
+        dialect = self.engine.dialect
+        columns = ', '.join(ROW_FIELDS)
+        placeholders = ', '.join('?' for _ in ROW_FIELDS)
+        self._insert_sql = f"INSERT OR IGNORE INTO {table.name} ({columns}) VALUES ({placeholders})"
+        self._row_values = attrgetter(*ROW_FIELDS)
+        self._bind_processors = [
+            (i, processor) for i, name in enumerate(ROW_FIELDS)
+            if (processor := table.c[name].type.dialect_impl(dialect).bind_processor(dialect)) is not None
+        ]
+        self.insert_chunk_size = max(1, settings.DATABASE_CONFIG['insert_chunk_size'])
+
+    def _process_row(self, row: tuple) -> tuple:
+        values = list(row)
+        for i, processor in self._bind_processors:
+            values[i] = processor(values[i])
+        return tuple(values)
+
+    def _insert_articles(self, session, articles: List[Article]) -> Set[str]:
+        """
+        分块 executemany 插入（INSERT OR IGNORE，URL或规范化URL已存在时忽略），所有分块在调用方的同一事务中；
+        executemany 逐行绑定参数，不受单条语句变量数上限的限制
+        参数:
+            session: 数据库会话
+            articles: 清洗后的文章
+        返回:
+            Set[str]: 实际插入的文章URL
+        """
+        connection = session.connection()
+        # 新行的ID总是大于插入前的最大ID，插入后按ID范围读取实际插入的URL
+        max_id = connection.scalar(select(func.max(NewsArticle.id))) or 0
+        inserted = 0
+        for chunk in chunked(articles, self.insert_chunk_size):
+            rows = [self._row_values(article) for article in chunk]
+            if self._bind_processors:
+                rows = [self._process_row(row) for row in rows]
+            inserted += connection.exec_driver_sql(self._insert_sql, rows).rowcount
+        if not inserted:
+            return set()
+        return set(connection.scalars(select(NewsArticle.url).where(NewsArticle.id > max_id)))
+
+    def save_batch(self, articles) -> IngestResult:
+        """
+        批量入库：清洗、近似重复处理、插入、更新分段索引和热门词索引在同一事务中完成
+        参数:
+            articles: 文章（已标准化的批次不再重复清洗）
+        返回:
+            IngestResult: 插入、忽略和近似重复处理的条数，以及实际插入的文章（邮件摘要只从中选取）
+        """
+        session = self.Session()
+        try:
+            # 确保数据已清洗（已标准化的批次直接使用）
+            normalized = cleaned_articles = DataCleaner().normalize_data(articles)
+            # 近似重复处理（与已存储文章及同批次文章比较）
+            plan = None
+            deduplicated = 0
+            if self.near_dup is not None:
+                resolved, plan = self.near_dup.resolve(session, cleaned_articles)
+                deduplicated = len(cleaned_articles) - len(resolved)
+                cleaned_articles = resolved
+            inserted_urls = self._insert_articles(session, cleaned_articles) if cleaned_articles else set()
+            if plan is not None:
+                self.near_dup.index_inserted(session, plan)
+                self.near_dup.prune(session)
+            inserted_articles = [article for article in cleaned_articles if article.url in inserted_urls]
+            term_counts = None
+            if self.trending is not None:
+                term_counts = self.trending.record(session, inserted_articles)
+                self.trending.prune(session)
+            max_id = session.scalar(select(func.max(NewsArticle.id))) if self.seen is not None else 0
             session.commit()
+            if term_counts is not None:
+                self.trending.apply(term_counts)
+            # 近似重复丢弃、合并的文章同样记为已处理，下次采集时在分析之前被过滤
+            self._mark_seen(normalized, max_id or 0)
         except Exception as e:
             session.rollback()
             raise e
         finally:
             session.close()
 
+        result = IngestResult(len(inserted_articles), len(cleaned_articles) - len(inserted_articles), deduplicated,
+                              inserted_articles)
+        INGEST_COUNTER.labels(result='inserted').inc(result.inserted)
+        INGEST_COUNTER.labels(result='ignored').inc(result.ignored)
+        INGEST_COUNTER.labels(result='deduplicated').inc(result.deduplicated)
+        return result
+
+    def find_by_url(self, url: str) -> Optional[Article]:
+        """
+        按URL查找已存储的文章（先规范化，再按规范化URL索引查询，跟踪参数、AMP版本等不影响结果）
+        参数:
+            url: 任意形式的文章URL
+        返回:
+            Optional[Article]: 文章，不存在时返回 None
+        """
+        canonical_url = canonicalize(url)
+        if not canonical_url:
+            return None
+        session = self.Session()
+        try:
+            article = session.scalars(
+                select(NewsArticle).where(NewsArticle.canonical_url == canonical_url)
+            ).first()
+            return None if article is None else Article.from_orm(article)
+        finally:
+            session.close()
+
+    def trending_terms(self, k: Optional[int] = None, hours: Optional[int] = None) -> List[TrendingTerm]:
+        """
+        近N小时突增的热门词（只查询热门词索引，不扫描文章表）
+        参数:
+            k: 返回的词数，默认使用配置
+            hours: 观察窗口小时数，默认使用配置
+        返回:
+            List[TrendingTerm]: 按突发分数从高到低排列，未启用热门词索引时为空
+        """
+        if self.trending is None:
+            return []
+        return self.trending.top_terms(k, hours)
+
+    def top_relevant(self, k: int = 10, hours: int = 24, source: Optional[str] = None) -> List[Article]:
+        """
+        近N小时发布的文章中相关度评分最高的K篇（按评分索引倒序读取）
+        参数:
+            k: 返回的文章数
+            hours: 发布时间范围（小时）
+            source: 只查询指定来源
+        返回:
+            List[Article]: 按评分从高到低排列
+        """
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+        stmt = select(NewsArticle).where(NewsArticle.relevance.is_not(None), NewsArticle.published_at >= cutoff)
+        if source is not None:
+            stmt = stmt.where(NewsArticle.source == source)
+        session = self.Session()
+        try:
+            rows = session.scalars(stmt.order_by(NewsArticle.relevance.desc()).limit(k))
+            return [Article.from_orm(row) for row in rows]
+        finally:
+            session.close()
+
     def query_recent(self, hours: int = 24) -> list:
         """查询最近N小时的新闻"""
         session = self.Session()
@@ -2,7 +2,7 @@
 数据库ORM模型定义
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy import Column, Integer, Float, String, DateTime, Text, Index, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -14,12 +14,16 @@ class NewsArticle(Base):
     id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False)
     url = Column(String(500), unique=True, nullable=False)  # URL唯一约束
+    canonical_url = Column(String(500), unique=True, index=True)  # 规范化URL唯一索引（跨来源去重和按URL查找）
     description = Column(Text)
+    content = Column(Text)  # 正文（正文抓取阶段提取）
     source = Column(String(100), index=True)  # 来源索引
     author = Column(String(100)) #作者
     today_stars = Column(Integer) #今日star数
     published_at = Column(DateTime(timezone=True), index=True)  # 时间索引
-    content_hash = Column(String(32), index=True)  # 内容哈希索引
+    content_hash = Column(String(32), index=True)  # 内容哈希索引（SimHash指纹，16位十六进制）
+    cluster_id = Column(Integer, index=True)  # 近似重复聚类ID（聚类中最早入库文章的ID）
+    relevance = Column(Float, index=True)  # 相关度评分（入库时计算，用于按评分选取Top-K）
     
     # 联合索引优化查询性能
     __table_args__ = (
@@ -27,4 +31,27 @@ class NewsArticle(Base):
     )
     
     def __repr__(self):
-        return f"<NewsArticle {self.title[:50]}...>"
\ No newline at end of file
+        return f"<NewsArticle {self.title[:50]}...>"
+
+
+class SimHashBand(Base):
+    """SimHash 指纹的分段索引（只保留近N天入库的文章）"""
+    __tablename__ = 'simhash_band_keys'  # 分段方案改变时更换表名，旧表在启动时删除并按新方案重建
+
+    id = Column(Integer, primary_key=True)
+    band_key = Column(Integer, nullable=False)  # 段号 << 段位数 | 段取值
+    article_id = Column(Integer, ForeignKey('tech_news.id'), nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)  # 入库时间，用于限定回看窗口和清理
+
+    __table_args__ = (
+        Index('idx_simhash_band_key_created', 'band_key', 'created_at'),
+    )
+
+
+class TermBucket(Base):
+    """热门词索引：每小时每个词出现的文章数（只保留基线期和观察窗口内的小时）"""
+    __tablename__ = 'term_buckets'
+
+    hour = Column(Integer, primary_key=True)  # UTC 小时序号（Unix时间戳 // 3600）
+    term = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False)
@@ -0,0 +1,328 @@
+"""
+近似重复索引模块
+文章入库时把 SimHash 指纹写入 content_hash 列，并把分段键写入 simhash_band_keys 表；
+新一批文章按分段键查找最近N天的候选，整批用 numpy 计算汉明距离后按配置丢弃、合并或标记聚类
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from core.article import Article
+from core.processors.dedup import (GUARANTEED_DISTANCE, article_fingerprint, band_keys, from_hex, hamming,
+                                   hamming_many, to_array, to_hex)
+from utils.logger import get_logger
+from utils.url_canon import canonicalize
+from .models import NewsArticle, SimHashBand
+
+logger = get_logger(__name__)
+
+MODES = ('drop', 'merge', 'cluster')
+# 合并模式下从重复文章补充到已有文章的字段（仅补充空值）
+MERGE_FIELDS = ('description', 'content', 'author')
+# 旧分段方案的索引表（16组随机16位分段，候选过多），启动时删除
+LEGACY_TABLES = ('simhash_bands',)
+
+
+class NearDuplicateIndex:
+    """基于 SimHash + LSH 分段的近似重复索引"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config or settings.DEDUP_CONFIG
+        if config['mode'] not in MODES:
+            raise ValueError(f"不支持的近似重复处理模式: {config['mode']}")
+        self.mode = config['mode']
+        self.max_distance = config['max_distance']
+        self.lookback_days = config['lookback_days']
+        self.chunk_size = config['chunk_size']
+        self.comparisons = 0  # 累计计算汉明距离的候选数（基准测试用）
+        if self.max_distance > GUARANTEED_DISTANCE:
+            logger.warning(f"近似重复最大汉明距离 {self.max_distance} 超过分段索引保证召回的距离 "
+                           f"{GUARANTEED_DISTANCE}，部分近似重复可能检测不到")
+
+    @staticmethod
+    def _now() -> datetime:
+        """当前UTC时间（不含时区，与数据库中时间列的存储约定一致）"""
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def _cutoff(self) -> datetime:
+        return self._now() - timedelta(days=self.lookback_days)
+
+    def _stored_candidates(self, session: Session, keys) -> Dict[int, List[Tuple[int, int, Optional[int]]]]:
+        """按分段键查询回看窗口内的已存储文章：分段键 -> [(文章ID, 指纹, 聚类ID)]"""
+        unique_keys = sorted({int(key) for key in keys.ravel()})
+        cutoff = self._cutoff()
+        candidates: Dict[int, List[Tuple[int, int, Optional[int]]]] = {}
+        for start in range(0, len(unique_keys), self.chunk_size):
+            stmt = (
+                select(SimHashBand.band_key, NewsArticle.id, NewsArticle.content_hash, NewsArticle.cluster_id)
+                .join(NewsArticle, NewsArticle.id == SimHashBand.article_id)
+                .where(SimHashBand.band_key.in_(unique_keys[start:start + self.chunk_size]))
+                .where(SimHashBand.created_at >= cutoff)
+            )
+            for band_key, article_id, content_hash, cluster_id in session.execute(stmt):
+                candidates.setdefault(band_key, []).append((article_id, from_hex(content_hash), cluster_id))
+        return candidates
+
+    def _nearest(self, fingerprint: int, candidates) -> Optional[Tuple]:
+        """在候选中找汉明距离最小且不超过阈值的一项（同批次候选，数量很少）"""
+        best, best_distance = None, self.max_distance + 1
+        for candidate in candidates:
+            distance = hamming(fingerprint, candidate[1])
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        return best
+
+    def _match_stored(self, fingerprints: List[int], keys: np.ndarray, stored) -> List[Optional[Tuple]]:
+        """
+        为每篇文章找汉明距离最小且不超过阈值的已存储文章（所有候选对一次性用 numpy 计算距离）
+        返回:
+            List[Optional[Tuple]]: 与 fingerprints 对应的 (文章ID, 指纹, 聚类ID)，没有时为 None
+        """
+        rows, candidates = [], []
+        for i, row_keys in enumerate(keys.tolist()):
+            seen = set()
+            for key in row_keys:
+                for candidate in stored.get(key, ()):
+                    if candidate[0] not in seen:
+                        seen.add(candidate[0])
+                        rows.append(i)
+                        candidates.append(candidate)
+        matches: List[Optional[Tuple]] = [None] * len(fingerprints)
+        if not candidates:
+            return matches
+        self.comparisons += len(candidates)
+        rows = np.array(rows, dtype=np.int64)
+        distances = hamming_many(to_array(fingerprints)[rows], to_array([candidate[1] for candidate in candidates]))
+        within = np.flatnonzero(distances <= self.max_distance)
+        # 按 (文章, 距离) 排序，每篇文章取第一项
+        for index in within[np.lexsort((distances[within], rows[within]))].tolist():
+            if matches[rows[index]] is None:
+                matches[rows[index]] = candidates[index]
+        return matches
+
+    def resolve(self, session: Session, articles: List[Article]) -> Tuple[List[Article], Dict]:
+        """
+        为文章计算指纹，并按配置处理与已存储文章或同批次文章近似重复的项
+        参数:
+            session: 数据库会话（合并、聚类模式会直接更新已有文章）
+            articles: 清洗后的文章
+        返回:
+            Tuple[List[Dict], Dict]: (需要插入的文章, 处理结果)
+            处理结果包含统计数、新文章URL集合 new_urls 和同批次聚类关系 cluster_links，插入后传给 index_inserted
+        """
+        plan = {'dropped': 0, 'merged': 0, 'clustered': 0, 'new_urls': set(), 'cluster_links': {}}
+        if not articles:
+            return articles, plan
+
+        canonical_urls = [article.canonical_url or canonicalize(article.url) for article in articles]
+        stored_urls = set()
+        for start in range(0, len(canonical_urls), self.chunk_size):
+            stored_urls.update(session.scalars(
+                select(NewsArticle.canonical_url)
+                .where(NewsArticle.canonical_url.in_(canonical_urls[start:start + self.chunk_size]))
+            ))
+
+        fingerprints = [article_fingerprint(article) for article in articles]
+        keys = band_keys(fingerprints)
+        stored_matches = self._match_stored(fingerprints, keys, self._stored_candidates(session, keys))
+        batch: Dict[int, List[Tuple[int, int]]] = {}  # 分段键 -> [(批内序号, 指纹)]
+        kept: List[Dict] = []
+        merge_updates: Dict[int, Dict] = {}
+
+        for i, (article, fingerprint, canonical_url) in enumerate(zip(articles, fingerprints, canonical_urls)):
+            article.content_hash = to_hex(fingerprint)
+            if canonical_url in stored_urls or not fingerprint:
+                # URL已入库（插入时会被忽略）、来源以URL为标识或文本为空，不参与近似重复判断
+                kept.append(article)
+                continue
+
+            row_keys = [int(key) for key in keys[i]]
+            match = stored_matches[i]
+            batch_match = None if match else self._nearest(
+                fingerprint, (c for key in row_keys for c in batch.get(key, ())))
+
+            if (match or batch_match) and self.mode == 'drop':
+                plan['dropped'] += 1
+                continue
+            if match and self.mode == 'merge':
+                fields = merge_updates.setdefault(match[0], {})
+                for field in MERGE_FIELDS:
+                    if getattr(article, field):
+                        fields.setdefault(field, getattr(article, field))
+                plan['merged'] += 1
+                continue
+            if batch_match and self.mode == 'merge':
+                target = articles[batch_match[0]]
+                for field in MERGE_FIELDS:
+                    if not getattr(target, field) and getattr(article, field):
+                        setattr(target, field, getattr(article, field))
+                plan['merged'] += 1
+                continue
+            if match:
+                # cluster：入库并沿用已有文章的聚类，已有文章没有聚类时以其ID作为聚类ID
+                article.cluster_id = match[2] or match[0]
+                if match[2] is None:
+                    session.execute(update(NewsArticle).where(NewsArticle.id == match[0])
+                                    .values(cluster_id=match[0]))
+                plan['clustered'] += 1
+            elif batch_match:
+                # 同批次文章的ID在插入后才确定
+                plan['cluster_links'][article.url] = articles[batch_match[0]].url
+                plan['clustered'] += 1
+
+            for key in row_keys:
+                batch.setdefault(key, []).append((i, fingerprint))
+            plan['new_urls'].add(article.url)
+            kept.append(article)
+
+        for article_id, fields in merge_updates.items():
+            self._merge_into(session, article_id, fields)
+        if plan['dropped'] or plan['merged'] or plan['clustered']:
+            logger.info(f"近似重复处理（{self.mode}）：丢弃{plan['dropped']}条，"
+                        f"合并{plan['merged']}条，聚类{plan['clustered']}条")
+        return kept, plan
+
+    @staticmethod
+    def _merge_into(session: Session, article_id: int, fields: Dict):
+        """只补充已有文章中为空的字段"""
+        existing = session.get(NewsArticle, article_id)
+        if existing is None:
+            return
+        for field, value in fields.items():
+            if not getattr(existing, field):
+                setattr(existing, field, value)
+
+    def index_inserted(self, session: Session, plan: Dict):
+        """
+        插入后为新文章写入分段索引，并确定同批次文章的聚类
+        参数:
+            session: 数据库会话
+            plan: resolve 返回的处理结果
+        """
+        urls = sorted(plan['new_urls'])
+        rows: Dict[str, Tuple[int, str, Optional[int]]] = {}
+        for start in range(0, len(urls), self.chunk_size):
+            stmt = select(NewsArticle.url, NewsArticle.id, NewsArticle.content_hash, NewsArticle.cluster_id) \
+                .where(NewsArticle.url.in_(urls[start:start + self.chunk_size]))
+            for url, article_id, content_hash, cluster_id in session.execute(stmt):
+                rows[url] = (article_id, content_hash, cluster_id)
+
+        inserted = [url for url in urls if url in rows]
+        fingerprints = [from_hex(rows[url][1]) for url in inserted]
+        # 分段索引行数是文章数的数倍：入库时间只转换一次，按驱动 executemany 直接写入
+        connection = session.connection()
+        created_at = SimHashBand.__table__.c.created_at.type.dialect_impl(connection.dialect) \
+            .bind_processor(connection.dialect)(self._now())
+        band_rows = [
+            (int(key), rows[url][0], created_at)
+            for url, keys in zip(inserted, band_keys(fingerprints)) for key in keys
+        ]
+        if band_rows:
+            connection.exec_driver_sql(
+                f"INSERT INTO {SimHashBand.__tablename__} (band_key, article_id, created_at) VALUES (?, ?, ?)",
+                band_rows)
+
+        for url, target_url in plan['cluster_links'].items():
+            if url not in rows or target_url not in rows:
+                continue
+            target_id, target_hash, target_cluster = rows[target_url]
+            cluster_id = target_cluster or target_id
+            if target_cluster is None:
+                session.execute(update(NewsArticle).where(NewsArticle.id == target_id).values(cluster_id=cluster_id))
+                rows[target_url] = (target_id, target_hash, cluster_id)
+            session.execute(update(NewsArticle).where(NewsArticle.id == rows[url][0]).values(cluster_id=cluster_id))
+
+    def prune(self, session: Session) -> int:
+        """删除回看窗口之外的分段索引，保持索引表大小与窗口内的文章数成正比"""
+        return session.execute(delete(SimHashBand).where(SimHashBand.created_at < self._cutoff())).rowcount
+
+    def load(self, session: Session):
+        """
+        启动时准备索引：删除旧分段方案的索引表，索引表为空时按新方案为回看窗口内的文章重建，再补充缺失的指纹
+        参数:
+            session: 数据库会话
+        """
+        existing = set(inspect(session.connection()).get_table_names())
+        for table in LEGACY_TABLES:
+            if table in existing:
+                session.execute(text(f"DROP TABLE {table}"))
+                session.commit()
+                logger.info(f"已删除旧的近似重复索引表 {table}")
+        if session.scalar(select(func.count()).select_from(SimHashBand)) == 0:
+            self.reindex(session)
+        self.backfill(session)
+
+    def reindex(self, session: Session) -> int:
+        """
+        按已保存的指纹为回看窗口内发布的文章写入分段索引（索引表为空时调用）
+        参数:
+            session: 数据库会话（完成后提交）
+        返回:
+            int: 写入索引的文章数
+        """
+        cutoff = self._cutoff()
+        total = 0
+        last_id = 0
+        while True:
+            rows = session.execute(
+                select(NewsArticle.id, NewsArticle.content_hash, NewsArticle.published_at)
+                .where(NewsArticle.published_at >= cutoff, NewsArticle.content_hash.is_not(None),
+                       NewsArticle.id > last_id)
+                .order_by(NewsArticle.id).limit(self.chunk_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            rows = [row for row in rows if from_hex(row[1])]
+            band_rows = [
+                {'band_key': int(key), 'article_id': row[0], 'created_at': row[2].replace(tzinfo=None)}
+                for row, keys in zip(rows, band_keys([from_hex(row[1]) for row in rows])) for key in keys
+            ]
+            if band_rows:
+                session.execute(SimHashBand.__table__.insert(), band_rows)
+            total += len(rows)
+        if total:
+            session.commit()
+            logger.info(f"已为近{self.lookback_days}天的{total}条文章重建近似重复索引")
+        return total
+
+    def backfill(self, session: Session) -> int:
+        """
+        为没有指纹的已存储文章补充指纹，回看窗口内的文章同时补充分段索引
+        返回:
+            int: 补充的文章数
+        """
+        cutoff = self._cutoff()
+        total = 0
+        while True:
+            rows = session.execute(
+                select(NewsArticle.id, NewsArticle.title, NewsArticle.description, NewsArticle.source,
+                       NewsArticle.published_at)
+                .where(NewsArticle.content_hash.is_(None))
+                .limit(self.chunk_size)
+            ).all()
+            if not rows:
+                break
+            fingerprints = [article_fingerprint({'title': title, 'description': description, 'source': source})
+                            for _, title, description, source, _ in rows]
+            session.execute(update(NewsArticle), [
+                {'id': row[0], 'content_hash': to_hex(fingerprint)} for row, fingerprint in zip(rows, fingerprints)
+            ])
+            band_rows = []
+            for row, fingerprint, keys in zip(rows, fingerprints, band_keys(fingerprints)):
+                published_at = row[4].replace(tzinfo=None) if row[4] else None
+                if fingerprint and published_at and published_at >= cutoff:
+                    band_rows.extend({'band_key': int(key), 'article_id': row[0], 'created_at': published_at}
+                                     for key in keys)
+            if band_rows:
+                session.execute(SimHashBand.__table__.insert(), band_rows)
+            session.commit()
+            total += len(rows)
+        if total:
+            logger.info(f"已为{total}条历史文章补充近似重复指纹")
+        return total
@@ -0,0 +1,282 @@
+"""
+热门词索引模块
+文章入库时按发布时间所在的小时累计标题分词（每篇文章每个词计一次），写入 term_buckets 表并同步到内存；
+查询近N小时相对基线期突增的词时只读取内存中的小时桶，不扫描文章表：
+- 内存中维护保留期（基线期 + 观察窗口）内各词的总数，小时桶过期时扣减，基线计数 = 总数 - 窗口计数
+- 默认观察窗口内各词的计数同样增量维护：入库时累加，小时滚动时扣减移出窗口的小时桶，查询时不再合并小时桶；
+  指定其他窗口长度时才按需合并窗口内的小时桶
+- 用堆取前K个，同一小时内数据未变化时直接返回缓存结果
+"""
+
+import heapq
+import math
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from core.article import Article
+from core.processors.analyzer import TechAnalyzer
+from utils.dates import to_utc
+from utils.logger import get_logger
+from utils.metrics import TRENDING_TERMS
+from .models import NewsArticle, TermBucket
+
+logger = get_logger(__name__)
+
+# 标题中常见但没有信息量的英文虚词（分析器自带的停用词之外）
+STOP_WORDS = frozenset((
+    'a', 'an', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'how', 'in', 'is', 'it', 'its', 'new',
+    'of', 'on', 'or', 'that', 'to', 'vs', 'was', 'what', 'when', 'why', 'will', 'with', 'you', 'your',
+))
+# 词的最大长度（与 term_buckets.term 列一致）
+MAX_TERM_LENGTH = 100
+
+
+class TrendingTerm(NamedTuple):
+    """一个突增的词"""
+    term: str
+    score: float  # 突发分数：(窗口计数 - 预期计数) / sqrt(预期计数 + 1)
+    count: int  # 窗口内出现该词的文章数
+    expected: float  # 按基线期频率推算的窗口内预期文章数
+
+
+def hour_of(value: datetime) -> int:
+    """UTC 小时序号（不含时区的时间视为UTC）"""
+    return int(to_utc(value).timestamp()) // 3600
+
+
+class TrendingTermsIndex:
+    """按小时分桶的词频索引"""
+
+    def __init__(self, analyzer: Optional[TechAnalyzer] = None, config: Optional[Dict] = None):
+        """
+        参数:
+            analyzer: 提供分词的技术内容分析器，默认在首次分词时创建
+            config: 热门词配置，默认使用 settings.TRENDING_CONFIG
+        """
+        config = config or settings.TRENDING_CONFIG
+        self.window_hours = config['window_hours']
+        self.retention_hours = config['window_hours'] + config['baseline_hours']
+        # 观察窗口至多为保留期减1小时，其余小时作为基线期
+        self.window_hours = max(1, min(self.window_hours, self.retention_hours - 1))
+        self.min_count = config['min_count']
+        self.top_k = config['top_k']
+        self.chunk_size = config['chunk_size']
+        self._analyzer = analyzer
+        self._buckets: Dict[int, Counter] = {}  # 小时 -> 词 -> 文章数
+        self._totals: Counter = Counter()  # 保留期内各词的文章数
+        self._window: Counter = Counter()  # 默认观察窗口内各词的文章数（小时桶 >= _window_start 之和）
+        self._window_start = self._current_hour() - self.window_hours + 1
+        self._version = 0  # 数据变化时递增，用于判断缓存是否有效
+        self._cache: Dict[Tuple[int, int, int], Tuple[int, List[TrendingTerm]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def analyzer(self) -> TechAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = TechAnalyzer()
+        return self._analyzer
+
+    def _current_hour(self) -> int:
+        return hour_of(datetime.now(timezone.utc))
+
+    def tokenize(self, titles: List[str]) -> List[set]:
+        """
+        按分析器的预处理结果分词（中文经分词服务切分）并转为小写，每个标题返回去重后的词集合
+        参数:
+            titles: 标题列表
+        """
+        analyzer = self.analyzer
+        stop_words = STOP_WORDS.union(*analyzer.stop_words.values())
+        return [
+            {token for token in doc.lower().split()
+             if 2 <= len(token) <= MAX_TERM_LENGTH and not token.isdigit() and token not in stop_words}
+            for doc in analyzer.preprocess_mixed(titles)
+        ]
+
+    def count_terms(self, articles: Iterable[Article]) -> Counter:
+        """
+        统计各小时桶的词频
+        参数:
+            articles: 已入库的文章（发布时间缺失或晚于当前时间时计入当前小时）
+        返回:
+            Counter: (小时, 词) -> 文章数，保留期之外的文章不计入
+        """
+        current = self._current_hour()
+        oldest = current - self.retention_hours + 1
+        titles, hours = [], []
+        for article in articles:
+            published_at = article.published_at
+            hour = min(hour_of(published_at), current) if isinstance(published_at, datetime) else current
+            if hour >= oldest and article.title:
+                titles.append(article.title)
+                hours.append(hour)
+        counts: Counter = Counter()
+        for hour, terms in zip(hours, self.tokenize(titles)):
+            counts.update((hour, term) for term in terms)
+        return counts
+
+    def record(self, session: Session, articles: List[Article]) -> Counter:
+        """
+        把新入库文章的词频累加到 term_buckets 表（与文章在同一事务中），提交后把返回值传给 apply
+        参数:
+            session: 数据库会话
+            articles: 实际插入的文章
+        返回:
+            Counter: (小时, 词) -> 文章数
+        """
+        counts = self.count_terms(articles)
+        if counts:
+            stmt = insert(TermBucket)
+            stmt = stmt.on_conflict_do_update(index_elements=['hour', 'term'],
+                                              set_={'count': TermBucket.count + stmt.excluded['count']})
+            session.execute(stmt, [{'hour': hour, 'term': term, 'count': count}
+                                   for (hour, term), count in counts.items()])
+        return counts
+
+    def prune(self, session: Session) -> int:
+        """删除保留期之外的小时桶"""
+        oldest = self._current_hour() - self.retention_hours + 1
+        return session.execute(delete(TermBucket).where(TermBucket.hour < oldest)).rowcount
+
+    def apply(self, counts: Counter):
+        """把已提交的词频同步到内存"""
+        if not counts:
+            return
+        with self._lock:
+            oldest = self._current_hour() - self.retention_hours + 1
+            for (hour, term), count in counts.items():
+                if hour >= oldest:
+                    self._buckets.setdefault(hour, Counter())[term] += count
+                    self._totals[term] += count
+                    if hour >= self._window_start:
+                        self._window[term] += count
+            self._version += 1
+            self._expire()
+
+    def _expire(self):
+        """
+        小时滚动时把移出观察窗口的小时桶从窗口计数中扣减，
+        并移除保留期之外的小时桶、从总数中扣减（调用方持有锁）
+        """
+        current = self._current_hour()
+        start = current - self.window_hours + 1
+        if start > self._window_start:
+            for hour, bucket in self._buckets.items():
+                if self._window_start <= hour < start:
+                    self._window.subtract(bucket)
+            self._window = +self._window
+            self._window_start = start
+            self._version += 1
+
+        oldest = current - self.retention_hours + 1
+        expired = [hour for hour in self._buckets if hour < oldest]
+        for hour in expired:
+            self._totals.subtract(self._buckets.pop(hour))
+        if expired:
+            self._totals = +self._totals  # 去掉计数为0的词
+            self._version += 1
+        TRENDING_TERMS.set(len(self._totals))
+
+    def load(self, session: Session) -> int:
+        """
+        从 term_buckets 表读取保留期内的小时桶；表为空时从文章表回填保留期内发布的文章（只在首次启用时发生）
+        参数:
+            session: 数据库会话
+        返回:
+            int: 读取的小时桶记录数
+        """
+        oldest = self._current_hour() - self.retention_hours + 1
+        if session.scalar(select(func.count()).select_from(TermBucket)) == 0:
+            self.backfill(session)
+        rows = session.execute(select(TermBucket.hour, TermBucket.term, TermBucket.count)
+                               .where(TermBucket.hour >= oldest)).all()
+        with self._lock:
+            self._buckets.clear()
+            self._totals.clear()
+            self._window.clear()
+            self._window_start = self._current_hour() - self.window_hours + 1
+            for hour, term, count in rows:
+                self._buckets.setdefault(hour, Counter())[term] = count
+                self._totals[term] += count
+                if hour >= self._window_start:
+                    self._window[term] += count
+            self._version += 1
+            self._expire()
+        return len(rows)
+
+    def backfill(self, session: Session) -> int:
+        """
+        按文章表中保留期内发布的文章生成小时桶
+        参数:
+            session: 数据库会话（回填完成后提交）
+        返回:
+            int: 统计的文章数
+        """
+        cutoff = datetime.fromtimestamp((self._current_hour() - self.retention_hours + 1) * 3600, timezone.utc)
+        total = 0
+        last_id = 0
+        while True:
+            rows = session.execute(
+                select(NewsArticle.id, NewsArticle.title, NewsArticle.published_at)
+                .where(NewsArticle.published_at >= cutoff.replace(tzinfo=None), NewsArticle.id > last_id)
+                .order_by(NewsArticle.id).limit(self.chunk_size)
+            ).all()
+            if not rows:
+                break
+            self.record(session, [Article(title=title, published_at=published_at) for _, title, published_at in rows])
+            last_id = rows[-1][0]
+            total += len(rows)
+        if total:
+            session.commit()
+            logger.info(f"热门词索引已回填{total}篇近{self.retention_hours}小时发布的文章")
+        return total
+
+    def top_terms(self, k: Optional[int] = None, hours: Optional[int] = None) -> List[TrendingTerm]:
+        """
+        近N小时相对基线期突增的前K个词
+        默认窗口直接使用增量维护的窗口计数，其他窗口长度合并窗口内的小时桶；
+        基线计数由保留期总数减去窗口计数得到，与文章总量无关
+        参数:
+            k: 返回的词数，默认使用配置
+            hours: 观察窗口小时数，默认使用配置（至多为保留期减1小时，其余小时作为基线期）
+        返回:
+            List[TrendingTerm]: 按突发分数从高到低排列
+        """
+        k = k or self.top_k
+        hours = max(1, min(hours or self.window_hours, self.retention_hours - 1))
+        with self._lock:
+            self._expire()
+            current = self._current_hour()
+            key = (current, hours, k)
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == self._version:
+                return cached[1]
+
+            if hours == self.window_hours:
+                recent = self._window
+            else:
+                recent = Counter()
+                for hour in range(current - hours + 1, current + 1):
+                    bucket = self._buckets.get(hour)
+                    if bucket:
+                        recent.update(bucket)
+            ratio = hours / (self.retention_hours - hours)
+            candidates = []
+            for term, count in recent.items():
+                if count < self.min_count:
+                    continue
+                expected = (self._totals[term] - count) * ratio
+                candidates.append(TrendingTerm(term, (count - expected) / math.sqrt(expected + 1), count, expected))
+            result = heapq.nlargest(k, candidates, key=lambda item: (item.score, item.count, item.term))
+
+            if len(self._cache) >= 64:
+                self._cache.clear()
+            self._cache[key] = (self._version, result)
+            return result
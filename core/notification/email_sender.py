@@ -16,6 +16,7 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from dotenv import load_dotenv
+from core.processors.ranking import digest_category, top_k_by_category
 from utils.logger import get_logger
 import smtplib
 import ssl
@@ -85,17 +86,16 @@ class EmailSender:
         """渲染邮件 HTML 内容"""
         template_news = Template(self.TEMPLATE_NEWS)
         template_github = Template(self.TEMPLATE_GITHUB)
-        # 过滤出不同类型的新闻
-        normal_news = [item for item in news if item.get("source") == "NewsAPI"]
-        github_news = [item for item in news if item.get("source") == "GitHub"]
+        # 按类型（GitHub 仓库 / 其他来源的新闻，见 digest_category）分别选出相关度评分最高的新闻（最多 10 条）
+        ranked = top_k_by_category(news, 10, category=digest_category)
         # 渲染 GitHub 新闻
         github_content = template_github.render(
-            news=github_news[:10],  # 最多发送 10 条
+            news=ranked.get('github', []),
             date=datetime.now().strftime("%Y-%m-%d")
         )
         # 渲染普通新闻
         news_content = template_news.render(
-            news=normal_news[:10],  # 最多发送 10 条
+            news=ranked.get('news', []),
             date=datetime.now().strftime("%Y-%m-%d")
         )
         # 合并内容
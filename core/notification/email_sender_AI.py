@@ -6,16 +6,11 @@
 import os
 import smtplib
 import base64
-import requests
 import json
-import certifi
-import smtplib
 import ssl
-from json import JSONDecodeError
-from urllib3.util.ssl_ import create_urllib3_context
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, time
+from typing import List, Dict, Optional, Union
 from jinja2 import Template, Environment
 from jinja2.loaders import FileSystemLoader
 from jinja2.exceptions import TemplateNotFound 
@@ -26,11 +21,12 @@ from googleapiclient.discovery import build
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
+from core.article import Article
+from core.processors.ranking import top_k_by_category
+from utils.dates import parse_datetime
+from utils.http_client import get_session
 from utils.logger import get_logger
 
-from google import genai
-from zhipuai import ZhipuAI
-
 # 加载环境变量
 load_dotenv()
 
@@ -39,6 +35,11 @@ logger = get_logger(__name__)
 
 class EmailSenderAI:
     """邮件发送器"""
+
+    GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+    ZHIPU_URL = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
+    AI_TIMEOUT = 120  # 大模型生成耗时较长，单独设置超时（秒）
+
     def __init__(self):
         """初始化邮件发送器"""
         self.email_type = os.getenv('EMAIL_TYPE', 'gmail').lower()
@@ -47,6 +48,8 @@ class EmailSenderAI:
         self.zhipu_api_key = os.getenv('ZHIPU_API_KEY')
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
         self.ai_mode = os.getenv('AI_MODE')
+        # AI接口调用复用共享HTTP客户端的连接池（响应取决于请求内容，不归档、不回放）
+        self.session = get_session('AI', archived=False)
 
         if self.email_type == 'gmail':
             self._init_gmail()
@@ -73,12 +76,13 @@ class EmailSenderAI:
 
         logger.info(f"使用模板路径：{template_path}")
         
-        # 创建基础环境
+        # 创建基础环境（Article 未填写的字段为 None，渲染为空字符串而不是 "None"）
         env = Environment(
             loader=FileSystemLoader(template_path),
             autoescape=True,
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            finalize=lambda value: '' if value is None else value
         )
         
         # 添加自定义过滤器
@@ -86,37 +90,23 @@ class EmailSenderAI:
         
         return env
 
-    def _format_datetime(self, value: Optional[str]) -> str:
-        """安全的时间格式化过滤器"""
+    def _format_datetime(self, value: Union[str, datetime, None]) -> str:
+        """安全的时间格式化过滤器（UTC时间，零点视为仅日期）"""
         # 添加空值处理
-        if not value or not isinstance(value, str):
+        if not value or not isinstance(value, (str, datetime)):
             return "时间未提供"
-        
-        # 支持更多日期格式
-        formats = [
-            "%Y-%m-%dT%H:%M:%SZ",  # ISO8601
-            "%Y-%m-%d %H:%M:%S",   # 普通格式
-            "%Y-%m-%d",            # 仅日期
-            "%b %d, %Y",           # Mar 22, 2025
-            "%d/%m/%Y"             # 22/03/2025
-        ]
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(value, fmt)
-                return dt.strftime("%m/%d %H:%M") if any(c in fmt for c in ['H','M','S']) else dt.strftime("%m/%d")
-            except ValueError:
-                continue
-        
-        # 回退方案：截取有效部分
-        try:
-            return value[:16]  # 截取前16个字符（2025-03-22T00:57）
-        except:
-            return value
+
+        dt = parse_datetime(value)
+        if dt is not None:
+            return dt.strftime("%m/%d") if dt.time() == time.min else dt.strftime("%m/%d %H:%M")
+
+        # 回退方案：截取有效部分（2025-03-22T00:57）
+        return value[:16]
 
     def _generate_ai_content(self, news: List[Dict]) -> Dict:
-        if not self.zhipu_api_key:
-            logger.warning("未配置智谱API密钥")
+        api_key = self.gemini_api_key if self.ai_mode == "gemini" else self.zhipu_api_key
+        if not api_key:
+            logger.warning(f"未配置{'Gemini' if self.ai_mode == 'gemini' else '智谱'}API密钥")
             return {"title": "技术摘要", "overview": ""}
 
         try:
@@ -143,43 +133,63 @@ class EmailSenderAI:
             }}
 
             请根据以下新闻数据生成内容：
-            {json.dumps(news[:15], ensure_ascii=False, indent=2)}"""
+            {json.dumps(self._prompt_items(news[:15]), ensure_ascii=False, indent=2, default=str)}"""
 
             if self.ai_mode == "gemini":
                 # gemini 2
-                client = genai.Client(api_key=self.gemini_api_key)
-                response = client.models.generate_content(
-                    model="gemini-2.0-flash", contents=prompt)
-                return self._parse_gemini_response(response)
+                resp = self.session.post(
+                    self.GEMINI_URL,
+                    headers={'x-goog-api-key': self.gemini_api_key},
+                    json={"contents": [{"parts": [{"text": prompt}]}]},
+                    timeout=self.AI_TIMEOUT
+                )
+                resp.raise_for_status()
+                return self._parse_gemini_response(resp.json())
             else:
                 # 智谱AI    
-                client = ZhipuAI(api_key=self.zhipu_api_key)
-                response = client.chat.completions.create(
-                    model="glm-4-flash",  # 使用官方支持的模型名称
-                    messages=[
-                        {
-                            "role": "user",  # 必需字段
-                            "content": prompt  # 必需字段
-                        }
-                    ],
-                    temperature=0.3
+                resp = self.session.post(
+                    self.ZHIPU_URL,
+                    headers={'Authorization': f"Bearer {self.zhipu_api_key}"},
+                    json={
+                        "model": "glm-4-flash",  # 使用官方支持的模型名称
+                        "messages": [
+                            {
+                                "role": "user",  # 必需字段
+                                "content": prompt  # 必需字段
+                            }
+                        ],
+                        "temperature": 0.3
+                    },
+                    timeout=self.AI_TIMEOUT
                 )
-                return self._parse_zhipu_response(response)
+                resp.raise_for_status()
+                return self._parse_ai_response(resp.json())
         except Exception as e:
             logger.error(f"AI内容生成失败: {str(e)}")
             return {"title": "技术摘要", "overview": ""}
 
-    def _parse_gemini_response(self, response) -> Dict:
-        """解析Gemini响应"""
+    @staticmethod
+    def _prompt_items(news: List[Article]) -> List[Dict]:
+        """生成提示词用的新闻数据，正文只保留开头部分以控制token数量"""
+        items = []
+        for item in news:
+            item = Article.coerce(item).to_dict()
+            if item.get('content'):
+                item['content'] = item['content'][:500]
+            items.append(item)
+        return items
+
+    def _parse_gemini_response(self, response: Dict) -> Dict:
+        """解析Gemini响应（generateContent 接口返回的JSON）"""
         try:
             # 验证候选内容存在性
-            if not response.candidates:
+            if not response.get("candidates"):
                 logger.error("Gemini未返回有效候选内容")
                 return {"title": "无候选内容", "overview": ""}
 
             # 提取首个候选的文本内容
-            candidate = response.candidates[0]
-            parts = [part.text for part in candidate.content.parts]
+            candidate = response["candidates"][0]
+            parts = [part.get("text", "") for part in candidate["content"]["parts"]]
             raw_content = "".join(parts).strip()
 
             # 记录原始响应（调试用）
@@ -211,7 +221,7 @@ class EmailSenderAI:
         """通用文本解析"""
         try:
             return json.loads(raw)
-        except JSONDecodeError:
+        except json.JSONDecodeError:
             # 智能提取JSON内容
             start = raw.find('{')
             end = raw.rfind('}')
@@ -224,10 +234,10 @@ class EmailSenderAI:
                     "translations": {}
                 }
 
-    def _parse_ai_response(self, response) -> Dict:
-        """增强版JSON解析"""
+    def _parse_ai_response(self, response: Dict) -> Dict:
+        """增强版JSON解析（智谱 chat/completions 接口返回的JSON）"""
         try:
-            raw_content = response.choices[0].message.content
+            raw_content = response["choices"][0]["message"]["content"]
             
             # 记录原始响应（调试用）
             logger.debug(f"原始响应内容：{raw_content[:5000]}...")  # 截断长内容
@@ -307,7 +317,7 @@ class EmailSenderAI:
                 token.write(creds.to_json())
         return creds
 
-    def _build_email(self, news: List[Dict]) -> MIMEMultipart:
+    def _build_email(self, news: List[Article]) -> MIMEMultipart:
         """构建邮件内容（根据实际需求完善）"""
         try:
             template = self.template_env.get_template("email_template.html")
@@ -315,19 +325,18 @@ class EmailSenderAI:
             logger.error(f"模板文件不存在：{str(e)}")
             logger.error(f"当前搜索路径：{self.template_env.loader.searchpath}")
             raise
-        # 分类处理新闻数据
-        github_news = [n for n in news if n.get("source") == "GitHub"]
-        normal_news = [n for n in news if n.get("source") != "GitHub"]
+        # 按分类选出相关度评分最高的新闻
+        ranked = top_k_by_category((Article.coerce(n) for n in news), {'github': 5, 'news': 10})
+        github_news = ranked.get('github', [])
+        normal_news = ranked.get('news', [])
 
         # 获取AI生成内容
-        news_send = github_news[:5] + normal_news[:10]
-        ai_data = self._generate_ai_content(news_send)
+        ai_data = self._generate_ai_content(github_news + normal_news)
         
-        # 合并翻译数据
+        # 合并翻译数据（生成带翻译的副本，不修改传入的数据）
         translations = ai_data.get("translations", {})
-        for item in news:
-            if item["title"] in translations:
-                item.update(translations[item["title"]])
+        github_news = [n.with_translation(translations[n.title]) if n.title in translations else n for n in github_news]
+        normal_news = [n.with_translation(translations[n.title]) if n.title in translations else n for n in normal_news]
 
         # 渲染模板
         template = self.template_env.get_template("email_template.html")
@@ -335,8 +344,8 @@ class EmailSenderAI:
             date=datetime.now().strftime("%Y-%m-%d"),
             ai_title=ai_data["title"],
             ai_overview=ai_data["overview"],
-            github_news=github_news[:5],
-            normal_news=normal_news[:10]
+            github_news=github_news,
+            normal_news=normal_news
         )
 
         msg = MIMEMultipart('alternative')
@@ -347,7 +356,7 @@ class EmailSenderAI:
         return msg
 
 
-    def send_digest(self, news: List[Dict]):
+    def send_digest(self, news: List[Article]):
         try:
             msg = self._build_email(news)
             # 发送邮件
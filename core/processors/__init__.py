@@ -2,7 +2,12 @@
 数据处理模块入口
 """
 
-from .cleaner import DataCleaner  # noqa: F401
+from .cleaner import DataCleaner, NormalizedBatch  # noqa: F401
 from .analyzer import TechAnalyzer  # noqa: F401
+from .keywords import KeywordDictionary, KeywordMatch, get_dictionaries  # noqa: F401
+from .segmenter import SegmentationService, get_segmenter  # noqa: F401
+from .ranking import CategoryTopK, RelevanceScorer, digest_category, top_k_by_category  # noqa: F401
 
-__all__ = ['DataCleaner', 'TechAnalyzer']
\ No newline at end of file
+__all__ = ['DataCleaner', 'NormalizedBatch', 'TechAnalyzer', 'KeywordDictionary', 'KeywordMatch',
+           'get_dictionaries', 'SegmentationService', 'get_segmenter', 'CategoryTopK', 'RelevanceScorer',
+           'digest_category', 'top_k_by_category']
\ No newline at end of file
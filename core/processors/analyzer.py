@@ -2,24 +2,107 @@
 技术内容分析模块
 实现基于NLP的技术相关性判断
 """
-from sklearn.feature_extraction.text import TfidfVectorizer
-import jieba # 中文分词库
+from typing import Dict, List, Optional, Sequence
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+import numpy as np
 import re
 
+from .keywords import KeywordDictionary, KeywordMatch, get_dictionaries
+from .segmenter import SegmentationService, get_segmenter
+from .classifier import TechClassifier
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 与 sklearn 默认一致的分词规则（至少两个字符）
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+SINGLE_TOKEN = re.compile(r"\w\w+")
+SPECIAL_CHARS = re.compile(r'[^\w\s]')
+# 含中文字符时按中文处理
+CHINESE_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+
+
+def detect_lang(text: str) -> str:
+    """简易语言判断：含中文字符为 zh，否则为 en"""
+    return 'zh' if CHINESE_PATTERN.search(text or '') else 'en'
+
+# 技术特征词占比阈值
+TECH_RATIO_THRESHOLD = 0.15
+
 class TechAnalyzer:
     """技术内容分析器"""
-    def __init__(self):
-        """初始化技术关键词库和停用词"""
-        # 多语言技术关键词库
-        self.tech_keywords = {
-            'en': ['AI', 'Blockchain', 'Cybersecurity', '5G', 'IoT'],
-            'zh': ['人工智能', '元宇宙', '芯片']
-        }
+    def __init__(self, keywords: Optional[Dict[str, KeywordDictionary]] = None,
+                 segmenter: Optional[SegmentationService] = None,
+                 classifier: Optional[TechClassifier] = None):
+        """
+        初始化技术关键词库和停用词
+        参数:
+            keywords: 语言 -> 关键词词典，默认使用进程内共享的词典
+            segmenter: 中文分词服务，默认使用进程内共享的服务
+            classifier: 技术内容分类模型，默认按配置加载，为空时使用关键词规则
+        """
+        self.segmenter = segmenter or get_segmenter()
+        self.classifier = classifier if classifier is not None else self._load_classifier()
+        # 多语言技术关键词库（从 config/keywords/<lang>.txt 编译）
+        self.keywords = keywords if keywords is not None else get_dictionaries()
+        self.tech_keywords = {lang: sorted(d.terms) for lang, d in self.keywords.items()}
         # 简易停用词表（实际项目建议使用外部文件）
         self.stop_words = {
             'en': {'the', 'and', 'this'},
             'zh': {'的', '是', '在'}
         }
+        self._build_vectorizers()
+
+    @staticmethod
+    def _load_classifier() -> Optional[TechClassifier]:
+        """按配置加载分类模型，加载失败时退回关键词规则"""
+        config = settings.CLASSIFIER_CONFIG
+        if not config['enabled']:
+            return None
+        if not config['model_path'].exists():
+            logger.warning(f"分类模型文件不存在，使用关键词规则：{config['model_path']}")
+            return None
+        try:
+            return TechClassifier.load(config['model_path'])
+        except Exception as e:
+            logger.error(f"分类模型加载失败，使用关键词规则：{str(e)}")
+            return None
+
+    def _build_vectorizers(self):
+        """
+        按语言一次性构建向量器，批量判断时不再逐条拟合
+        - keyword_vectorizer: 固定为词典中的单词术语，统计文档中出现的技术特征词
+        - token_vectorizer: 无状态的哈希向量器，统计文档去停用词后的特征词总数
+        """
+        self.keyword_vectorizers = {}
+        self.token_vectorizers = {}
+        for lang, dictionary in self.keywords.items():
+            # 分词后只会产生单个词的特征，多词术语由关键词匹配覆盖
+            vocabulary = sorted(s for s in dictionary.surfaces if SINGLE_TOKEN.fullmatch(s))
+            self.keyword_vectorizers[lang] = CountVectorizer(
+                vocabulary=vocabulary,
+                token_pattern=TOKEN_PATTERN,
+                binary=True
+            ).fit([]) if vocabulary else None
+            self.token_vectorizers[lang] = HashingVectorizer(
+                token_pattern=TOKEN_PATTERN,
+                stop_words=list(self.stop_words.get(lang, ())) or None,
+                binary=True,
+                norm=None,
+                alternate_sign=False,
+                n_features=2 ** 20
+            )
+
+    def match_keywords(self, text: str, lang: str = 'en') -> List[KeywordMatch]:
+        """
+        返回文本命中的全部技术术语及分类
+        参数:
+            text: 原始文本
+            lang: 语言类型
+        """
+        dictionary = self.keywords.get(lang)
+        return dictionary.find_all(text) if dictionary else []
 
     def preprocess_text(self, text, lang='en'):
         """
@@ -30,12 +113,39 @@ class TechAnalyzer:
         返回:
             str: 清洗后的文本
         """
+        return self.preprocess_batch([text], lang)[0]
+
+    def preprocess_batch(self, texts: Sequence[str], lang: str = 'en') -> List[str]:
+        """
+        批量文本预处理，中文整批交给分词服务（带缓存，可并行）
+        参数:
+            texts: 原始文本列表
+            lang: 语言类型('en'/'zh')
+        返回:
+            List[str]: 清洗后的文本
+        """
         # 移除特殊字符（保留字母数字和空格）
-        text = re.sub(r'[^\w\s]', '', text)
+        texts = [SPECIAL_CHARS.sub('', text) for text in texts]
         # 中文分词
         if lang == 'zh':
-            return ' '.join(jieba.cut(text)) # 生成分词结果
-        return text.lower() # 英文转为小写
+            return self.segmenter.segment_batch(texts)
+        return [text.lower() for text in texts] # 英文转为小写
+
+    def preprocess_mixed(self, texts: Sequence[str]) -> List[str]:
+        """
+        预处理语言混杂的文本：逐条判断语言后按语言分组批量处理
+        参数:
+            texts: 原始文本列表
+        返回:
+            List[str]: 与输入一一对应的预处理结果
+        """
+        docs: List[Optional[str]] = [None] * len(texts)
+        langs = [detect_lang(text) for text in texts]
+        for lang in set(langs):
+            idx = [i for i, text_lang in enumerate(langs) if text_lang == lang]
+            for i, doc in zip(idx, self.preprocess_batch([texts[i] for i in idx], lang)):
+                docs[i] = doc
+        return docs
 
     def is_tech_related(self, text, lang='en'):
         """
@@ -46,22 +156,59 @@ class TechAnalyzer:
         返回:
             bool: 是否属于技术内容
         """
-        processed = self.preprocess_text(text, lang)
-        tokens = processed.split()
-        
-        # 规则1：关键词直接匹配
-        keyword_match = any(kw.lower() in processed for kw in self.tech_keywords[lang])
-        
-        # 规则2：TF-IDF特征分析
-        try:
-            # 初始化TF-IDF向量器（自动过滤停用词）
-            tfidf = TfidfVectorizer(stop_words=list(self.stop_words[lang]))
-            tfidf.fit([processed])  # 拟合单文档
-            # 获取特征词列表
-            features = tfidf.get_feature_names_out()
-            # 筛选技术相关特征词
-            tech_features = [f for f in features if f in self.tech_keywords[lang]]
-            # 判断技术特征词占比是否超过阈值
-            return keyword_match or (len(tech_features)/len(features) > 0.15) 
-        except ValueError:  # 处理空文本异常
-            return False
\ No newline at end of file
+        return bool(self.is_tech_related_batch([text], [lang])[0])
+
+    def is_tech_related_batch(self, texts: Sequence[str], langs: Sequence[str]) -> np.ndarray:
+        """
+        批量判断文本是否与技术相关
+        每种语言的文本一次性向量化为稀疏矩阵，特征词占比用NumPy向量化计算
+        参数:
+            texts: 待分析文本列表
+            langs: 与 texts 一一对应的语言类型
+        返回:
+            np.ndarray: 布尔数组，True 表示属于技术内容
+        """
+        result = np.zeros(len(texts), dtype=bool)
+        langs = np.asarray(langs)
+        if self.classifier is not None:
+            for lang in np.unique(langs):
+                idx = np.flatnonzero(langs == lang)
+                result[idx] = self.classifier.predict(self.preprocess_batch([texts[i] for i in idx], lang))
+            return result
+
+        for lang in self.keywords:
+            idx = np.flatnonzero(langs == lang)
+            if not len(idx):
+                continue
+            dictionary = self.keywords[lang]
+            processed = self.preprocess_batch([texts[i] for i in idx], lang)
+
+            # 规则1：关键词直接匹配（在原文上单次扫描全部术语）
+            keyword_match = np.fromiter((dictionary.contains(texts[i]) for i in idx),
+                                        dtype=bool, count=len(idx))
+
+            # 规则2：技术特征词占比
+            keyword_vectorizer = self.keyword_vectorizers[lang]
+            tech_counts = (keyword_vectorizer.transform(processed).getnnz(axis=1)
+                           if keyword_vectorizer is not None else np.zeros(len(idx), dtype=int))
+            total_counts = self.token_vectorizers[lang].transform(processed).getnnz(axis=1)
+            ratio = tech_counts / np.maximum(total_counts, 1)
+
+            # 去停用词后没有任何特征词的文本视为非技术内容
+            result[idx] = (total_counts > 0) & (keyword_match | (ratio > TECH_RATIO_THRESHOLD))
+        return result
+
+    def learn(self, texts: Sequence[str], labels: Sequence[int], save: bool = True):
+        """
+        用反馈数据增量更新分类模型
+        参数:
+            texts: 原始文本
+            labels: 标签（1=技术内容，0=非技术内容）
+            save: 是否写回模型文件
+        """
+        if self.classifier is None:
+            self.classifier = TechClassifier()
+        docs = self.preprocess_mixed(texts)
+        self.classifier.partial_fit(docs, labels)
+        if save:
+            self.classifier.save()
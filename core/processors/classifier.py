@@ -0,0 +1,235 @@
+"""
+技术内容分类模型模块
+HashingVectorizer + 线性模型（SGD逻辑回归）：特征哈希不保存词表，模型文件只有一组权重，启动加载为毫秒级；
+整批文本一次转换为稀疏矩阵预测，支持用反馈数据 partial_fit 增量更新而无需重新训练
+
+用法:
+    # 用数据库中已入库的新闻作为正样本，加上标注的负样本离线训练
+    python -m core.processors.classifier train --negatives data/labels/negatives.jsonl
+    # 用反馈数据增量更新（每行 {"title": ..., "description": ..., "label": 0/1}）
+    python -m core.processors.classifier update --feedback data/labels/feedback.jsonl
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 模型文件格式版本，特征参数变化时需要重新训练
+MODEL_VERSION = 1
+CLASSES = np.array([0, 1])
+
+
+def build_vectorizer(n_features: int) -> HashingVectorizer:
+    """构建无状态的特征哈希向量器（输入为预处理后的文本）"""
+    return HashingVectorizer(
+        n_features=n_features,
+        ngram_range=(1, 2),
+        token_pattern=r"(?u)\b\w\w+\b",
+        alternate_sign=False,
+        norm='l2'
+    )
+
+
+class TechClassifier:
+    """可持久化、可增量更新的技术内容分类器"""
+
+    def __init__(self, n_features: Optional[int] = None, model: Optional[SGDClassifier] = None,
+                 meta: Optional[Dict] = None):
+        """
+        参数:
+            n_features: 特征哈希维度
+            model: 已训练的线性模型，为空时创建未训练的模型
+            meta: 训练信息（样本数、训练时间等）
+        """
+        self.n_features = n_features or settings.CLASSIFIER_CONFIG['n_features']
+        self.vectorizer = build_vectorizer(self.n_features)
+        self.model = model or SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+        self.meta = meta or {'samples': 0, 'trained_at': None}
+
+    @property
+    def is_trained(self) -> bool:
+        return hasattr(self.model, 'coef_')
+
+    def fit(self, docs: Sequence[str], labels: Sequence[int], epochs: int = 5):
+        """
+        从头训练
+        参数:
+            docs: 预处理后的文本
+            labels: 标签（1=技术内容，0=非技术内容）
+            epochs: 训练轮数
+        """
+        X = self.vectorizer.transform(docs)
+        y = np.asarray(labels)
+        self.model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+        rng = np.random.default_rng(42)
+        for _ in range(epochs):
+            order = rng.permutation(len(y))
+            self.model.partial_fit(X[order], y[order], classes=CLASSES)
+        self.meta = {'samples': len(y), 'trained_at': time.time()}
+        return self
+
+    def partial_fit(self, docs: Sequence[str], labels: Sequence[int]):
+        """
+        用新的标注数据增量更新模型
+        参数:
+            docs: 预处理后的文本
+            labels: 标签
+        """
+        self.model.partial_fit(self.vectorizer.transform(docs), np.asarray(labels), classes=CLASSES)
+        self.meta['samples'] += len(labels)
+        self.meta['trained_at'] = time.time()
+        return self
+
+    def predict_proba(self, docs: Sequence[str]) -> np.ndarray:
+        """
+        批量预测为技术内容的概率
+        参数:
+            docs: 预处理后的文本
+        返回:
+            np.ndarray: 概率数组
+        """
+        if not len(docs):
+            return np.zeros(0)
+        return self.model.predict_proba(self.vectorizer.transform(docs))[:, 1]
+
+    def predict(self, docs: Sequence[str], threshold: Optional[float] = None) -> np.ndarray:
+        """批量预测是否为技术内容"""
+        threshold = settings.CLASSIFIER_CONFIG['threshold'] if threshold is None else threshold
+        return self.predict_proba(docs) >= threshold
+
+    def save(self, path: Optional[Path] = None):
+        """原子写入模型文件"""
+        path = Path(path or settings.CLASSIFIER_CONFIG['model_path'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+        joblib.dump({
+            'version': MODEL_VERSION,
+            'n_features': self.n_features,
+            'model': self.model,
+            'meta': self.meta
+        }, tmp_path)
+        os.replace(tmp_path, path)
+        logger.info(f"分类模型已保存：{path}（累计样本{self.meta['samples']}条）")
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> 'TechClassifier':
+        """
+        加载模型文件
+        参数:
+            path: 模型路径，默认使用配置中的路径
+        """
+        path = Path(path or settings.CLASSIFIER_CONFIG['model_path'])
+        start_time = time.perf_counter()
+        state = joblib.load(path)
+        if state.get('version') != MODEL_VERSION:
+            raise ValueError(f"模型文件版本不兼容（{state.get('version')}），请重新训练: {path}")
+        classifier = cls(state['n_features'], state['model'], state['meta'])
+        logger.info(f"分类模型加载完成，耗时：{(time.perf_counter() - start_time) * 1000:.1f}毫秒")
+        return classifier
+
+
+def read_labeled(path: Path, default_label: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    读取JSONL标注文件，每行包含 title/description（或 text）和 label
+    参数:
+        path: 标注文件路径
+        default_label: 行内没有 label 时使用的标签
+    返回:
+        List[Tuple[str, int]]: (文本, 标签) 列表
+    """
+    samples = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            text = row.get('text') or f"{row.get('title', '')} {row.get('description') or ''}"
+            samples.append((text, int(row.get('label', default_label))))
+    return samples
+
+
+def read_stored_articles(limit: Optional[int] = None) -> List[Tuple[str, int]]:
+    """读取已入库的新闻作为正样本"""
+    from core.database import NewsDatabase
+    from core.database.models import NewsArticle
+
+    db = NewsDatabase()
+    session = db.Session()
+    try:
+        query = session.query(NewsArticle.title, NewsArticle.description).order_by(NewsArticle.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return [(f"{title} {description or ''}", 1) for title, description in query]
+    finally:
+        session.close()
+
+
+def split_holdout(samples: List[Tuple[str, int]], ratio: float, seed: int = 42):
+    """随机划分训练集和验证集"""
+    order = np.random.default_rng(seed).permutation(len(samples))
+    cut = int(len(samples) * (1 - ratio))
+    return [samples[i] for i in order[:cut]], [samples[i] for i in order[cut:]]
+
+
+def _preprocess(samples: Iterable[Tuple[str, int]]) -> Tuple[List[str], List[int]]:
+    """按分析器的规则预处理（中文分词、英文小写）"""
+    from core.processors.analyzer import TechAnalyzer
+
+    samples = list(samples)
+    docs = TechAnalyzer().preprocess_mixed([text for text, _ in samples])
+    return docs, [label for _, label in samples]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='技术内容分类模型训练')
+    sub = parser.add_subparsers(dest='command', required=True)
+    train = sub.add_parser('train', help='从数据库正样本和标注负样本离线训练')
+    train.add_argument('--negatives', required=True, type=Path, help='负样本JSONL文件（label 缺省为0）')
+    train.add_argument('--extra', type=Path, help='额外的标注JSONL文件（需包含 label）')
+    train.add_argument('--limit', type=int, help='最多读取的入库新闻条数')
+    train.add_argument('--holdout', type=float, default=0.2, help='验证集比例')
+    update = sub.add_parser('update', help='用反馈数据增量更新已有模型')
+    update.add_argument('--feedback', required=True, type=Path, help='反馈JSONL文件（需包含 label）')
+    for command in (train, update):
+        command.add_argument('--model', type=Path, help='模型文件路径（默认使用配置）')
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        samples = read_stored_articles(args.limit) + read_labeled(args.negatives, default_label=0)
+        if args.extra:
+            samples += read_labeled(args.extra)
+        train_set, test_set = split_holdout(samples, args.holdout)
+        docs, labels = _preprocess(train_set)
+        classifier = TechClassifier().fit(docs, labels)
+        if test_set:
+            test_docs, test_labels = _preprocess(test_set)
+            accuracy = float(np.mean(classifier.predict(test_docs) == np.asarray(test_labels)))
+            print(f"训练样本：{len(train_set)}条，验证样本：{len(test_set)}条，验证准确率：{accuracy:.3f}")
+        # 验证后用全部样本更新一轮
+        if test_set:
+            classifier.partial_fit(test_docs, test_labels)
+        classifier.save(args.model)
+    else:
+        classifier = TechClassifier.load(args.model)
+        docs, labels = _preprocess(read_labeled(args.feedback))
+        classifier.partial_fit(docs, labels).save(args.model)
+        print(f"增量更新完成：{len(labels)}条反馈")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,9 +6,19 @@
 import html
 import re
 from hashlib import md5
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime
-from dateutil.parser import parse  # 用于解析多种日期格式
+
+from core.article import Article
+from utils.dates import parse_datetime, parse_datetime_batch
+from utils.url_canon import canonicalize, canonicalize_batch
+
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+
+class NormalizedBatch(list):
+    """已标准化、去重的 Article 批次（normalize_data 遇到该类型直接返回，不重复清洗）"""
+
 
 class DataCleaner:
     """数据清洗器，提供数据清洗、去重和格式化功能"""
@@ -24,61 +34,83 @@ class DataCleaner:
         """
         if not raw_html:
             return ''
-        # 移除HTML标签
-        clean = re.sub(r'<[^>]+>', '', raw_html)
-        # 转义特殊字符
-        return html.unescape(clean).strip()
+        # 不含标签和实体的文本（包括已清洗过的文本）只需去掉首尾空白
+        if '<' in raw_html:
+            # 移除HTML标签
+            raw_html = _HTML_TAG.sub('', raw_html)
+        if '&' in raw_html:
+            # 转义特殊字符
+            raw_html = html.unescape(raw_html)
+        return raw_html.strip()
+
+    @staticmethod
+    def clean_html_batch(values: List[Optional[str]]) -> List[str]:
+        """
+        批量清除HTML（与 clean_html 结果相同，整列处理省去逐条的函数调用）
+        参数:
+            values: 一列原始文本
+        返回:
+            List[str]: 与输入一一对应的纯文本
+        """
+        strip_tags = _HTML_TAG.sub
+        unescape = html.unescape
+        result = []
+        append = result.append
+        for value in values:
+            if not value:
+                append('')
+                continue
+            if '<' in value:
+                value = strip_tags('', value)
+            if '&' in value:
+                value = unescape(value)
+            append(value.strip())
+        return result
 
     @staticmethod
-    def parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
+    def parse_datetime(dt_str: Union[str, datetime, None], source: Optional[str] = None) -> Optional[datetime]:
         """
-        将字符串时间转换为 datetime 对象
-        支持多种日期格式（ISO 8601、RFC 3339等）
+        将字符串时间转换为带时区的UTC datetime 对象
+        支持多种日期格式（ISO 8601、RFC 822等），同一来源的格式只识别一次
         参数:
             dt_str: 日期字符串
+            source: 数据来源
         返回:
             Optional[datetime]: 转换后的 datetime 对象，如果失败则返回 None
         """
-        if not dt_str:
-            return None
-        try:
-            # 处理 ISO 8601 格式的时间字符串（如 '2025-03-19T02:51:00Z'）
-            return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-        except ValueError:
-            try:
-                # 使用 dateutil 解析其他格式的日期
-                return parse(dt_str)
-            except (ValueError, AttributeError):
-                return None  # 如果转换失败，返回 None
+        return parse_datetime(dt_str, source)
 
     @staticmethod
-    def clean_article(article: Dict) -> Dict:
+    def clean_article(article: Union[Article, Dict]) -> Optional[Article]:
         """
         清洗单条新闻数据
         参数:
-            article: 原始新闻数据（字典格式）
+            article: 原始新闻数据（Article 或字典）
         返回:
-            Dict: 清洗后的新闻数据
+            Optional[Article]: 清洗后的新闻数据，输入为空时返回 None
         """
         if not article:
-            return {}
-        
-        # 清洗字段
-        cleaned = {
-            'title': DataCleaner.clean_html(article.get('title', '')),
-            'url': article.get('url', ''),
-            'description': DataCleaner.clean_html(article.get('description', '')),
-            'source': article.get('source', 'Unknown'),
-            'author': article.get('author', 'Anonymous'),
-            'today_stars':article.get('today_stars', ''),
-            'published_at': DataCleaner.parse_datetime(article.get('published_at'))
-        }
-        return cleaned
+            return None
+
+        source = article.get('source', 'Unknown')
+        return Article(
+            title=DataCleaner.clean_html(article.get('title', '')),
+            url=article.get('url', ''),
+            description=DataCleaner.clean_html(article.get('description', '')),
+            content=article.get('content'),
+            source=source,
+            author=article.get('author', 'Anonymous'),
+            today_stars=article.get('today_stars'),
+            published_at=DataCleaner.parse_datetime(article.get('published_at'), source),
+            canonical_url=canonicalize(article.get('url', '')) or None,
+            stars_per_day=article.get('stars_per_day'),
+            trending_tags=article.get('trending_tags'),
+        )
 
     @staticmethod
     def deduplicate(items: List[Dict]) -> List[Dict]:
         """
-        基于内容哈希去重
+        基于规范化URL去重（同一文章带跟踪参数、AMP版本等不同URL时只保留第一条）
         参数:
             items: 原始数据列表
         返回:
@@ -90,28 +122,63 @@ class DataCleaner:
         seen = set()
         unique = []
         for item in items:
-            # 生成内容指纹（基于标题和URL）
-            fingerprint = md5(
-                (item.get('title', '') + item.get('url', '')).encode('utf-8')
-            ).hexdigest()
-            if fingerprint not in seen:
-                seen.add(fingerprint)
+            key = item.get('canonical_url') or canonicalize(item.get('url', ''))
+            if not key:
+                # 没有URL时退回到标题指纹
+                key = md5(item.get('title', '').encode('utf-8')).hexdigest()
+            if key not in seen:
+                seen.add(key)
                 unique.append(item)
         return unique
 
     @staticmethod
-    def normalize_data(items: List[Dict]) -> List[Dict]:
+    def normalize_data(items: List[Union[Article, Dict]]) -> NormalizedBatch:
         """
-        标准化数据
+        标准化数据（按列批量处理：先按规范化URL去重，只清洗保留下来的数据）
         参数:
-            items: 原始数据列表
+            items: 原始数据列表（Article 或字典），已是 NormalizedBatch 时直接返回
         返回:
-            List[Dict]: 标准化后的数据
+            NormalizedBatch: 标准化、去重后的 Article 列表
         """
+        if isinstance(items, NormalizedBatch):
+            return items
         if not items:
-            return []
-        
-        # 清洗每条数据
-        cleaned = [DataCleaner.clean_article(item) for item in items]
-        # 去重
-        return DataCleaner.deduplicate(cleaned)
\ No newline at end of file
+            return NormalizedBatch()
+
+        # 规范化URL并去重（结果与 clean_article + deduplicate 一致）
+        canonical_urls = canonicalize_batch([item.get('url', '') for item in items])
+        seen = set()
+        rows, keys = [], []
+        for item, canonical_url in zip(items, canonical_urls):
+            if not item:
+                continue
+            # 没有URL时退回到标题指纹
+            key = canonical_url or md5(DataCleaner.clean_html(item.get('title', '')).encode('utf-8')).hexdigest()
+            if key not in seen:
+                seen.add(key)
+                rows.append(item)
+                keys.append(canonical_url or None)
+
+        # 按列清洗
+        titles = DataCleaner.clean_html_batch([item.get('title', '') for item in rows])
+        descriptions = DataCleaner.clean_html_batch([item.get('description', '') for item in rows])
+        sources = [item.get('source', 'Unknown') for item in rows]
+        dates = parse_datetime_batch([item.get('published_at') for item in rows], sources)
+
+        return NormalizedBatch(
+            Article(
+                title=title,
+                url=item.get('url', ''),
+                description=description,
+                content=item.get('content'),
+                source=source,
+                author=item.get('author', 'Anonymous'),
+                today_stars=item.get('today_stars'),
+                published_at=published_at,
+                canonical_url=canonical_url,
+                stars_per_day=item.get('stars_per_day'),
+                trending_tags=item.get('trending_tags'),
+            )
+            for item, title, description, source, published_at, canonical_url
+            in zip(rows, titles, descriptions, sources, dates, keys)
+        )
\ No newline at end of file
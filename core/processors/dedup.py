@@ -0,0 +1,144 @@
+"""
+近似重复检测模块
+基于字符 n-gram 的 64 位 SimHash 指纹：同一新闻被不同来源转载、文字略有改动时指纹只相差少数比特，
+无关文本的指纹平均相差 32 比特。
+分段索引（置换表方案）：指纹按位平均分成 6 块，任取 3 块拼成一个约 32 位的分段键，共 C(6,3)=20 个分段。
+汉明距离不超过 3 的两个指纹至多有 3 块不同，必然至少共享一个分段键，候选查找不会遗漏；
+无关指纹共享分段键的概率约为 20 / 2^32，即使文本相关导致指纹分布不均匀，每篇新文章的候选也只有少数几个，
+查找耗时与已存储文章数无关。汉明距离超过 3 时不保证召回（距离 4 约 70%）
+"""
+
+import re
+from itertools import combinations
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+# 字符 n-gram 长度（对中英文都适用，不依赖分词）
+NGRAM = 3
+FINGERPRINT_BITS = 64
+BLOCKS = 6
+MATCH_BLOCKS = 3
+# 保证召回的最大汉明距离（至多这么多块不同时，其余块组成的分段键必然相同）
+GUARANTEED_DISTANCE = BLOCKS - MATCH_BLOCKS
+# 以URL作为唯一标识的来源（如 GitHub 仓库），不参与近似重复判断
+EXEMPT_SOURCES = frozenset(('GitHub',))
+# 各块的位宽和起始位（64 = 11 + 11 + 11 + 11 + 10 + 10）
+_BLOCK_WIDTHS = [FINGERPRINT_BITS // BLOCKS + (1 if i < FINGERPRINT_BITS % BLOCKS else 0) for i in range(BLOCKS)]
+_BLOCK_STARTS = [sum(_BLOCK_WIDTHS[:i]) for i in range(BLOCKS)]
+# 每个分段使用的块（分段方案改变后需要重建索引）
+_BAND_BLOCKS = list(combinations(range(BLOCKS), MATCH_BLOCKS))
+BANDS = len(_BAND_BLOCKS)
+# 分段取值的最大位宽，段号放在其上方
+BAND_BITS = max(sum(_BLOCK_WIDTHS[block] for block in blocks) for blocks in _BAND_BLOCKS)
+
+_NORMALIZE = re.compile(r'[\W_]+')
+_PRIME = np.uint64(1099511628211)  # FNV 乘数，用于组合 n-gram 内的字符
+# 逐字节的置位数（numpy 没有 bitwise_count 时使用）
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 混淆，把 n-gram 编码均匀散列到 64 位（uint64 运算按模 2^64 溢出）"""
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def simhash(text: str) -> int:
+    """
+    计算文本的 64 位 SimHash 指纹（跨进程、跨运行稳定）
+    参数:
+        text: 原始文本
+    返回:
+        int: 指纹，空文本为 0
+    """
+    normalized = _NORMALIZE.sub(' ', (text or '').lower()).strip()
+    if not normalized:
+        return 0
+    codes = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < NGRAM:
+        grams = codes[:1].copy()
+        for code in codes[1:]:
+            grams = grams * _PRIME + code
+    else:
+        grams = codes[:len(codes) - NGRAM + 1].copy()
+        for offset in range(1, NGRAM):
+            grams = grams * _PRIME + codes[offset:len(codes) - NGRAM + 1 + offset]
+    hashes = _mix(grams)
+    # 每一位上取多数票（按小端字节序展开为比特矩阵）
+    ones = np.unpackbits(hashes.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little').sum(axis=0)
+    bits = (ones * 2 > len(hashes)).astype(np.uint8)
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+def article_fingerprint(article: Dict) -> int:
+    """
+    按标题和摘要计算文章指纹（只有标题时，措辞相近的不同新闻也会落在阈值之内）
+    参数:
+        article: 清洗后的文章（Article 或字典）
+    返回:
+        int: 指纹，EXEMPT_SOURCES 中的来源和空文本为 0（不参与近似重复判断）
+    """
+    if article.get('source') in EXEMPT_SOURCES:
+        return 0
+    return simhash(f"{article.get('title') or ''} {article.get('description') or ''}")
+
+
+def to_hex(fingerprint: int) -> str:
+    """指纹转为定长十六进制（保存到 content_hash 列）"""
+    return f"{fingerprint:016x}"
+
+
+def from_hex(value: str) -> int:
+    return int(value, 16)
+
+
+def hamming(a: int, b: int) -> int:
+    """两个指纹的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+def to_array(fingerprints: Sequence[int]) -> np.ndarray:
+    """指纹列表转为 uint64 数组"""
+    return np.array(fingerprints, dtype=np.uint64).reshape(-1)
+
+
+def hamming_many(a: Union[int, np.ndarray], b: np.ndarray) -> np.ndarray:
+    """
+    批量计算汉明距离
+    参数:
+        a: 指纹，或与 b 等长的 uint64 指纹数组
+        b: uint64 指纹数组
+    返回:
+        np.ndarray: 逐项的汉明距离
+    """
+    diff = np.bitwise_xor(np.asarray(a, dtype=np.uint64), b)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(diff).astype(np.int64)
+    return _POPCOUNT8[diff.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+
+def band_keys(fingerprints: Sequence[int]) -> np.ndarray:
+    """
+    批量计算指纹的分段键（段号在高位，不同段的键互不冲突）
+    参数:
+        fingerprints: 64 位指纹列表
+    返回:
+        np.ndarray: 形状为 (指纹数, BANDS) 的分段键矩阵
+    """
+    if not len(fingerprints):
+        return np.zeros((0, BANDS), dtype=np.int64)
+    values = to_array(fingerprints)
+    blocks = [(values >> np.uint64(start)) & np.uint64((1 << width) - 1)
+              for start, width in zip(_BLOCK_STARTS, _BLOCK_WIDTHS)]
+    keys = np.empty((len(values), BANDS), dtype=np.int64)
+    for band, band_blocks in enumerate(_BAND_BLOCKS):
+        key = np.full(len(values), band << BAND_BITS, dtype=np.uint64)
+        shift = 0
+        for block in band_blocks:
+            key |= blocks[block] << np.uint64(shift)
+            shift += _BLOCK_WIDTHS[block]
+        keys[:, band] = key.astype(np.int64)
+    return keys
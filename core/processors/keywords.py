@@ -0,0 +1,181 @@
+"""
+技术关键词词典模块
+从词典文件加载术语及同义词，一次性编译为 Aho-Corasick 自动机，单次扫描文本即可返回全部命中的术语及分类。
+自动机只由列表、字典和元组构成且构建后只读：在创建进程池之前构建，fork 出的子进程以写时复制方式共享；
+spawn 方式下可直接 pickle 传给进程池初始化函数
+"""
+
+import string
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 英文术语两端需要满足单词边界（中文术语不要求）
+_ASCII_WORD = frozenset(string.ascii_lowercase + string.digits + '_')
+
+
+class KeywordMatch(NamedTuple):
+    """一次关键词命中"""
+    term: str  # 规范术语（同义词命中时也返回规范术语）
+    category: str
+    start: int  # 在小写文本中的起止位置
+    end: int
+
+
+def parse_dictionary(lines: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """
+    解析词典文件内容
+    每行格式：术语|同义词|...<TAB>分类，空行和 # 开头的行忽略，缺省分类为 general
+    参数:
+        lines: 词典文件的各行
+    返回:
+        List[Tuple[str, str, str]]: (匹配词, 规范术语, 分类) 列表
+    """
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        surfaces, _, category = line.partition('\t')
+        names = [name.strip() for name in surfaces.split('|') if name.strip()]
+        if not names:
+            continue
+        for name in names:
+            entries.append((name, names[0], category.strip() or 'general'))
+    return entries
+
+
+class KeywordDictionary:
+    """编译为 Aho-Corasick 自动机的关键词词典（构建后只读，线程安全）"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]]):
+        """
+        参数:
+            entries: (匹配词, 规范术语, 分类) 列表，匹配不区分大小写
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 每个状态的输出：(规范术语, 分类, 匹配词长度, 左侧需单词边界, 右侧需单词边界)
+        self._output: List[Tuple[Tuple[str, str, int, bool, bool], ...]] = [()]
+        self.terms: Dict[str, str] = {}  # 规范术语 -> 分类
+        self.surfaces: Set[str] = set()  # 全部小写匹配词
+
+        for surface, term, category in entries:
+            key = surface.lower()
+            if not key or key in self.surfaces:
+                continue
+            self.surfaces.add(key)
+            self.terms.setdefault(term, category)
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = nxt
+            self._output[node] += ((term, category, len(key), key[0] in _ASCII_WORD, key[-1] in _ASCII_WORD),)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """按广度优先计算失败指针，并把失败状态的输出合并到当前状态"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                state = self._fail[node]
+                while state and ch not in self._goto[state]:
+                    state = self._fail[state]
+                fail = self._goto[state].get(ch, 0)
+                self._fail[child] = fail
+                self._output[child] += self._output[fail]
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'KeywordDictionary':
+        """从词典文件构建"""
+        with open(path, encoding='utf-8') as f:
+            return cls(parse_dictionary(f))
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        """
+        单次扫描文本，按结束位置依次产出全部命中（包括重叠命中）
+        参数:
+            text: 原始文本
+        """
+        if not text:
+            return
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        size = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for term, category, length, left, right in output[node]:
+                start = i - length + 1
+                if left and start > 0 and text[start - 1] in _ASCII_WORD:
+                    continue
+                if right and i + 1 < size and text[i + 1] in _ASCII_WORD:
+                    continue
+                yield KeywordMatch(term, category, start, i + 1)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """返回全部命中"""
+        return list(self.iter_matches(text))
+
+    def contains(self, text: str) -> bool:
+        """文本是否命中任一关键词（命中即停止扫描）"""
+        return next(self.iter_matches(text), None) is not None
+
+    def categories(self, text: str) -> Dict[str, Set[str]]:
+        """
+        按分类汇总命中的规范术语
+        返回:
+            Dict[str, Set[str]]: 分类 -> 命中术语集合
+        """
+        result: Dict[str, Set[str]] = {}
+        for match in self.find_all(text):
+            result.setdefault(match.category, set()).add(match.term)
+        return result
+
+
+_dictionaries: Optional[Dict[str, KeywordDictionary]] = None
+_dictionaries_lock = threading.Lock()
+
+
+def load_dictionaries(dict_dir: Optional[Path] = None) -> Dict[str, KeywordDictionary]:
+    """
+    加载目录下全部语言的词典（文件名即语言代码，如 en.txt、zh.txt）
+    参数:
+        dict_dir: 词典目录，默认使用配置中的目录
+    返回:
+        Dict[str, KeywordDictionary]: 语言 -> 词典
+    """
+    dict_dir = Path(dict_dir or settings.KEYWORD_CONFIG['dict_dir'])
+    dictionaries = {}
+    for path in sorted(dict_dir.glob('*.txt')):
+        dictionaries[path.stem] = KeywordDictionary.from_file(path)
+        logger.info(f"加载关键词词典 {path.name}：{len(dictionaries[path.stem])}个匹配词")
+    return dictionaries
+
+
+def get_dictionaries() -> Dict[str, KeywordDictionary]:
+    """获取进程内共享的词典（首次调用时编译，之后只读）"""
+    global _dictionaries
+    with _dictionaries_lock:
+        if _dictionaries is None:
+            _dictionaries = load_dictionaries()
+        return _dictionaries
@@ -0,0 +1,153 @@
+"""
+相关度评分模块
+清洗后为每篇文章计算相关度评分（关键词命中、star增速、来源权重、时效），随文章入库；
+邮件摘要按分类用有界堆选取评分最高的K篇，耗时 O(n log k)，与采集顺序无关
+"""
+
+import heapq
+import math
+from datetime import datetime, timezone
+from itertools import count
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+from config.settings import settings
+from core.article import Article
+from utils.dates import to_utc
+from utils.logger import get_logger
+from .analyzer import TechAnalyzer, detect_lang
+
+logger = get_logger(__name__)
+
+
+def relevance_of(item: Union[Article, Mapping]) -> float:
+    """文章的相关度评分（未评分时为0）"""
+    return item.get('relevance') or 0.0
+
+
+def digest_category(item: Union[Article, Mapping]) -> str:
+    """邮件摘要的分类：GitHub 仓库 / 其他新闻"""
+    return 'github' if item.get('source') == 'GitHub' else 'news'
+
+
+class RelevanceScorer:
+    """相关度评分器"""
+
+    def __init__(self, analyzer: Optional[TechAnalyzer] = None, config: Optional[Dict] = None):
+        """
+        参数:
+            analyzer: 提供关键词匹配的技术内容分析器，默认在首次评分时创建
+            config: 评分配置，默认使用 settings.RANKING_CONFIG
+        """
+        config = config or settings.RANKING_CONFIG
+        self.weights = config['weights']
+        self.keyword_cap = config['keyword_cap']
+        self.stars_scale = math.log1p(config['stars_reference'])
+        self.half_life_hours = config['half_life_hours']
+        self.source_weights = config['source_weights']
+        self._analyzer = analyzer
+
+    @property
+    def analyzer(self) -> TechAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = TechAnalyzer()
+        return self._analyzer
+
+    def score(self, article: Article, now: Optional[datetime] = None) -> float:
+        """
+        计算一篇文章的相关度评分
+        参数:
+            article: 清洗后的文章
+            now: 计算时效的当前时间（UTC），默认取当前时间
+        返回:
+            float: 评分（来源权重为1时在0~1之间）
+        """
+        now = now or datetime.now(timezone.utc)
+        text = f"{article.title} {article.description or ''}"
+        terms = {match.term for match in self.analyzer.match_keywords(text, detect_lang(text))}
+        keywords = min(len(terms), self.keyword_cap) / self.keyword_cap
+
+        velocity = article.stars_per_day or article.today_stars or 0
+        stars = min(math.log1p(max(velocity, 0)) / self.stars_scale, 1.0)
+
+        recency = 0.0
+        if isinstance(article.published_at, datetime):
+            age_hours = max((now - to_utc(article.published_at)).total_seconds() / 3600, 0.0)
+            recency = 0.5 ** (age_hours / self.half_life_hours)
+
+        weights = self.weights
+        score = weights['keywords'] * keywords + weights['stars'] * stars + weights['recency'] * recency
+        return round(self.source_weights.get(article.source, 1.0) * score, 6)
+
+    def score_batch(self, articles: List[Article]) -> List[Article]:
+        """
+        为一批文章写入 relevance（原地修改，返回同一列表，便于作为流水线阶段使用）
+        参数:
+            articles: 清洗后的文章
+        """
+        now = datetime.now(timezone.utc)
+        for article in articles:
+            article.relevance = self.score(article, now)
+        return articles
+
+
+class CategoryTopK:
+    """按分类保留评分最高的K项（每个分类一个有界最小堆，可分批加入）"""
+
+    def __init__(self, k: Union[int, Mapping[str, int]],
+                 category: Callable[[Article], Optional[str]] = digest_category,
+                 key: Callable[[Article], float] = relevance_of):
+        """
+        参数:
+            k: 每个分类保留的数量，或 分类 -> 数量（未列出的分类不保留）
+            category: 返回文章分类的函数，返回 None 时不参与选取
+            key: 评分函数
+        """
+        self.k = k
+        self.category = category
+        self.key = key
+        self._heaps: Dict[str, list] = {}
+        self._order = count()
+
+    def _limit(self, category: str) -> int:
+        return self.k.get(category, 0) if isinstance(self.k, Mapping) else self.k
+
+    def extend(self, items: Iterable[Article]) -> 'CategoryTopK':
+        """加入一批文章"""
+        for item in items:
+            category = self.category(item)
+            if category is None:
+                continue
+            limit = self._limit(category)
+            if limit <= 0:
+                continue
+            heap = self._heaps.setdefault(category, [])
+            # 评分相同时先加入的优先（序号取负，后加入的在最小堆中更小，先被淘汰）
+            entry = (self.key(item), -next(self._order), item)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        return self
+
+    def result(self) -> Dict[str, List[Article]]:
+        """各分类按评分从高到低排列的文章"""
+        return {category: [entry[2] for entry in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+                for category, heap in self._heaps.items()}
+
+    def items(self) -> List[Article]:
+        """所有分类选出的文章（按分类依次排列）"""
+        return [item for items in self.result().values() for item in items]
+
+
+def top_k_by_category(items: Iterable[Article], k: Union[int, Mapping[str, int]],
+                      category: Callable[[Article], Optional[str]] = digest_category) -> Dict[str, List[Article]]:
+    """
+    按分类选取评分最高的K篇文章
+    参数:
+        items: 文章（Article 或字典）
+        k: 每个分类保留的数量，或 分类 -> 数量
+        category: 返回文章分类的函数，返回 None 时不参与选取
+    返回:
+        Dict[str, List]: 分类 -> 按评分从高到低排列的文章
+    """
+    return CategoryTopK(k, category).extend(items).result()
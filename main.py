@@ -1,16 +1,24 @@
 import time
 import re
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
 from apscheduler.schedulers.blocking import BlockingScheduler
-from core.crawlers import GitHubTrendingCrawler, NewsAPICrawler
-from core.processors import TechAnalyzer
+from core.crawlers import GitHubTrendingCrawler, NewsAPICrawler, RSSFeedCrawler, ArticleContentFetcher
+from core.processors import CategoryTopK, RelevanceScorer, TechAnalyzer
+from core.processors.analyzer import detect_lang
 from core.database import NewsDatabase
 from utils.logger import configure_logging, get_logger
-from utils.metrics import REQUEST_COUNTER, PROCESS_TIME, ITEMS_GAUGE
+from utils.metrics import REQUEST_COUNTER, PROCESS_TIME, ITEMS_GAUGE, SOURCE_TIME
 from prometheus_client import start_http_server
 from core.processors.cleaner import DataCleaner
 from core.notification import EmailSender,EmailSenderAI
 from dotenv import load_dotenv
+from config import settings
+from utils.circuit_breaker import CircuitBreaker, http_probe
+from utils.state import JSONStateStore
+from utils.stream import CancelToken, StageCounters, merge_sources, run_stage
 
 # 配置日志
 configure_logging()
@@ -25,11 +33,28 @@ class TechNewsMonitor:
         logger.info("Prometheus监控服务已启动，端口：8000")
         
         self.analyzer = TechAnalyzer()
-        self.db = NewsDatabase()
+        # 预加载分词词典，避免首轮采集时的加载停顿
+        self.analyzer.segmenter.warm()
+        self.scorer = RelevanceScorer(self.analyzer)
+        self.db = NewsDatabase(analyzer=self.analyzer)
+        self._pending_watermarks = []  # [(爬虫, 候选水位线)]，入库后保存
         self.crawlers = [
             GitHubTrendingCrawler(),
-            NewsAPICrawler()
+            NewsAPICrawler(),
+            RSSFeedCrawler()
         ]
+        # 每个数据源一个熔断器，故障期间直接跳过，避免每轮都耗尽超时和重试
+        breaker_store = JSONStateStore(settings.CIRCUIT_BREAKER_CONFIG['state_file'])
+        self.breakers = {
+            crawler.__class__.__name__: CircuitBreaker(
+                crawler.__class__.__name__,
+                breaker_store,
+                probe=http_probe(crawler.probe_url) if getattr(crawler, 'probe_url', None) else None
+            )
+            for crawler in self.crawlers
+        }
+        # 可选的正文抓取阶段
+        self.content_fetcher = ArticleContentFetcher() if settings.CONTENT_CONFIG['enabled'] else None
         if os.getenv('ENABLE_EMAIL', 'false').lower() == 'true':
             if os.getenv('EMAIL_AI_SENDER', 'false').lower() == 'true':
                 self.email_sender = EmailSenderAI()
@@ -40,35 +65,154 @@ class TechNewsMonitor:
         logger.info("初始化完成：分析器、数据库、爬虫已加载")
 
     def collect_news(self):
+        """按配置选择串行或并发方式采集所有数据源（采集成功的数据源的候选水位线在入库后保存）"""
+        self._pending_watermarks = []
+        if settings.COLLECT_CONFIG['mode'] == 'sequential':
+            all_news = self._collect_sequential()
+        else:
+            all_news = self._collect_concurrent()
+
+        logger.info(f"所有爬虫采集完成，总有效数据量：{len(all_news)}条")
+        return all_news
+
+    def _collect_sequential(self):
+        """逐个数据源串行采集"""
         all_news = []
         for crawler in self.crawlers:
             crawler_name = crawler.__class__.__name__
-            logger.info(f"开始从 {crawler_name} 采集数据...")
-            
             try:
-                start_time = time.time()
-                data = crawler.fetch()
-                fetch_time = time.time() - start_time
-                logger.info(f"{crawler_name} 采集完成，耗时：{fetch_time:.2f}秒，原始数据量：{len(data)}条")
-
-                # 过滤非技术内容
-                start_time = time.time()
-                filtered = [n for n in data if self.filter_news(n)]
-                filter_time = time.time() - start_time
-                logger.info(f"{crawler_name} 过滤完成，耗时：{filter_time:.2f}秒，有效数据量：{len(filtered)}条")
-                
-                all_news.extend(filtered)
+                all_news.extend(self._accept_source(crawler, self._collect_source(crawler)))
             except Exception as e:
                 logger.error(f"{crawler_name} 采集失败：{str(e)}", exc_info=True)
                 REQUEST_COUNTER.labels(source=crawler_name, status='error').inc()
-        
-        logger.info(f"所有爬虫采集完成，总有效数据量：{len(all_news)}条")
         return all_news
 
+    def _collect_concurrent(self):
+        """
+        所有数据源并发采集，每个数据源有独立的截止时间
+        总耗时由最慢的数据源决定，超时的数据源结果被丢弃；
+        截止时间随取消信号传到数据源内部，网络请求超时不超过剩余时间，超时的工作线程随之结束
+        """
+        config = settings.COLLECT_CONFIG
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(config['max_workers'], len(self.crawlers))),
+            thread_name_prefix='collector'
+        )
+        start_time = time.monotonic()
+        tasks = []
+        for crawler in self.crawlers:
+            crawler_name = crawler.__class__.__name__
+            deadline = start_time + config['deadlines'].get(crawler_name, config['default_deadline'])
+            cancel_event = CancelToken(deadline)
+            future = executor.submit(self._collect_source, crawler, cancel_event)
+            tasks.append((crawler, future, cancel_event, deadline))
+
+        all_news = []
+        try:
+            # 按截止时间先后等待，保证每个数据源只占用自己的时间预算
+            for crawler, future, cancel_event, deadline in sorted(tasks, key=lambda t: t[3]):
+                crawler_name = crawler.__class__.__name__
+                try:
+                    result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    all_news.extend(self._accept_source(crawler, result))
+                except FutureTimeoutError:
+                    cancel_event.set()
+                    future.cancel()
+                    self.breakers[crawler_name].record_failure('timeout')
+                    logger.error(f"{crawler_name} 采集超时，已超过截止时间 {deadline - start_time:.0f}秒，本轮结果丢弃")
+                    REQUEST_COUNTER.labels(source=crawler_name, status='timeout').inc()
+                except Exception as e:
+                    logger.error(f"{crawler_name} 采集失败：{str(e)}", exc_info=True)
+                    REQUEST_COUNTER.labels(source=crawler_name, status='error').inc()
+        finally:
+            # 不等待已超时的任务，未开始的任务直接取消
+            executor.shutdown(wait=False, cancel_futures=True)
+        return all_news
+
+    def _collect_source(self, crawler, cancel_event=None):
+        """
+        采集并过滤单个数据源
+        参数:
+            crawler: 爬虫实例
+            cancel_event: 取消信号（CancelToken），超时后停止采集并跳过后续处理
+        返回:
+            Tuple[list, dict]: (过滤后的有效数据, 候选水位线)
+        """
+        crawler_name = crawler.__class__.__name__
+        breaker = self.breakers[crawler_name]
+        if not breaker.allow():
+            logger.warning(f"{crawler_name} 处于熔断状态，本轮跳过")
+            REQUEST_COUNTER.labels(source=crawler_name, status='skipped').inc()
+            return [], {}
+        logger.info(f"开始从 {crawler_name} 采集数据...")
+
+        start_time = time.time()
+        try:
+            data = list(crawler.iter_fetch(cancel_event))
+        except Exception as e:
+            breaker.record_failure(str(e))
+            raise
+        if cancel_event is None or not cancel_event.is_set():
+            breaker.record_success()
+        fetch_time = time.time() - start_time
+        SOURCE_TIME.labels(source=crawler_name, stage='fetch').set(fetch_time)
+        logger.info(f"{crawler_name} 采集完成，耗时：{fetch_time:.2f}秒，原始数据量：{len(data)}条")
+
+        watermarks = self._take_watermarks(crawler)
+        if cancel_event is not None and cancel_event.is_set():
+            logger.warning(f"{crawler_name} 已被取消，跳过过滤")
+            return [], {}
+
+        # 丢弃已入库的数据，后续分析、正文抓取和AI摘要只处理新数据
+        unseen = self.db.filter_unseen(data)
+        if len(unseen) < len(data):
+            logger.info(f"{crawler_name} 已入库数据：{len(data) - len(unseen)}条，新数据：{len(unseen)}条")
+        data = unseen
+
+        # 过滤非技术内容
+        start_time = time.time()
+        filtered = self.filter_batch(data)
+        filter_time = time.time() - start_time
+        SOURCE_TIME.labels(source=crawler_name, stage='filter').set(filter_time)
+        logger.info(f"{crawler_name} 过滤完成，耗时：{filter_time:.2f}秒，有效数据量：{len(filtered)}条")
+        return filtered, watermarks
+
+    @staticmethod
+    def _take_watermarks(crawler) -> dict:
+        """取出数据源本次采集的候选水位线（不支持增量采集的数据源为空）"""
+        take = getattr(crawler, 'take_watermarks', None)
+        return take() if take is not None else {}
+
+    def _accept_source(self, crawler, result):
+        """接收按时完成的数据源结果，记录其候选水位线，待入库后保存"""
+        data, watermarks = result
+        if watermarks:
+            self._pending_watermarks.append((crawler, watermarks))
+        return data
+
+    def _commit_watermarks(self):
+        """数据入库后保存本轮候选水位线（超时、失败的数据源不会进入待保存列表）"""
+        for crawler, watermarks in self._pending_watermarks:
+            crawler.commit_watermarks(watermarks)
+        self._pending_watermarks = []
+
     def filter_news(self, news_item):
-        lang = 'zh' if re.search(r'[\u4e00-\u9fff]', news_item['title']) else 'en'
-        combined_text = f"{news_item['title']} {news_item.get('description', '')}"
-        return self.analyzer.is_tech_related(combined_text, lang=lang)
+        return bool(self.filter_batch([news_item]))
+
+    def filter_batch(self, news_items):
+        """
+        批量过滤非技术内容，整批文本一次向量化
+        参数:
+            news_items: 单个数据源采集到的数据
+        返回:
+            list: 技术相关的数据
+        """
+        if not news_items:
+            return []
+        langs = [detect_lang(n['title']) for n in news_items]
+        texts = [f"{n['title']} {n.get('description') or ''}" for n in news_items]
+        mask = self.analyzer.is_tech_related_batch(texts, langs)
+        return [n for n, keep in zip(news_items, mask) if keep]
 
     def run(self):
         scheduler = BlockingScheduler()
@@ -93,7 +237,123 @@ class TechNewsMonitor:
         except Exception as e:
             logger.error(f"调度器运行失败：{str(e)}", exc_info=True)
 
+    def _iter_source(self, crawler, cancel_event):
+        """
+        逐条产出单个数据源的数据（带熔断）
+        参数:
+            crawler: 爬虫实例
+            cancel_event: 取消信号，超时后置位
+        """
+        crawler_name = crawler.__class__.__name__
+        breaker = self.breakers[crawler_name]
+        if not breaker.allow():
+            logger.warning(f"{crawler_name} 处于熔断状态，本轮跳过")
+            REQUEST_COUNTER.labels(source=crawler_name, status='skipped').inc()
+            return
+        logger.info(f"开始从 {crawler_name} 流式采集数据...")
+        try:
+            yield from crawler.iter_fetch(cancel_event)
+        except Exception as e:
+            breaker.record_failure(str(e))
+            raise
+        if not cancel_event.is_set():
+            breaker.record_success()
+
+    def _on_stream_error(self, crawler_name, error):
+        """流式采集中数据源失败或超时"""
+        if isinstance(error, TimeoutError):
+            self.breakers[crawler_name].record_failure('timeout')
+            REQUEST_COUNTER.labels(source=crawler_name, status='timeout').inc()
+        else:
+            logger.error(f"{crawler_name} 采集失败：{str(error)}")
+            REQUEST_COUNTER.labels(source=crawler_name, status='error').inc()
+
+    def _on_stream_complete(self, crawler):
+        """流式采集中数据源正常结束：其数据都已入库，保存候选水位线"""
+        watermarks = self._take_watermarks(crawler)
+        if watermarks:
+            crawler.commit_watermarks(watermarks)
+
+    def _store_chunk(self, chunk):
+        """入库一个分块，只把实际插入的文章交给下游（邮件摘要不包含已存在、近似重复丢弃或合并的文章）"""
+        return self.db.save_batch(chunk).articles
+
+    def stream_news(self, counters):
+        """
+        流式采集：各数据源的数据按分块依次经过 预过滤 -> 技术过滤 -> 清洗去重 -> 正文抓取 -> 入库，
+        任一时刻只持有少量分块；跨分块的重复数据由布隆过滤器和数据库唯一约束处理
+        参数:
+            counters: 各阶段计数器
+        返回:
+            Iterator[list]: 实际插入的文章组成的分块
+        """
+        config = settings.PIPELINE_CONFIG
+        collect = settings.COLLECT_CONFIG
+        sequential = collect['mode'] == 'sequential'
+        crawlers = {crawler.__class__.__name__: crawler for crawler in self.crawlers}
+        sources = {name: partial(self._iter_source, crawler) for name, crawler in crawlers.items()}
+        # 串行模式与整批处理一致，不设截止时间
+        deadlines = None if sequential else {
+            name: collect['deadlines'].get(name, collect['default_deadline']) for name in sources
+        }
+        merged = merge_sources(sources, config['chunk_size'], config['queue_size'],
+                               max_workers=1 if sequential else collect['max_workers'],
+                               deadlines=deadlines, on_error=self._on_stream_error,
+                               on_complete=lambda name: self._on_stream_complete(crawlers[name]))
+
+        chunks = run_stage((chunk for _, chunk in merged), 'fetched', list, counters)
+        chunks = run_stage(chunks, 'unseen', self.db.filter_unseen, counters)
+        chunks = run_stage(chunks, 'tech', self.filter_batch, counters)
+        chunks = run_stage(chunks, 'cleaned', DataCleaner.normalize_data, counters)
+        chunks = run_stage(chunks, 'scored', self.scorer.score_batch, counters)
+        if self.content_fetcher:
+            chunks = run_stage(chunks, 'content', self.content_fetcher.enrich, counters)
+        return run_stage(chunks, 'stored', self._store_chunk, counters)
+
+    def execute_stream_pipeline(self):
+        """流式执行采集任务（PIPELINE_MODE=stream）"""
+        start_time = time.time()
+        logger.info("开始执行流式采集任务...")
+        counters = StageCounters()
+        # 邮件摘要每个分类只保留评分最高的N条，避免内存随数据量增长
+        digest = CategoryTopK(settings.PIPELINE_CONFIG['digest_limit'])
+
+        try:
+            PROCESS_TIME.labels('collect').set_to_current_time()
+            for chunk in self.stream_news(counters):
+                digest.extend(chunk)
+                logger.info(f"流式处理进度：{counters.summary()}")
+
+            stored = counters.counts.get('stored', 0)
+            logger.info(f"流式处理完成，各阶段条数：{counters.summary() or '无数据'}")
+            selected = digest.items()
+            if self.email_sender and selected:
+                self.email_sender.send_digest(selected)
+
+            ITEMS_GAUGE.set(stored)
+            REQUEST_COUNTER.labels(source='all', status='success').inc()
+        except Exception as e:
+            logger.error(f"任务执行失败：{str(e)}", exc_info=True)
+            REQUEST_COUNTER.labels(source='all', status='error').inc()
+        finally:
+            self._finish_run(start_time)
+
+    def _finish_run(self, start_time):
+        total_time = time.time() - start_time
+        PROCESS_TIME.labels('total').set(total_time)
+        segment_stats = self.analyzer.segmenter.stats()
+        logger.info(f"任务完成，总耗时：{total_time:.2f}秒，"
+                    f"分词缓存命中率：{segment_stats['hit_ratio']:.1%}（缓存{segment_stats['size']}条）")
+        self.db.flush()
+        trending = self.db.trending_terms(k=10)
+        if trending:
+            terms = '，'.join(f"{item.term}({item.count})" for item in trending)
+            logger.info(f"近{settings.TRENDING_CONFIG['window_hours']}小时热门词：{terms}")
+
     def execute_pipeline(self):
+        if settings.PIPELINE_CONFIG['mode'] == 'stream':
+            return self.execute_stream_pipeline()
+
         start_time = time.time()
         logger.info("开始执行采集任务...")
         
@@ -102,16 +362,31 @@ class TechNewsMonitor:
             PROCESS_TIME.labels('collect').set_to_current_time()
             news_data = self.collect_news()
 
+            # 阶段1.2：清洗去重（结果带有已标准化标记，存储时不再重复清洗）
+            PROCESS_TIME.labels('clean').set_to_current_time()
+            news_data = DataCleaner.normalize_data(news_data)
+
+            # 阶段1.3：相关度评分（随文章入库，邮件摘要按评分选取）
+            self.scorer.score_batch(news_data)
+
+            # 阶段1.5：抓取正文（可选）
+            if self.content_fetcher and news_data:
+                PROCESS_TIME.labels('content').set_to_current_time()
+                self.content_fetcher.enrich(news_data)
+
             # 阶段2：数据存储
             PROCESS_TIME.labels('save').set_to_current_time()
             if news_data:
-                self.db.save_batch(news_data)
-                logger.info(f"数据存储完成，写入量：{len(news_data)}条")
-                # 发送邮件通知
-                if self.email_sender and news_data:
-                    self.email_sender.send_digest(news_data)
+                result = self.db.save_batch(news_data)
+                logger.info(f"数据存储完成，写入量：{result.inserted}条，已存在：{result.ignored}条，"
+                            f"近似重复：{result.deduplicated}条")
+                self._commit_watermarks()
+                # 发送邮件通知（只包含实际入库的文章，近似重复丢弃、合并的不再发送）
+                if self.email_sender and result.articles:
+                    self.email_sender.send_digest(result.articles)
             else:
                 logger.warning("未采集到有效数据，跳过存储步骤")
+                self._commit_watermarks()
             
             # 更新监控指标
             ITEMS_GAUGE.set(len(news_data))
@@ -120,11 +395,13 @@ class TechNewsMonitor:
             logger.error(f"任务执行失败：{str(e)}", exc_info=True)
             REQUEST_COUNTER.labels(source='all', status='error').inc()
         finally:
-            total_time = time.time() - start_time
-            PROCESS_TIME.labels('total').set(total_time)
-            logger.info(f"任务完成，总耗时：{total_time:.2f}秒")
+            self._finish_run(start_time)
 
 if __name__ == "__main__":
     logger.info("启动 TechNewsMonitor...")
     monitor = TechNewsMonitor()
-    monitor.run()
\ No newline at end of file
+    if '--once' in sys.argv:
+        # 只执行一次采集任务（配合 ARCHIVE_MODE=replay 做离线基准测试）
+        monitor.execute_pipeline()
+    else:
+        monitor.run()
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""
+原始响应归档与离线回放模块
+record 模式下保存爬虫收到的每个原始响应（gzip压缩、按内容SHA256寻址、按来源和时间索引）；
+replay 模式下爬虫从归档读取响应而不访问网络，用于可重复的离线性能测试
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import PreparedRequest, Response, Session
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def archive_key(url: str) -> str:
+    """
+    生成归档匹配用的URL（去掉密钥和随运行变化的参数，其余参数排序）
+    参数:
+        url: 完整请求地址
+    返回:
+        str: 规范化后的URL
+    """
+    volatile = settings.ARCHIVE_CONFIG['volatile_params']
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in volatile)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+class ResponseArchive:
+    """内容寻址的原始响应归档"""
+
+    def __init__(self, root: Optional[Path] = None):
+        """
+        参数:
+            root: 归档根目录，默认使用配置中的目录
+        """
+        self.root = Path(root or settings.ARCHIVE_CONFIG['root'])
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    content_type TEXT,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_source_time ON responses (source, fetched_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_url_time ON responses (url, fetched_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立的SQLite连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.root / "index.db", timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / f"{sha256}.gz"
+
+    def record(self, source: str, response: Response):
+        """
+        归档一个响应，相同内容只保存一份
+        参数:
+            source: 数据源名称
+            response: 已完整读取的响应
+        """
+        content = response.content
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._object_path(sha256)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(content))
+            os.replace(tmp_path, path)
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO responses (source, url, fetched_at, sha256, status, content_type, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source, archive_key(response.url), time.time(), sha256,
+                 response.status_code, response.headers.get('Content-Type'), len(content))
+            )
+
+    def lookup(self, url: str, at: Optional[float] = None) -> Optional[Dict]:
+        """
+        查找指定时间点（默认当前）之前最近一次归档的响应
+        参数:
+            url: 请求地址
+            at: UNIX时间戳
+        返回:
+            Optional[Dict]: 索引记录，未找到时为None
+        """
+        row = self._connect().execute(
+            "SELECT * FROM responses WHERE url = ? AND fetched_at <= ? ORDER BY fetched_at DESC LIMIT 1",
+            (archive_key(url), at if at is not None else time.time())
+        ).fetchone()
+        return dict(row) if row else None
+
+    def load(self, sha256: str) -> bytes:
+        """读取并解压归档内容"""
+        with open(self._object_path(sha256), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def iter_entries(self, source: Optional[str] = None, since: Optional[float] = None,
+                     until: Optional[float] = None) -> Iterator[Dict]:
+        """按来源和时间范围遍历归档记录（按时间升序）"""
+        sql = "SELECT * FROM responses WHERE fetched_at >= ? AND fetched_at <= ?"
+        params = [since or 0, until or time.time()]
+        if source:
+            sql += " AND source = ?"
+            params.append(source)
+        for row in self._connect().execute(sql + " ORDER BY fetched_at", params):
+            yield dict(row)
+
+
+class ReplayAdapter(BaseAdapter):
+    """从归档返回响应的传输适配器，不发起任何网络请求"""
+
+    def __init__(self, archive: ResponseArchive, replay_at: Optional[float] = None):
+        super().__init__()
+        self.archive = archive
+        self.replay_at = replay_at
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        response = Response()
+        response.request = request
+        response.url = request.url
+        entry = self.archive.lookup(request.url, self.replay_at)
+        if entry is None:
+            logger.warning(f"归档中不存在该请求：{archive_key(request.url)}")
+            response.status_code = 404
+            response.reason = 'Not Archived'
+            response._content = b''
+            return response
+
+        response.status_code = entry['status']
+        response.reason = 'OK (replayed)'
+        response.headers = CaseInsensitiveDict({'Content-Type': entry['content_type'] or ''})
+        response._content = self.archive.load(entry['sha256'])
+        response.encoding = None
+        return response
+
+    def close(self):
+        pass
+
+
+_archive: Optional[ResponseArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> ResponseArchive:
+    """获取进程内共享的归档实例"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = ResponseArchive()
+        return _archive
+
+
+def is_replay() -> bool:
+    """当前是否为离线回放模式"""
+    return settings.ARCHIVE_CONFIG['mode'] == 'replay'
+
+
+def install(session: Session, source: str):
+    """
+    按配置为会话启用归档
+    record: 通过响应钩子保存每个完整的GET 200响应（流式下载的响应不归档）
+    replay: 挂载 ReplayAdapter，所有请求都从归档读取
+    参数:
+        session: 爬虫的请求会话
+        source: 数据源名称（归档索引字段）
+    """
+    mode = settings.ARCHIVE_CONFIG['mode']
+    if mode == 'record':
+        archive = get_archive()
+
+        def record_hook(response, *args, **kwargs):
+            # 只归档GET：HEAD（如熔断探测）的响应体为空，会覆盖同一URL的真实内容
+            if response.status_code == 200 and response.request.method == 'GET' and not kwargs.get('stream'):
+                try:
+                    archive.record(source, response)
+                except Exception as e:
+                    logger.error(f"响应归档失败({source}): {str(e)}")
+            return response
+
+        session.hooks['response'].append(record_hook)
+    elif mode == 'replay':
+        replay_at = settings.ARCHIVE_CONFIG['replay_at']
+        adapter = ReplayAdapter(
+            get_archive(),
+            datetime.fromisoformat(replay_at).timestamp() if replay_at else None
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    elif mode != 'off':
+        raise ValueError(f"不支持的归档模式: {mode}")
@@ -0,0 +1,166 @@
+"""
+可扩展布隆过滤器模块
+用于在分析之前快速判断URL或内容指纹是否已入库：不存在的项一定判断为不存在，
+已存在的项一定判断为存在，只有少量未入库的项会被误判为已存在（误判率可配置）。
+写满后自动追加容量翻倍、误判率减半的新过滤器，各级误判率之和不超过配置值
+"""
+
+import math
+import os
+import pickle
+import tempfile
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def _hash_pairs(items: List[str]) -> np.ndarray:
+    """每项计算一次128位哈希，拆成两个64位值用于双重哈希"""
+    digests = b''.join(blake2b(item.encode('utf-8'), digest_size=16).digest() for item in items)
+    return np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+
+
+class BloomFilter:
+    """固定容量的布隆过滤器（位数组按字节打包存储）"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        参数:
+            capacity: 设计容量（达到该数量时误判率约为 error_rate）
+            error_rate: 设计误判率
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, pairs: np.ndarray) -> np.ndarray:
+        """双重哈希：第i个位置为 h1 + i*h2（按位数取模）"""
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (pairs[:, :1] + steps * pairs[:, 1:]) % np.uint64(self.num_bits)
+
+    def add_pairs(self, pairs: np.ndarray):
+        positions = self._positions(pairs).ravel()
+        np.bitwise_or.at(self.bits, (positions >> np.uint64(3)).astype(np.intp),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+        self.count += len(pairs)
+
+    def contains_pairs(self, pairs: np.ndarray) -> np.ndarray:
+        positions = self._positions(pairs)
+        bytes_ = self.bits[(positions >> np.uint64(3)).astype(np.intp)]
+        return ((bytes_ >> (positions & np.uint64(7)).astype(np.uint8)) & 1).all(axis=1)
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def false_positive_rate(self) -> float:
+        """按已加入数量估算的当前误判率"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class ScalableBloomFilter:
+    """可扩展布隆过滤器"""
+
+    def __init__(self, initial_capacity: int = 100000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.5):
+        """
+        参数:
+            initial_capacity: 第一个过滤器的容量
+            error_rate: 总误判率目标（第一个过滤器使用 error_rate*(1-tightening)，之后逐级收紧）
+            growth: 每次扩容的容量倍数
+            tightening: 每次扩容的误判率倍数
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+        self.meta: Dict = {}  # 调用方保存的附加信息（如重建水位线）
+
+    def _current(self) -> BloomFilter:
+        if not self.filters or self.filters[-1].is_full:
+            index = len(self.filters)
+            self.filters.append(BloomFilter(
+                self.initial_capacity * self.growth ** index,
+                self.error_rate * (1 - self.tightening) * self.tightening ** index
+            ))
+        return self.filters[-1]
+
+    def update(self, items: Iterable[str]):
+        """批量加入（重复加入不影响判断，但会占用容量）"""
+        items = [item for item in items if item]
+        start = 0
+        while start < len(items):
+            current = self._current()
+            end = start + current.capacity - current.count
+            current.add_pairs(_hash_pairs(items[start:end]))
+            start = end
+
+    def add(self, item: str):
+        self.update([item])
+
+    def contains_many(self, items: List[str]) -> np.ndarray:
+        """
+        批量判断是否（可能）已存在
+        参数:
+            items: 待判断项
+        返回:
+            np.ndarray: 布尔数组，False 表示一定不存在
+        """
+        result = np.zeros(len(items), dtype=bool)
+        if not items or not self.filters:
+            return result
+        pairs = _hash_pairs(items)
+        for bloom in self.filters:
+            result |= bloom.contains_pairs(pairs)
+        return result
+
+    def __contains__(self, item: str) -> bool:
+        return bool(self.contains_many([item])[0])
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(bloom.bits.nbytes for bloom in self.filters)
+
+    def false_positive_rate(self) -> float:
+        """估算的整体误判率（任一过滤器误判即误判）"""
+        return 1 - math.prod(1 - bloom.false_positive_rate() for bloom in self.filters)
+
+    def save(self, path: Path):
+        """原子写入快照"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'version': SNAPSHOT_VERSION, 'filter': self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['ScalableBloomFilter']:
+        """读取快照，文件不存在或不兼容时返回 None"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"布隆过滤器快照读取失败，将从数据库重建({path}): {str(e)}")
+            return None
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            return None
+        return snapshot['filter']
@@ -0,0 +1,145 @@
+"""
+数据源熔断器模块
+连续失败达到阈值后熔断（open），冷却期内直接跳过该数据源；
+冷却期结束后先发起低成本探测，探测通过才进入半开（half_open）状态放行一次完整采集
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+
+from config.settings import settings
+from utils.http_client import get_session
+from utils.logger import get_logger
+from utils.metrics import CIRCUIT_STATE
+from utils.state import JSONStateStore
+
+logger = get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Prometheus中的状态取值
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+_probe_session: Optional[requests.Session] = None
+_probe_session_lock = threading.Lock()
+
+
+def get_probe_session() -> requests.Session:
+    """获取所有探测共用的会话（不重试，同样经过主机限流和归档回放）"""
+    global _probe_session
+    with _probe_session_lock:
+        if _probe_session is None:
+            _probe_session = get_session('Probe', retries=0)
+        return _probe_session
+
+
+def http_probe(url: str, timeout: float = 5) -> Callable[[], bool]:
+    """
+    生成基于HEAD请求的探测函数（不重试，服务端非5xx即视为可用）
+    参数:
+        url: 探测地址
+        timeout: 探测超时（秒）
+    """
+    def probe() -> bool:
+        try:
+            return get_probe_session().head(url, timeout=timeout, allow_redirects=True).status_code < 500
+        except requests.RequestException:
+            return False
+    return probe
+
+
+class CircuitBreaker:
+    """单个数据源的熔断器，状态和失败统计持久化到状态文件"""
+
+    def __init__(self, name: str, store: JSONStateStore, probe: Optional[Callable[[], bool]] = None,
+                 failure_threshold: Optional[int] = None, recovery_timeout: Optional[float] = None):
+        """
+        参数:
+            name: 数据源名称
+            store: 共享的状态存储
+            probe: 冷却期结束后的探测函数，返回是否可用；为空时直接进入半开状态
+            failure_threshold: 触发熔断的连续失败次数
+            recovery_timeout: 熔断冷却时间（秒）
+        """
+        config = settings.CIRCUIT_BREAKER_CONFIG
+        self.name = name
+        self.store = store
+        self.probe = probe
+        self.failure_threshold = failure_threshold or config['failure_threshold']
+        self.recovery_timeout = recovery_timeout or config['recovery_timeout']
+        self._lock = threading.Lock()
+        self._stats = store.get(name) or {
+            'state': CLOSED,
+            'consecutive_failures': 0,
+            'total_failures': 0,
+            'total_successes': 0,
+            'opened_at': None,
+            'last_error': None
+        }
+        CIRCUIT_STATE.labels(source=name).set(STATE_VALUES[self._stats['state']])
+
+    @property
+    def state(self) -> str:
+        return self._stats['state']
+
+    def allow(self) -> bool:
+        """
+        判断本轮是否允许采集该数据源
+        返回:
+            bool: False 表示熔断中，应直接跳过
+        """
+        with self._lock:
+            if self.state != OPEN:
+                return True
+            if time.time() - self._stats['opened_at'] < self.recovery_timeout:
+                return False
+
+        # 冷却期已过，探测不持有锁，避免阻塞其他线程
+        if self.probe is not None and not self.probe():
+            with self._lock:
+                self._stats['opened_at'] = time.time()
+                self._save()
+            logger.warning(f"{self.name} 熔断探测失败，继续熔断 {self.recovery_timeout:.0f}秒")
+            return False
+
+        with self._lock:
+            self._set_state(HALF_OPEN)
+            self._save()
+        logger.info(f"{self.name} 熔断探测通过，进入半开状态")
+        return True
+
+    def record_success(self):
+        """记录一次成功采集，半开状态下恢复为关闭"""
+        with self._lock:
+            self._stats['consecutive_failures'] = 0
+            self._stats['total_successes'] += 1
+            if self.state != CLOSED:
+                logger.info(f"{self.name} 已恢复，熔断器关闭")
+                self._set_state(CLOSED)
+            self._save()
+
+    def record_failure(self, error: str):
+        """记录一次失败采集，达到阈值或半开试探失败时熔断"""
+        with self._lock:
+            self._stats['consecutive_failures'] += 1
+            self._stats['total_failures'] += 1
+            self._stats['last_error'] = error[:500]
+            if self.state == HALF_OPEN or self._stats['consecutive_failures'] >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(f"{self.name} 连续失败 {self._stats['consecutive_failures']} 次，"
+                                   f"熔断 {self.recovery_timeout:.0f}秒")
+                self._set_state(OPEN)
+                self._stats['opened_at'] = time.time()
+            self._save()
+
+    def _set_state(self, state: str):
+        self._stats['state'] = state
+        CIRCUIT_STATE.labels(source=self.name).set(STATE_VALUES[state])
+
+    def _save(self):
+        self.store.set(self.name, dict(self._stats))
@@ -0,0 +1,209 @@
+"""
+日期解析模块
+统一解析各数据源的发布时间，返回带时区的UTC时间（不含时区的值按UTC处理）：
+- 按字符串的"形状"（数字逐位、字母替换为占位符）识别格式，每种形状只识别一次并缓存对应的解析函数
+- 每个来源记住上次成功的解析函数，同一来源的后续日期直接使用，不再计算形状
+- ISO 8601 和 RSS 常用的 RFC 822 使用专用解析，其余固定格式使用 strptime，都失败时才回退到 dateutil
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from dateutil import parser as dateutil_parser
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# RFC 822/2822：Sat, 22 Mar 2025 10:00:00 +0000（星期、秒可省略，时区为偏移量或缩写）
+_RFC822 = re.compile(
+    r'^(?:[A-Za-z]{3,9},?\s+)?(\d{1,2})\s+([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{2,4})\s+'
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?\s*(?:([+-])(\d{2}):?(\d{2})|([A-Za-z]{1,5}))?$'
+)
+_MONTHS = {name: i for i, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+# RFC 822 允许的时区缩写（小时偏移）
+_TZ_NAMES = {'z': 0, 'ut': 0, 'utc': 0, 'gmt': 0, 'est': -5, 'edt': -4, 'cst': -6, 'cdt': -5,
+             'mst': -7, 'mdt': -6, 'pst': -8, 'pdt': -7}
+# 其他常见的固定格式（按顺序尝试）
+STRPTIME_FORMATS = (
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d %H:%M',
+    '%Y/%m/%d',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%m/%d/%Y',  # 与 dateutil 默认一致按月在前解析，日大于12的日期由 dateutil 处理
+)
+_SHAPE = re.compile(r'\d+|[A-Za-z]+')
+# 形状缓存上限（异常数据的形状过多时清空重新识别）
+MAX_SHAPES = 1024
+
+Parser = Callable[[str], Optional[datetime]]
+
+_offsets: Dict[int, timezone] = {0: timezone.utc}  # 偏移分钟数 -> 时区对象（复用，UTC时间无需再转换）
+
+
+def _parse_iso(text: str) -> Optional[datetime]:
+    if text[-1:] in ('Z', 'z'):
+        text = text[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def _parse_rfc822(text: str) -> Optional[datetime]:
+    match = _RFC822.match(text)
+    if match is None:
+        return None
+    day, month, year, hour, minute, second, sign, tz_hour, tz_minute, tz_name = match.groups()
+    month = _MONTHS.get(month.lower())
+    if month is None:
+        return None
+    if tz_name is not None:
+        offset = _TZ_NAMES.get(tz_name.lower())
+        if offset is None:
+            return None
+        minutes = offset * 60
+    elif sign is not None:
+        minutes = int(tz_hour) * 60 + int(tz_minute)
+        if sign == '-':
+            minutes = -minutes
+    else:
+        minutes = 0
+    tz = _offsets.get(minutes)
+    if tz is None:
+        tz = _offsets[minutes] = timezone(timedelta(minutes=minutes))
+    year = int(year)
+    if year < 100:
+        year += 2000
+    try:
+        return datetime(year, month, int(day), int(hour), int(minute), int(second or 0), tzinfo=tz)
+    except ValueError:
+        return None
+
+
+def _strptime_parser(fmt: str) -> Parser:
+    def parse(text: str) -> Optional[datetime]:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            return None
+    return parse
+
+
+def _parse_dateutil(text: str) -> Optional[datetime]:
+    try:
+        return dateutil_parser.parse(text)
+    except (ValueError, OverflowError):
+        return None
+
+
+# 解析函数按识别顺序排列，dateutil 最慢，放在最后
+PARSERS: Dict[str, Parser] = {
+    'iso': _parse_iso,
+    'rfc822': _parse_rfc822,
+    **{fmt: _strptime_parser(fmt) for fmt in STRPTIME_FORMATS},
+    'dateutil': _parse_dateutil,
+}
+
+_shape_parsers: Dict[str, str] = {}   # 形状 -> 解析函数名
+_source_parsers: Dict[str, str] = {}  # 来源 -> 上次成功的解析函数名
+
+
+def _shape(text: str) -> str:
+    """
+    数字逐位替换为0（保留位数，区分 2024/03/05 与 05/03/2024）、字母替换为a（区分缩写和全称），
+    同一格式的日期形状相同
+    """
+    return _SHAPE.sub(lambda m: '0' * len(m.group()) if m.group()[0].isdigit() else 'a' * min(len(m.group()), 4),
+                      text)
+
+
+def to_utc(value: datetime) -> datetime:
+    """转换为带时区的UTC时间（不含时区的值视为UTC）"""
+    tzinfo = value.tzinfo
+    if tzinfo is timezone.utc:
+        return value
+    if tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _detect(text: str, shape: str) -> Optional[datetime]:
+    """依次尝试各解析函数，记录该形状第一个成功的解析函数"""
+    for name, parse in PARSERS.items():
+        result = parse(text)
+        if result is not None:
+            if len(_shape_parsers) >= MAX_SHAPES:
+                _shape_parsers.clear()
+            _shape_parsers[shape] = name
+            logger.debug(f"识别日期格式：{shape!r} -> {name}")
+            return result
+    return None
+
+
+def parse_datetime(value: Union[str, datetime, None], source: Optional[str] = None) -> Optional[datetime]:
+    """
+    解析日期时间
+    参数:
+        value: 日期字符串（已是 datetime 时只做时区转换）
+        source: 数据来源，同一来源的日期格式通常固定，提供后可跳过格式识别
+    返回:
+        Optional[datetime]: 带时区的UTC时间，无法解析时返回 None
+    """
+    if isinstance(value, datetime):
+        return to_utc(value)
+    if not value or not isinstance(value, str):
+        return None
+    text = value.strip()
+    if not text:
+        return None
+
+    if source is not None:
+        name = _source_parsers.get(source)
+        if name is not None:
+            result = PARSERS[name](text)
+            if result is not None:
+                return to_utc(result)
+
+    shape = _shape(text)
+    name = _shape_parsers.get(shape)
+    result = PARSERS[name](text) if name is not None else None
+    if result is None:
+        result = _detect(text, shape)
+        if result is None:
+            return None
+    name = _shape_parsers.get(shape)
+    if source is not None and name not in (None, 'dateutil'):
+        # 只记住专用解析函数，避免一条特殊日期让该来源之后的日期都走 dateutil
+        _source_parsers[source] = name
+    return to_utc(result)
+
+
+def parse_datetime_batch(values: Sequence[Union[str, datetime, None]],
+                         sources: Sequence[Optional[str]]) -> List[Optional[datetime]]:
+    """
+    批量解析日期时间（与逐条调用 parse_datetime 结果相同）
+    每个来源已识别的解析函数直接用于该来源的整列，只有失败的值才走逐条识别
+    参数:
+        values: 日期字符串列表
+        sources: 与 values 一一对应的数据来源
+    返回:
+        List[Optional[datetime]]: 带时区的UTC时间列表
+    """
+    utc = timezone.utc
+    result = []
+    append = result.append
+    for value, source in zip(values, sources):
+        name = _source_parsers.get(source) if source is not None else None
+        if name is not None and value.__class__ is str:
+            parsed = PARSERS[name](value.strip())
+            if parsed is not None:
+                tzinfo = parsed.tzinfo
+                append(parsed if tzinfo is utc else
+                       parsed.replace(tzinfo=utc) if tzinfo is None else parsed.astimezone(utc))
+                continue
+        append(parse_datetime(value, source))
+    return result
@@ -6,7 +6,8 @@ import re
 from datetime import datetime
 from typing import Optional
 from requests import Session
-from urllib3.util.retry import Retry
+from utils.dates import parse_datetime
+from utils.http_client import get_session
 
 def validate_url(url: str) -> bool:
     """
@@ -25,33 +26,23 @@ def validate_url(url: str) -> bool:
         r'(?:/?|[/?]\S+)$', re.IGNORECASE)
     return re.match(regex, url) is not None
 
-def safe_parse_date(date_str: Optional[str]) -> Optional[str]:
+def safe_parse_date(date_str: Optional[str], source: Optional[str] = None) -> Optional[datetime]:
     """
-    安全解析日期字符串
+    安全解析日期字符串（见 utils.dates.parse_datetime）
     参数:
         date_str: 原始日期字符串
+        source: 数据来源
     返回:
-        str: ISO格式日期或None
+        datetime: 带时区的UTC时间或None
     """
-    try:
-        return datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%SZ')
-    except (TypeError, ValueError):
-        return None
+    return parse_datetime(date_str, source)
 
 def create_retry_session(retries=3) -> Session:
     """
-    创建带重试机制的请求会话
+    创建带重试机制的请求会话（复用共享HTTP客户端的连接池）
     参数:
         retries: 最大重试次数
     返回:
         Session: 配置好的会话对象
     """
-    session = Session()
-    retry = Retry(
-        total=retries,
-        backoff_factor=0.3,
-        status_forcelist=[500, 502, 503, 504]
-    )
-    session.mount('http://', HTTPAdapter(max_retries=retry))
-    session.mount('https://', HTTPAdapter(max_retries=retry))
-    return session
\ No newline at end of file
+    return get_session('default', retries=retries)
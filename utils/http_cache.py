@@ -0,0 +1,128 @@
+"""
+HTTP条件请求缓存模块
+基于 ETag / Last-Modified 的持久化响应缓存，服务端返回304时直接复用上次的解析结果
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from requests import Response, Session
+
+from config.settings import settings
+from utils.logger import get_logger
+from utils.metrics import HTTP_CACHE_COUNTER, HTTP_CACHE_BYTES_SAVED
+
+logger = get_logger(__name__)
+
+
+class HTTPCache:
+    """持久化的条件请求缓存（按URL和请求参数索引）"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, enabled: Optional[bool] = None):
+        """
+        参数:
+            cache_dir: 缓存目录，默认使用配置中的目录
+            enabled: 是否启用缓存，默认读取配置
+        """
+        config = settings.HTTP_CACHE_CONFIG
+        self.enabled = config['enabled'] if enabled is None else enabled
+        self.cache_dir = Path(cache_dir or config['cache_dir'])
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """根据URL和排序后的参数生成缓存键"""
+        raw = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, session: Session, url: str, parser: Callable[[Response], Any],
+            params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            source: str = 'unknown', **kwargs) -> Any:
+        """
+        发送带校验信息的GET请求并返回解析结果
+        参数:
+            session: 请求会话
+            url: 请求地址
+            parser: 将200响应解析为结果的函数
+            params: 查询参数
+            headers: 额外请求头
+            source: 数据源名称（用于监控指标）
+            kwargs: 透传给 session.get 的其他参数（如 timeout）
+        返回:
+            parser 的解析结果，304时为缓存的上次结果
+        """
+        if not self.enabled:
+            resp = session.get(url, params=params, headers=headers, **kwargs)
+            resp.raise_for_status()
+            return parser(resp)
+
+        key = self.make_key(url, params)
+        entry = self._load(key)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        resp = session.get(url, params=params, headers=request_headers, **kwargs)
+
+        if resp.status_code == 304 and entry:
+            HTTP_CACHE_COUNTER.labels(source=source, result='hit').inc()
+            HTTP_CACHE_BYTES_SAVED.labels(source=source).inc(entry.get('size', 0))
+            logger.info(f"{source} 内容未变化(304)，复用缓存结果")
+            return entry['result']
+
+        resp.raise_for_status()
+        HTTP_CACHE_COUNTER.labels(source=source, result='miss').inc()
+        result = parser(resp)
+
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._store(key, {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': len(resp.content),
+                'stored_at': time.time(),
+                'result': result
+            })
+        return result
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def _load(self, key: str) -> Optional[Dict]:
+        """读取缓存条目，损坏的条目视为不存在"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"缓存条目读取失败({path.name}): {str(e)}")
+            return None
+
+    def _store(self, key: str, entry: Dict):
+        """原子写入缓存条目"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"缓存条目写入失败({path.name}): {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
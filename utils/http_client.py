@@ -0,0 +1,171 @@
+"""
+共享HTTP客户端模块
+所有爬虫和AI接口调用共用同一组按主机划分的连接池，统一配置保持连接、gzip/brotli压缩、
+带随机抖动的指数退避重试、默认超时，并按主机统计流量和请求耗时
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+
+from requests import Session
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from urllib3.util.timeout import Timeout
+
+from config.settings import settings
+from utils import archive
+from utils.logger import get_logger
+from utils.metrics import HTTP_BYTES, HTTP_LATENCY
+from utils.rate_limiter import RateLimitedAdapter
+from utils.stream import CancelToken
+
+logger = get_logger(__name__)
+
+
+def build_retry(retries: int) -> Retry:
+    """
+    构建重试策略：连接错误和5xx按指数退避重试，退避时间带随机抖动避免并发请求同时重试
+    429 交给限流器处理，不在此重试
+    """
+    config = settings.HTTP_CLIENT_CONFIG
+    return Retry(
+        total=retries,
+        backoff_factor=config['backoff_factor'],
+        backoff_jitter=config['backoff_jitter'],
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+class DeadlineTimeout(Timeout):
+    """
+    受截止时间约束的请求超时
+    urllib3 每次尝试（包括重试）前都会 clone 超时对象，这里在 clone 时按剩余时间重新计算，
+    超过截止时间后直接抛出 TimeoutError 放弃重试，保证重试不会把请求拖过截止时间
+    """
+
+    def __init__(self, timeout: float, deadline: float):
+        """
+        参数:
+            timeout: 单次尝试的超时上限（秒）
+            deadline: 截止时间（time.monotonic() 时间点）
+        """
+        self.limit = timeout
+        self.deadline = deadline
+        value = max(0.01, min(timeout, deadline - time.monotonic()))
+        super().__init__(connect=value, read=value)
+
+    def clone(self) -> 'DeadlineTimeout':
+        if time.monotonic() >= self.deadline:
+            raise TimeoutError("已超过截止时间，放弃请求")
+        return DeadlineTimeout(self.limit, self.deadline)
+
+
+def request_timeout(timeout: float, cancel_event: Optional[threading.Event] = None) -> Union[float, Timeout]:
+    """
+    计算单个请求的超时：取消信号带截止时间（CancelToken）时不超过剩余时间
+    参数:
+        timeout: 配置的请求超时（秒）
+        cancel_event: 数据源的取消信号
+    返回:
+        float 或 DeadlineTimeout: 直接作为 session.get 的 timeout 参数
+    异常:
+        TimeoutError: 已取消或已超过截止时间，不再发起请求
+    """
+    if cancel_event is None:
+        return timeout
+    if cancel_event.is_set():
+        raise TimeoutError("已取消或超过截止时间，不再发起请求")
+    if isinstance(cancel_event, CancelToken) and cancel_event.deadline is not None:
+        return DeadlineTimeout(timeout, cancel_event.deadline)
+    return timeout
+
+
+class PooledAdapter(RateLimitedAdapter):
+    """带默认超时、按主机连接池大小和流量统计的适配器"""
+
+    def __init__(self, *args, timeout: float = 15, host_pool_sizes: Optional[Dict[str, int]] = None, **kwargs):
+        self.timeout = timeout
+        self.host_pool_sizes = host_pool_sizes or {}
+        super().__init__(*args, **kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        """为指定主机使用单独配置的连接池大小"""
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        size = self.host_pool_sizes.get(host_params['host'])
+        if size:
+            pool_kwargs['maxsize'] = size
+        return host_params, pool_kwargs
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        host = urlparse(request.url).hostname or ''
+        start = time.perf_counter()
+        response = super().send(request, stream=stream, timeout=timeout or self.timeout, **kwargs)
+        if not stream:
+            # 非流式请求在这里读完响应体，统计实际传输（压缩后）的字节数
+            response.content
+            HTTP_BYTES.labels(host=host).inc(response.raw.tell() if response.raw else len(response.content))
+        elif response.headers.get('Content-Length', '').isdigit():
+            HTTP_BYTES.labels(host=host).inc(int(response.headers['Content-Length']))
+        HTTP_LATENCY.labels(host=host).observe(time.perf_counter() - start)
+        return response
+
+
+_adapter: Optional[PooledAdapter] = None
+_adapter_lock = threading.Lock()
+
+
+def _build_adapter(retries: int) -> PooledAdapter:
+    config = settings.HTTP_CLIENT_CONFIG
+    return PooledAdapter(
+        pool_connections=config['pool_connections'],
+        pool_maxsize=config['pool_maxsize'],
+        max_retries=build_retry(retries),
+        timeout=config['timeout'],
+        host_pool_sizes=config['host_pool_sizes']
+    )
+
+
+def get_adapter() -> PooledAdapter:
+    """获取进程内共享的适配器（连接池随之共享）"""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = _build_adapter(settings.HTTP_CLIENT_CONFIG['retries'])
+        return _adapter
+
+
+def get_session(source: str, headers: Optional[Dict] = None, retries: Optional[int] = None,
+                archived: bool = True) -> Session:
+    """
+    创建挂载共享连接池的会话
+    每个调用方持有独立的会话（独立的请求头和归档钩子），底层TCP/TLS连接在所有会话间复用
+    参数:
+        source: 调用方名称（用于归档索引）
+        headers: 额外的默认请求头
+        retries: 自定义重试次数，与全局配置不同时使用独立连接池
+        archived: 是否按 ARCHIVE_MODE 归档/回放（归档按URL索引，响应取决于请求体的POST接口应关闭）
+    返回:
+        Session: 配置好的会话
+    """
+    if retries is None or retries == settings.HTTP_CLIENT_CONFIG['retries']:
+        adapter = get_adapter()
+    else:
+        adapter = _build_adapter(retries)
+
+    session = Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': settings.HTTP_CLIENT_CONFIG['user_agent'],
+        'Accept-Encoding': DEFAULT_ACCEPT_ENCODING  # 安装brotli后包含br
+    })
+    if headers:
+        session.headers.update(headers)
+    if archived:
+        archive.install(session, source)
+    return session
@@ -2,7 +2,7 @@
 Prometheus监控指标定义模块
 """
 
-from prometheus_client import start_http_server, Counter, Gauge
+from prometheus_client import start_http_server, Counter, Gauge, Histogram
 
 # 启动指标服务器（在main.py中调用）
 def start_monitoring(port=8000):
@@ -27,4 +27,129 @@ PROCESS_TIME = Gauge(
 ITEMS_GAUGE = Gauge(
     'tech_news_items_total',
     'Number of news items processed'
-)
\ No newline at end of file
+)
+
+# 单个数据源各阶段耗时（按来源和阶段分类）
+SOURCE_TIME = Gauge(
+    'tech_news_source_seconds',
+    'Per-source collection time',
+    ['source', 'stage']  # 阶段标签：fetch/filter
+)
+
+# HTTP条件请求缓存命中统计（result: hit/miss）
+HTTP_CACHE_COUNTER = Counter(
+    'tech_news_http_cache_total',
+    'HTTP conditional cache lookups',
+    ['source', 'result']
+)
+
+# 304命中节省的下载字节数
+HTTP_CACHE_BYTES_SAVED = Counter(
+    'tech_news_http_cache_bytes_saved_total',
+    'Bytes not downloaded thanks to 304 responses',
+    ['source']
+)
+
+# 限流排队等待时间（按主机分类）
+RATE_LIMIT_WAIT = Histogram(
+    'tech_news_rate_limit_wait_seconds',
+    'Time requests spent queued in the per-host rate limiter',
+    ['host'],
+    buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+# 当前限流速率（次/秒）
+RATE_LIMIT_RATE = Gauge(
+    'tech_news_rate_limit_rate',
+    'Current adaptive request rate per host',
+    ['host']
+)
+
+# 数据源熔断器状态（0=closed, 1=half_open, 2=open）
+CIRCUIT_STATE = Gauge(
+    'tech_news_circuit_state',
+    'Circuit breaker state per source',
+    ['source']
+)
+
+# 按主机统计的下载字节数（压缩后）
+HTTP_BYTES = Counter(
+    'tech_news_http_bytes_total',
+    'Bytes received per host',
+    ['host']
+)
+
+# 按主机统计的请求耗时
+HTTP_LATENCY = Histogram(
+    'tech_news_http_request_seconds',
+    'HTTP request latency per host',
+    ['host']
+)
+
+# 正文抓取结果统计（result: fetched/cached/empty/error/timeout）
+CONTENT_FETCH_COUNTER = Counter(
+    'tech_news_content_fetch_total',
+    'Full article content fetch results',
+    ['result']
+)
+
+# 中文分词缓存命中统计（result: hit/miss）
+SEGMENT_CACHE_COUNTER = Counter(
+    'tech_news_segment_cache_total',
+    'Segmentation cache lookups',
+    ['result']
+)
+
+# 中文分词缓存累计命中率
+SEGMENT_CACHE_HIT_RATIO = Gauge(
+    'tech_news_segment_cache_hit_ratio',
+    'Segmentation cache hit ratio since startup'
+)
+
+# 分词耗时（mode: local/pool）
+SEGMENT_TIME = Histogram(
+    'tech_news_segment_seconds',
+    'Time spent segmenting a batch of uncached texts',
+    ['mode']
+)
+
+# 已入库数据预过滤结果（result: seen/new）
+SEEN_FILTER_COUNTER = Counter(
+    'tech_news_seen_filter_total',
+    'Items checked against the seen-items Bloom filter',
+    ['result']
+)
+
+# 布隆过滤器状态
+SEEN_FILTER_ITEMS = Gauge(
+    'tech_news_seen_filter_items',
+    'Number of keys added to the seen-items Bloom filter'
+)
+SEEN_FILTER_BYTES = Gauge(
+    'tech_news_seen_filter_bytes',
+    'Memory used by the seen-items Bloom filter bit arrays'
+)
+SEEN_FILTER_FPR = Gauge(
+    'tech_news_seen_filter_false_positive_rate',
+    'Estimated false-positive rate of the seen-items Bloom filter'
+)
+
+# 流式处理各阶段通过的条数（stage: fetched/unseen/tech/cleaned/stored 等）
+STREAM_ITEMS = Counter(
+    'tech_news_stream_items_total',
+    'Items passing each stage of the streaming pipeline',
+    ['stage']
+)
+
+# 热门词索引中保留的词数
+TRENDING_TERMS = Gauge(
+    'tech_news_trending_terms',
+    'Distinct terms held by the trending-terms index'
+)
+
+# 入库结果（result: inserted/ignored/deduplicated）
+INGEST_COUNTER = Counter(
+    'tech_news_ingest_total',
+    'Articles passed to save_batch by outcome',
+    ['result']
+)
@@ -0,0 +1,166 @@
+"""
+按主机的自适应限流模块
+进程内所有爬虫会话共享同一组令牌桶，根据 Retry-After / X-RateLimit-* 响应头和429/5xx状态自动调整速率
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from config.settings import settings
+from utils.logger import get_logger
+from utils.metrics import RATE_LIMIT_WAIT, RATE_LIMIT_RATE
+
+logger = get_logger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+    参数:
+        value: 秒数或HTTP日期
+    返回:
+        Optional[float]: 需要等待的秒数
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """单个主机的令牌桶（令牌可为负数，表示已预约的排队请求）"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # 服务端要求暂停到的时间点
+
+    def reserve(self) -> float:
+        """预约一个令牌，返回需要等待的秒数（调用方需持有锁）"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+
+class HostRateLimiter:
+    """按主机划分的令牌桶限流器（AIMD自适应速率）"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config or settings.RATE_LIMIT_CONFIG
+        self.default_rate = config['default_rate']
+        self.burst = config['burst']
+        self.min_rate = config['min_rate']
+        self.max_rate = config['max_rate']
+        self.increase_step = config['increase_step']
+        self.host_rates = config['host_rates']
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.host_rates.get(host, self.default_rate)
+            bucket = self._buckets[host] = TokenBucket(rate, self.burst)
+            RATE_LIMIT_RATE.labels(host=host).set(rate)
+        return bucket
+
+    def acquire(self, host: str) -> float:
+        """
+        获取主机的请求许可，必要时阻塞等待
+        参数:
+            host: 目标主机名
+        返回:
+            float: 实际排队等待的秒数
+        """
+        with self._lock:
+            wait = self._bucket(host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        RATE_LIMIT_WAIT.labels(host=host).observe(wait)
+        return wait
+
+    def observe(self, host: str, response: Response):
+        """
+        根据响应调整速率
+        - 429/5xx：速率减半，并遵守 Retry-After
+        - X-RateLimit-Remaining 为0：暂停到 X-RateLimit-Reset
+        - 成功响应：速率线性回升，但不超过剩余配额允许的速率
+        """
+        headers = response.headers
+        status = response.status_code
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after:
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+
+            remaining = headers.get('X-RateLimit-Remaining')
+            reset = headers.get('X-RateLimit-Reset')
+            reset_in = None
+            if reset and reset.isdigit():
+                # GitHub 返回UNIX时间戳，部分服务返回剩余秒数
+                reset_value = float(reset)
+                reset_in = reset_value - time.time() if reset_value > 1e9 else reset_value
+                reset_in = max(0.0, reset_in)
+
+            if status == 429 or status >= 500:
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+                logger.warning(f"{host} 返回 {status}，限流速率降至 {bucket.rate:.2f}次/秒")
+            elif status < 400:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase_step)
+
+            if remaining is not None and remaining.isdigit() and reset_in is not None:
+                if int(remaining) == 0:
+                    bucket.blocked_until = max(bucket.blocked_until, now + reset_in)
+                    logger.warning(f"{host} 配额已用尽，暂停 {reset_in:.0f}秒")
+                elif reset_in > 0:
+                    # 按剩余配额在重置前均匀分配请求
+                    bucket.rate = max(self.min_rate, min(bucket.rate, int(remaining) / reset_in))
+
+            RATE_LIMIT_RATE.labels(host=host).set(bucket.rate)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """在每次发送前向共享限流器申请许可的HTTP适配器"""
+
+    def __init__(self, *args, limiter: Optional[HostRateLimiter] = None, **kwargs):
+        self.limiter = limiter or get_rate_limiter()
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).hostname or ''
+        self.limiter.acquire(host)
+        response = super().send(request, **kwargs)
+        self.limiter.observe(host, response)
+        return response
+
+
+_limiter: Optional[HostRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """获取进程内共享的限流器"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = HostRateLimiter()
+        return _limiter
@@ -0,0 +1,65 @@
+"""
+持久化状态存储模块
+以JSON文件保存跨运行的小规模状态（如增量水位线）
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JSONStateStore:
+    """线程安全的JSON键值状态存储，每次写入都原子落盘"""
+
+    def __init__(self, path: Path):
+        """
+        参数:
+            path: 状态文件路径，不存在时自动创建
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"状态文件读取失败，将重新初始化({self.path}): {str(e)}")
+            return {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """更新单个键并落盘"""
+        with self._lock:
+            self._data[key] = value
+            self._save()
+
+    def all(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._data)
+
+    def _save(self):
+        """原子写入（先写临时文件再替换）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"状态文件写入失败({self.path}): {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,207 @@
+"""
+流式处理模块
+采集、过滤、清洗、存储按固定大小的分块依次流过生成器链，任一时刻只持有少量分块，
+峰值内存与单次采集的数据总量无关：
+- chunked：把逐条产出的数据切成分块
+- run_stage：对每个分块执行一个阶段并统计通过的条数
+- merge_sources：多个数据源在后台线程中并发产出分块，经有界队列汇合（队列满时数据源暂停，形成背压）
+- iter_completed：按完成顺序产出并发任务，取消后立即停止等待（供数据源内部的并发请求使用）
+- CancelToken：带截止时间的取消信号，数据源内部的网络请求据此收紧超时（见 http_client.request_timeout）
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.logger import get_logger
+from utils.metrics import STREAM_ITEMS
+
+logger = get_logger(__name__)
+
+Chunk = List[Dict]
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """
+    把可迭代对象切成最多 size 条的分块
+    参数:
+        items: 逐条产出的数据
+        size: 分块大小
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class CancelToken(threading.Event):
+    """
+    带截止时间的取消信号：显式置位或超过截止时间都视为已取消
+    超时的数据源不会被强制终止，其后台线程依靠 http_client.request_timeout 在截止时间前后结束
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        """
+        参数:
+            deadline: 截止时间（time.monotonic() 时间点），为空时只能显式取消
+        """
+        super().__init__()
+        self.deadline = deadline
+
+    def is_set(self) -> bool:
+        return super().is_set() or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+
+def iter_completed(futures: Iterable[Future], cancel_event: Optional[threading.Event] = None,
+                   poll_interval: float = 0.5) -> Iterator[Future]:
+    """
+    与 as_completed 相同按完成顺序产出任务，但取消信号置位后不再等待进行中的任务
+    参数:
+        futures: 并发任务
+        cancel_event: 取消信号
+        poll_interval: 检查取消信号的间隔（秒）
+    """
+    pending = set(futures)
+    timeout = None if cancel_event is None else poll_interval
+    while pending:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        yield from done
+
+
+class StageCounters:
+    """各阶段通过的条数（同时累加到 Prometheus 计数器）"""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, count: int):
+        with self._lock:
+            self.counts[stage] = self.counts.get(stage, 0) + count
+        STREAM_ITEMS.labels(stage=stage).inc(count)
+
+    def summary(self) -> str:
+        return '，'.join(f"{stage}:{count}" for stage, count in self.counts.items())
+
+
+def run_stage(chunks: Iterable[Chunk], stage: str, func: Callable[[Chunk], Chunk],
+              counters: StageCounters) -> Iterator[Chunk]:
+    """
+    对每个分块执行一个处理阶段，丢弃处理后为空的分块
+    参数:
+        chunks: 上游分块
+        stage: 阶段名称（用于计数）
+        func: 处理函数，输入一个分块返回处理后的分块
+        counters: 计数器
+    """
+    for chunk in chunks:
+        chunk = func(chunk)
+        counters.add(stage, len(chunk))
+        if chunk:
+            yield chunk
+
+
+def merge_sources(sources: Dict[str, Callable[[threading.Event], Iterable[Dict]]], chunk_size: int,
+                  queue_size: int, max_workers: int, deadlines: Optional[Dict[str, float]] = None,
+                  on_error: Optional[Callable[[str, BaseException], None]] = None,
+                  on_complete: Optional[Callable[[str], None]] = None) -> Iterator[Tuple[str, Chunk]]:
+    """
+    并发消费多个数据源，按到达顺序产出 (数据源名称, 分块)
+    参数:
+        sources: 数据源名称 -> 接收取消信号（CancelToken）、逐条产出数据的函数（取消后应尽快停止）
+        chunk_size: 分块大小
+        queue_size: 汇合队列可容纳的分块数
+        max_workers: 同时运行的数据源数
+        deadlines: 数据源名称 -> 截止时间（秒，从开始消费计），超时后取消该数据源并不再等待其结束，
+            已进入队列的分块保留
+        on_error: 数据源抛出异常或超时时的回调
+        on_complete: 数据源正常结束时的回调；调用时该数据源的全部分块都已被下游处理完（生成器链逐块拉取）
+    """
+    deadlines = deadlines or {}
+    merged: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+    start_time = time.monotonic()
+    # 截止时间随取消信号传给数据源，其内部的网络请求超时不超过剩余时间
+    cancel_events = {
+        name: CancelToken(None if deadlines.get(name) is None else start_time + deadlines[name])
+        for name in sources
+    }
+    stopped = threading.Event()  # 消费方已停止
+    slots = threading.BoundedSemaphore(max(1, max_workers))
+    done = object()
+
+    def put(name: str, value, force: bool = False) -> bool:
+        # 消费方已停止时放弃写入，避免线程阻塞在满队列上；force=False 时数据源被取消也放弃写入
+        while not stopped.is_set() and (force or not cancel_events[name].is_set()):
+            try:
+                merged.put((name, value), timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(name: str, source):
+        with slots:
+            cancel = cancel_events[name]
+            try:
+                if not cancel.is_set():
+                    for chunk in chunked(source(cancel), chunk_size):
+                        # 取消前已采集的数据（包括取消时未满的分块）照常交给消费方
+                        if not put(name, chunk, force=True) or cancel.is_set():
+                            break
+            except Exception as e:
+                put(name, e)
+            finally:
+                put(name, done, force=True)
+
+    threads = [threading.Thread(target=produce, args=(name, source), name=f"stream-{name}", daemon=True)
+               for name, source in sources.items()]
+    for thread in threads:
+        thread.start()
+
+    pending = set(sources)
+    failed = set()
+    try:
+        while pending:
+            now = time.monotonic()
+            for name in list(pending):
+                deadline = deadlines.get(name)
+                if deadline is not None and now - start_time > deadline:
+                    # 数据源可能阻塞在网络请求上，只发出取消信号，不等待其线程结束
+                    cancel_events[name].set()
+                    pending.discard(name)
+                    logger.error(f"{name} 流式采集超时，已超过截止时间 {deadline:.0f}秒，停止该数据源")
+                    if on_error is not None:
+                        on_error(name, TimeoutError(f"{name} 超过截止时间"))
+            if not pending:
+                break
+            try:
+                name, value = merged.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if value is done:
+                if name in pending:
+                    pending.discard(name)
+                    if on_complete is not None and name not in failed and not cancel_events[name].is_set():
+                        on_complete(name)
+            elif isinstance(value, BaseException):
+                if name not in pending:
+                    continue  # 已按超时处理
+                failed.add(name)
+                if on_error is not None:
+                    on_error(name, value)
+                else:
+                    logger.error(f"{name} 流式采集失败：{str(value)}")
+            else:
+                # 超时前已产出的分块照常处理
+                yield name, value
+    finally:
+        stopped.set()
+        for event in cancel_events.values():
+            event.set()
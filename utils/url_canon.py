@@ -0,0 +1,150 @@
+"""
+URL规范化模块
+同一篇文章在不同来源中的URL常带有跟踪参数、AMP版本、末尾斜杠或不同主机前缀，
+规范化后的URL用于跨来源去重和按URL查找：
+- 协议统一为 https，主机名小写并去掉 www./m./amp. 前缀和默认端口
+- 去掉 utm_*、fbclid 等专用跟踪参数；ref、share 这类通用参数名只在已知用作跟踪的站点上去掉；其余参数排序；去掉片段（#...）
+- AMP 解析：Google AMP 缓存地址还原为原站地址，去掉末尾的 /amp 路径段、.amp 后缀和 amp=1 等参数
+  （代码托管站点的路径是仓库名，不做路径还原）
+- 路径合并重复斜杠并去掉末尾斜杠
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+# 只用于跟踪的参数，所有站点都去掉（utm_ 前缀另行匹配）
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'gclsrc', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl',
+    'guccounter', 'guce_referrer', 'guce_referrer_sig', 'mkt_tok', 'trkcampaign', 'soc_src', 'soc_trk',
+    'wt.mc_id',
+})
+# 参数名通用（如 ref 在 GitHub 上是分支名）、只在对应站点（含子域名）上用作跟踪的参数
+HOST_TRACKING_PARAMS: Dict[str, FrozenSet[str]] = {
+    'twitter.com': frozenset({'ref_src', 'ref_url', 's', 't'}),
+    'x.com': frozenset({'ref_src', 'ref_url', 's', 't'}),
+    'youtube.com': frozenset({'feature', 'si'}),
+    'youtu.be': frozenset({'feature', 'si'}),
+    'nytimes.com': frozenset({'smid', 'smtyp'}),
+    'msn.com': frozenset({'ocid', 'cvid'}),
+    'yahoo.com': frozenset({'ncid', 'sr_share'}),
+    'engadget.com': frozenset({'ncid', 'sr_share'}),
+    'techcrunch.com': frozenset({'ncid', 'sr_share'}),
+    'linkedin.com': frozenset({'trk', 'trackingid'}),
+    'cnn.com': frozenset({'cmpid', 'taid'}),
+    'medium.com': frozenset({'source'}),
+    'producthunt.com': frozenset({'ref'}),
+    'aliyun.com': frozenset({'spm'}),
+    'alibaba.com': frozenset({'spm'}),
+}
+# 表示AMP版本的参数 -> 表示AMP的取值（None 表示任意取值，这些参数名只用于AMP）
+AMP_PARAMS: Dict[str, Optional[FrozenSet[str]]] = {
+    'amp': frozenset({'', '1', 'true'}), 'outputtype': frozenset({'amp'}),
+    'amp_js_v': None, 'usqp': None, 'amp_gsa': None, 'amp_tf': None, 'aoh': None, 'ampshare': None,
+}
+# 路径为用户/仓库名的代码托管站点，不做AMP路径还原
+CODE_HOSTS = frozenset({'github.com', 'gitlab.com', 'bitbucket.org', 'gitee.com'})
+
+_URL = re.compile(r'^\s*(https?)://([^/?#]*)([^?#]*)(?:\?([^#]*))?', re.IGNORECASE)
+_HOST_PREFIX = re.compile(r'^(?:www\d*|m|mobile|amp)\.')
+_AMP_CACHE_HOST = re.compile(r'\.cdn\.ampproject\.org$')
+# AMP缓存路径：/c/s/<host>/<path>（s 表示 https），/v/、/i/ 为其他资源类型
+_AMP_CACHE_PATH = re.compile(r'^/[cvi]/(?:s/)?([^/]+)(/.*)?$')
+_GOOGLE_AMP_PATH = re.compile(r'^/amp/(?:s/)?([^/]+)(/.*)?$')
+_AMP_PATH_SUFFIX = re.compile(r'(?:/amp|\.amp(?:\.html)?)/?$', re.IGNORECASE)
+_MULTI_SLASH = re.compile(r'/{2,}')
+
+
+def _host_params(host: str) -> FrozenSet[str]:
+    """主机（含其父域名）上用作跟踪的通用参数"""
+    parts = host.split('.')
+    for i in range(len(parts) - 1):
+        params = HOST_TRACKING_PARAMS.get('.'.join(parts[i:]))
+        if params is not None:
+            return params
+    return frozenset()
+
+
+def _is_tracking(pair: str, host_params: FrozenSet[str]) -> bool:
+    key, _, value = pair.partition('=')
+    key = key.lower()
+    if key.startswith('utm_') or key in TRACKING_PARAMS or key in host_params:
+        return True
+    if key in AMP_PARAMS:
+        values = AMP_PARAMS[key]
+        return values is None or value.lower() in values
+    return False
+
+
+def _resolve_amp_cache(host: str, path: str):
+    """还原 Google AMP 缓存和 google.com/amp/ 代理地址，返回 (主机, 路径)"""
+    if _AMP_CACHE_HOST.search(host):
+        match = _AMP_CACHE_PATH.match(path)
+        if match:
+            return match.group(1).lower(), match.group(2) or '/'
+    elif host in ('google.com', 'www.google.com'):
+        match = _GOOGLE_AMP_PATH.match(path)
+        if match:
+            return match.group(1).lower(), match.group(2) or '/'
+    return host, path
+
+
+@lru_cache(maxsize=65536)
+def canonicalize(url: str) -> str:
+    """
+    规范化单个URL（查询参数按原始编码比较和排序，不做解码再编码）
+    参数:
+        url: 原始URL
+    返回:
+        str: 规范化后的URL，非 http(s) 地址返回去掉首尾空白的原始值
+    """
+    url = (url or '').strip()
+    match = _URL.match(url)
+    if match is None or not match.group(2):
+        return url
+    _, netloc, path, query = match.groups()
+
+    host = netloc.rpartition('@')[2].lower()
+    if host.endswith(':80'):
+        host = host[:-3]
+    elif host.endswith(':443'):
+        host = host[:-4]
+    path = path or '/'
+    if 'amp' in host or host.endswith('google.com'):
+        host, path = _resolve_amp_cache(host, path)
+    host = _HOST_PREFIX.sub('', host)
+
+    if '//' in path:
+        path = _MULTI_SLASH.sub('/', path)
+    if ('amp' in path or 'AMP' in path) and host not in CODE_HOSTS:
+        path = _AMP_PATH_SUFFIX.sub('', path)
+    if len(path) > 1:
+        path = path.rstrip('/')
+    path = path or '/'
+
+    if query:
+        host_params = _host_params(host)
+        pairs = [pair for pair in query.split('&') if pair and not _is_tracking(pair, host_params)]
+        if pairs:
+            pairs.sort()
+            return f"https://{host}{path}?{'&'.join(pairs)}"
+    return f"https://{host}{path}"
+
+
+def canonicalize_batch(urls: Sequence[str]) -> List[str]:
+    """
+    批量规范化（相同的原始URL只处理一次，不经过单条调用的LRU缓存）
+    参数:
+        urls: 原始URL列表
+    返回:
+        List[str]: 与输入一一对应的规范化URL
+    """
+    convert = canonicalize.__wrapped__
+    seen: Dict[str, str] = {}
+    result = []
+    for url in urls:
+        canonical = seen.get(url)
+        if canonical is None:
+            canonical = seen[url] = convert(url)
+        result.append(canonical)
+    return result